@@ -12,4 +12,8 @@ from layabase._exceptions import (
     ValidationFailed,
     DatabaseError,
 )
+from layabase._audit_writer import AuditWriter
+from layabase._cache import QueryCache, MemoryCache, FileCache
+from layabase._post_coalescer import PostCoalescer
+from layabase._validation_pool import ValidationPool
 from layabase.version import __version__
@@ -28,8 +28,7 @@ def add_get_query_fields(
     parser.add_argument("limit", type=flask_restx.inputs.positive, location="args")
     if supports_offset:
         parser.add_argument("offset", type=flask_restx.inputs.natural, location="args")
-    if not is_mongo:
-        parser.add_argument("order_by", type=str, action="append", location="args")
+    parser.add_argument("order_by", type=str, action="append", location="args")
 
 
 def add_get_audit_query_fields(
@@ -68,8 +67,7 @@ def add_get_audit_query_fields(
     parser.add_argument("limit", type=flask_restx.inputs.positive, location="args")
     if supports_offset:
         parser.add_argument("offset", type=flask_restx.inputs.natural, location="args")
-    if not is_mongo:
-        parser.add_argument("order_by", type=str, action="append", location="args")
+    parser.add_argument("order_by", type=str, action="append", location="args")
 
 
 def add_delete_query_fields(
@@ -114,6 +112,21 @@ def add_history_query_fields(
     parser.add_argument("limit", type=flask_restx.inputs.positive)
     if supports_offset:
         parser.add_argument("offset", type=flask_restx.inputs.natural)
+    parser.add_argument("order_by", type=str, action="append", location="args")
+
+
+def add_changes_query_fields(
+    table_or_collection, parser: flask_restx.reqparse.RequestParser
+):
+    parser.add_argument(
+        "since_revision",
+        type=flask_restx.inputs.natural,
+        required=True,
+        location="args",
+    )
+    add_all_query_fields(
+        table_or_collection, is_mongo_collection(table_or_collection), parser
+    )
 
 
 def all_request_fields(
@@ -160,6 +173,21 @@ def get_history_response_fields(
     return fields
 
 
+def get_changes_response_fields(
+    history_model: flask_restx.Model,
+) -> Dict[str, flask_restx.fields.Raw]:
+    return {
+        "inserted": flask_restx.fields.List(flask_restx.fields.Nested(history_model)),
+        "updated": flask_restx.fields.List(flask_restx.fields.Nested(history_model)),
+        "deleted": flask_restx.fields.List(flask_restx.fields.Nested(history_model)),
+        "revision": flask_restx.fields.Integer(
+            example=1,
+            description="Revision to provide as since_revision to retrieve next changes.",
+            readonly=True,
+        ),
+    }
+
+
 def get_audit_response_fields(
     table_or_collection, history: bool, namespace: flask_restx.Namespace
 ) -> Dict[str, flask_restx.fields.Raw]:
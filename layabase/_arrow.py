@@ -0,0 +1,128 @@
+import datetime
+import decimal
+import enum
+import json
+from typing import Callable, Dict, Iterable, Iterator, Optional
+
+from layabase._serialization import to_json_value
+
+
+def to_table(column_batches: Iterable[Dict[str, list]], field_types: Dict[str, type]):
+    """
+    Build an Arrow table, batch by batch (only a batch of Python values is held in memory at a time).
+
+    :param column_batches: Values (as stored in database) per field name, batch by batch.
+    :param field_types: Python type of each field (in order).
+    :return: A pyarrow.Table with one column per field, typed according to the field type.
+    """
+    import pyarrow
+
+    schema = to_schema(field_types)
+    return pyarrow.Table.from_batches(
+        list(to_record_batches(column_batches, field_types, schema)), schema=schema
+    )
+
+
+def to_schema(field_types: Dict[str, type]):
+    """
+    :param field_types: Python type of each field (in order).
+    :return: A pyarrow.Schema with one field per field, typed according to the field type.
+    """
+    import pyarrow
+
+    return pyarrow.schema(
+        [
+            (field_name, _to_arrow_type(field_type))
+            for field_name, field_type in field_types.items()
+        ]
+    )
+
+
+def to_record_batches(
+    column_batches: Iterable[Dict[str, list]], field_types: Dict[str, type], schema
+) -> Iterator:
+    """
+    Convert values (as stored in database) to Arrow record batches, batch by batch.
+
+    :param column_batches: Values (as stored in database) per field name, batch by batch.
+    :param field_types: Python type of each field (in order).
+    :param schema: pyarrow.Schema returned by to_schema for those field types.
+    :return: One pyarrow.RecordBatch per batch of values.
+    """
+    import pyarrow
+
+    converters = {
+        field_name: _to_converter(field_type)
+        for field_name, field_type in field_types.items()
+    }
+    for columns in column_batches:
+        yield pyarrow.RecordBatch.from_arrays(
+            [
+                pyarrow.array(
+                    _convert(columns[field.name], converters[field.name]),
+                    type=field.type,
+                )
+                for field in schema
+            ],
+            schema=schema,
+        )
+
+
+def _to_arrow_type(field_type: type):
+    import pyarrow
+
+    # bool must be checked first as bool is a subclass of int (and enums can be int enums)
+    if field_type is bool:
+        return pyarrow.bool_()
+    if isinstance(field_type, enum.EnumMeta):
+        return pyarrow.string()
+    if field_type is datetime.datetime:
+        return pyarrow.timestamp("us")
+    # datetime must be checked first as datetime is a subclass of date
+    if field_type is datetime.date:
+        return pyarrow.date32()
+    if field_type is datetime.time:
+        return pyarrow.time64("us")
+    if not isinstance(field_type, type):
+        return pyarrow.string()
+    if issubclass(field_type, int):
+        return pyarrow.int64()
+    if issubclass(field_type, (float, decimal.Decimal)):
+        return pyarrow.float64()
+    if issubclass(field_type, bytes):
+        return pyarrow.binary()
+    # Strings, dictionaries and lists (as JSON), ObjectId, UUID, ...
+    return pyarrow.string()
+
+
+def _to_converter(field_type: type) -> Optional[Callable]:
+    """
+    :return: Function converting a non None value to a value accepted by Arrow for this field type.
+    None if values can be provided as is.
+    """
+    if isinstance(field_type, enum.EnumMeta):
+        return lambda value: (
+            value if isinstance(value, enum.Enum) else field_type(value)
+        ).name
+    if field_type is datetime.date:
+        # Mongo stores dates as datetime
+        return lambda value: (
+            value.date() if isinstance(value, datetime.datetime) else value
+        )
+    if field_type in (bool, datetime.datetime, datetime.time, str):
+        return None
+    if not isinstance(field_type, type):
+        return str
+    if issubclass(field_type, (int, bytes)):
+        return None
+    if issubclass(field_type, (float, decimal.Decimal)):
+        return float
+    if issubclass(field_type, (dict, list)):
+        return lambda value: json.dumps(value, default=to_json_value)
+    return str
+
+
+def _convert(values: list, converter: Optional[Callable]) -> list:
+    if not converter:
+        return values
+    return [None if value is None else converter(value) for value in values]
@@ -0,0 +1,136 @@
+import csv
+import datetime
+import gzip
+import json
+import logging
+import os
+from typing import List
+
+from layabase._serialization import to_csv_value, to_json_value
+
+logger = logging.getLogger(__name__)
+
+FILE_FORMATS = ("ndjson", "csv")
+
+
+def archive(
+    audit_model,
+    before: datetime.datetime,
+    path: str,
+    file_format: str,
+    chunk_size: int,
+) -> int:
+    """
+    Move audit records older than a cutoff to a gzip compressed file, chunk by chunk (in constant memory).
+
+    Progress is stored in a file next to the archive (path suffixed by .progress) before the first chunk and after every chunk,
+    so that an interrupted archiving resumes where it stopped (without duplicating records in the archive).
+    The progress file is removed once archiving is over.
+
+    :param audit_model: Audit model providing the following class methods:
+     - _get_archive_field_names() -> List[str] (field names, in order)
+     - _get_archive_chunk(before, after_revision, chunk_size) -> List[dict] (serialized records, ordered by revision)
+     - _delete_archived(before, up_to_revision) (remove archived records)
+    :param before: Records audited strictly before this date (UTC) are archived.
+    :param path: Path to the gzip file. Records are appended if the file already exists.
+    :param file_format: ndjson (one JSON record per line) or csv (with a header line).
+    :param chunk_size: Maximum number of records read, written and deleted at once.
+    :return: Number of archived records.
+    """
+    if file_format not in FILE_FORMATS:
+        raise Exception(f"File format must be one of {FILE_FORMATS}.")
+    if chunk_size < 1:
+        raise Exception("Chunk size must be a strictly positive integer.")
+
+    progress_path = f"{path}.progress"
+    progress = _load_progress(progress_path, before)
+    last_revision = progress.get("revision", 0)
+    if progress:
+        logger.info(f"Resuming archiving of audit after revision {last_revision}...")
+        # Drop anything written after the last recorded chunk (interrupted write)
+        with open(path, "ab") as archive_file:
+            archive_file.truncate(progress["size"])
+        # Records might not have been deleted before interruption
+        audit_model._delete_archived(before, last_revision)
+    else:
+        # Interruption before the first chunk progress must not leave a partial chunk in the archive
+        _save_progress(
+            progress_path,
+            {
+                "before": before.isoformat(),
+                "revision": last_revision,
+                "size": os.path.getsize(path) if os.path.exists(path) else 0,
+            },
+        )
+
+    field_names = audit_model._get_archive_field_names()
+    nb_archived = 0
+    while True:
+        records = audit_model._get_archive_chunk(before, last_revision, chunk_size)
+        if not records:
+            break
+
+        _append(path, records, field_names, file_format)
+        last_revision = records[-1]["revision"]
+        _save_progress(
+            progress_path,
+            {
+                "before": before.isoformat(),
+                "revision": last_revision,
+                "size": os.path.getsize(path),
+            },
+        )
+        audit_model._delete_archived(before, last_revision)
+        nb_archived += len(records)
+        logger.debug(f"{nb_archived} audit records archived to {path}.")
+
+    if os.path.exists(progress_path):
+        os.remove(progress_path)
+    logger.info(f"{nb_archived} audit records archived to {path}.")
+    return nb_archived
+
+
+def _load_progress(progress_path: str, before: datetime.datetime) -> dict:
+    if not os.path.exists(progress_path):
+        return {}
+
+    with open(progress_path) as progress_file:
+        progress = json.load(progress_file)
+    if progress["before"] != before.isoformat():
+        raise Exception(
+            f"An interrupted archiving (of audit before {progress['before']}) must be resumed first."
+        )
+    return progress
+
+
+def _save_progress(progress_path: str, progress: dict):
+    # Replace progress at once to never store a partial progress
+    with open(f"{progress_path}.tmp", "w") as progress_file:
+        json.dump(progress, progress_file)
+    os.replace(f"{progress_path}.tmp", progress_path)
+
+
+def _append(path: str, records: List[dict], field_names: List[str], file_format: str):
+    """
+    Append records to the archive as a new gzip member (concatenated gzip members form a valid gzip file).
+    """
+    is_new = not os.path.exists(path) or not os.path.getsize(path)
+    with gzip.open(path, "at", encoding="utf-8", newline="") as archive_file:
+        if file_format == "csv":
+            writer = csv.DictWriter(archive_file, fieldnames=field_names)
+            if is_new:
+                writer.writeheader()
+            writer.writerows(
+                {
+                    field_name: to_csv_value(record.get(field_name))
+                    for field_name in field_names
+                }
+                for record in records
+            )
+        else:
+            for record in records:
+                archive_file.write(json.dumps(record, default=to_json_value))
+                archive_file.write("\n")
+        archive_file.flush()
+    with open(path, "rb") as archive_file:
+        os.fsync(archive_file.fileno())
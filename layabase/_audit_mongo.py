@@ -2,10 +2,15 @@ import logging
 import datetime
 import enum
 import copy
-from typing import Type
+import itertools
+import re
+from typing import Type, List, Optional, Tuple
 
-from layabase._database_mongo import _CRUDModel
-from layabase.mongo import Column
+import pymongo.collection
+
+from layabase._audit_writer import AuditWriter
+from layabase._database_mongo import _CRUDModel, _synchronize_indexes
+from layabase.mongo import Column, Index
 from layabase._versioning_mongo import VersionedCRUDModel
 
 logger = logging.getLogger(__name__)
@@ -19,28 +24,54 @@ class Action(enum.IntEnum):
     Rollback = 4
 
 
-def _create_from(mixin, model: Type[_CRUDModel], base, retrieve_user: callable):
-    return (
-        _versioning_audit(mixin, base, retrieve_user)
-        if issubclass(model, VersionedCRUDModel)
-        else _common_audit(mixin, model, base, retrieve_user)
+def _create_from(
+    mixin,
+    model: Type[_CRUDModel],
+    base,
+    retrieve_user: callable,
+    audit_writer: Optional[AuditWriter] = None,
+    partition_audit_by_month: bool = False,
+):
+    if issubclass(model, VersionedCRUDModel):
+        if partition_audit_by_month:
+            raise Exception(
+                "Audit cannot be partitioned by month for versioned collections."
+            )
+        return _versioning_audit(mixin, base, retrieve_user, audit_writer)
+    return _common_audit(
+        mixin, model, base, retrieve_user, audit_writer, partition_audit_by_month
     )
 
 
-def _common_audit(mixin, model, base, retrieve_user: callable):
+def _common_audit(
+    mixin,
+    model,
+    base,
+    retrieve_user: callable,
+    audit_writer: Optional[AuditWriter],
+    partition_audit_by_month: bool,
+):
     class AuditModel(mixin, _CRUDModel, base=base, skip_name_check=True):
         """
         Class providing Audit fields for a MONGODB model.
         """
 
         __collection_name__ = f"audit_{model.__collection_name__}"
+        # Audit contains several versions of a document
+        __indexes__ = [
+            Index("audit_date_utc", ["audit_date_utc"]),
+            Index("audit_user", ["audit_user"]),
+        ]
 
         revision = Column(int, is_primary_key=True)
 
         audit_user = Column(str)
-        audit_date_utc = Column(datetime.datetime)
+        audit_date_utc = Column(datetime.datetime, allow_comparison_signs=True)
         audit_action = Column(Action)
 
+        # Name of the monthly partitions (collections) that were already created (indexes are up to date)
+        _partitions = set()
+
         @classmethod
         def audit_add(cls, document: dict):
             """
@@ -56,40 +87,246 @@ def _common_audit(mixin, model, base, retrieve_user: callable):
             cls._audit_action(Action.Update, copy.deepcopy(document))
 
         @classmethod
-        def audit_remove(cls, **filters):
+        def audit_remove(cls, documents: List[dict]):
             """
-            :param filters: Arguments that can directly be provided to Mongo.
+            :param documents: Documents (as stored in Mongo) that are about to be removed.
             """
-            for removed_document in model.__collection__.find(filters):
-                cls._audit_action(Action.Delete, removed_document)
+            if audit_writer:
+                # Queued records must be written first to keep revisions in chronological order
+                audit_writer.flush()
+            user = retrieve_user()
+            now = datetime.datetime.utcnow()
+            cls._write_audit(
+                [
+                    cls._to_audit_document(Action.Delete, dict(document), user, now)
+                    for document in documents
+                ]
+            )
 
         @classmethod
         def _audit_action(cls, action: Action, document: dict):
-            document.pop("_id", None)
-            document[cls.revision.name] = cls._increment(
-                "revision", model.__collection_name__
+            record = cls._to_audit_document(
+                action, document, retrieve_user(), datetime.datetime.utcnow()
             )
-            document[cls.audit_user.name] = retrieve_user()
-            document[cls.audit_date_utc.name] = datetime.datetime.utcnow()
+            if audit_writer:
+                audit_writer.write(cls, record)
+            else:
+                cls._write_audit([record])
+
+        @classmethod
+        def _to_audit_document(
+            cls, action: Action, document: dict, user: str, date: datetime.datetime
+        ) -> dict:
+            document.pop("_id", None)
+            document[cls.audit_user.name] = user
+            document[cls.audit_date_utc.name] = date
             document[cls.audit_action.name] = action.value
-            cls.__collection__.insert_one(document)
+            return document
+
+        @classmethod
+        def _write_audit(cls, records: List[dict]):
+            """
+            Write audit records using a single revisions reservation and a single insertion (per partition).
+            """
+            revisions = cls._reserve(
+                "revision", model.__collection_name__, nb_values=len(records)
+            )
+            for record, revision in zip(records, revisions):
+                record[cls.revision.name] = revision
+            if not partition_audit_by_month:
+                cls.__collection__.insert_many(records)
+                return
+
+            for partition_name, partition_records in itertools.groupby(
+                records, key=lambda record: cls._partition_name(record)
+            ):
+                cls._partition(partition_name).insert_many(list(partition_records))
+
+        @classmethod
+        def update_indexes(cls, document: dict = None):
+            if not partition_audit_by_month:
+                return super().update_indexes(document)
+
+            # Indexes of partitions are updated instead (and when a partition is created)
+            cls._partitions = set()
+            for partition_name in cls._get_partition_names():
+                cls._partition(partition_name, document)
+
+        @classmethod
+        def _partition_name(cls, record: dict) -> str:
+            return f"{cls.__collection_name__}_{record[cls.audit_date_utc.name]:%Y%m}"
+
+        @classmethod
+        def _partition(
+            cls, partition_name: str, document: dict = None
+        ) -> pymongo.collection.Collection:
+            """
+            Monthly audit collection (indexes are synchronized the first time it is used by this process).
+            """
+            partition = base[partition_name]
+            if partition_name not in cls._partitions:
+                _synchronize_indexes(
+                    partition, cls._get_expected_indexes(document), cls.logger
+                )
+                cls._partitions.add(partition_name)
+            return partition
+
+        @classmethod
+        def _get_partition_names(cls) -> List[str]:
+            """
+            :return: Name of existing monthly audit collections, in chronological order.
+            """
+            partition_pattern = re.compile(
+                f"^{re.escape(cls.__collection_name__)}_[0-9]{{6}}$"
+            )
+            return sorted(
+                collection_name
+                for collection_name in base.list_collection_names()
+                if partition_pattern.match(collection_name)
+            )
+
+        @classmethod
+        def _find(
+            cls, filters: dict, offset: int, limit: int, sort: List[Tuple[str, int]]
+        ) -> List[dict]:
+            if not partition_audit_by_month:
+                return super()._find(filters, offset, limit, sort)
+
+            partitions = [
+                base[partition_name]
+                for partition_name in cls._get_queried_partition_names(filters)
+            ]
+            if not sort:
+                # Partitions are queried in chronological order
+                documents = itertools.chain.from_iterable(
+                    partition.find(filters) for partition in partitions
+                )
+                return list(
+                    itertools.islice(
+                        documents, offset, offset + limit if limit else None
+                    )
+                )
+
+            documents = []
+            for partition in partitions:
+                documents.extend(
+                    partition.find(
+                        filters, limit=offset + limit if limit else 0, sort=sort
+                    )
+                )
+            # Sort by the least significant field first (sort is stable)
+            for field_name, direction in reversed(sort):
+                documents.sort(
+                    key=lambda document: _sort_key(document, field_name),
+                    reverse=direction == pymongo.DESCENDING,
+                )
+            return documents[offset : offset + limit if limit else None]
+
+        @classmethod
+        def _get_archive_field_names(cls) -> List[str]:
+            return cls.get_field_names()
+
+        @classmethod
+        def _get_archive_chunk(
+            cls, before: datetime.datetime, after_revision: int, chunk_size: int
+        ) -> List[dict]:
+            """
+            :return: Serialized audit records older than before, ordered by revision.
+            """
+            filters = {
+                cls.audit_date_utc.name: {"$lt": before},
+                cls.revision.name: {"$gt": after_revision},
+            }
+            documents = []
+            for collection in cls._get_audit_collections():
+                documents.extend(
+                    collection.find(
+                        filters, sort=[(cls.revision.name, 1)], limit=chunk_size
+                    )
+                )
+            documents.sort(key=lambda document: document[cls.revision.name])
+            return [cls.serialize(document) for document in documents[:chunk_size]]
+
+        @classmethod
+        def _delete_archived(cls, before: datetime.datetime, up_to_revision: int):
+            filters = {
+                cls.audit_date_utc.name: {"$lt": before},
+                cls.revision.name: {"$lte": up_to_revision},
+            }
+            for collection in cls._get_audit_collections():
+                collection.delete_many(filters)
+                if partition_audit_by_month and not collection.count_documents({}):
+                    # Partition will be recreated (with indexes) if needed
+                    collection.drop()
+                    cls._partitions.discard(collection.name)
+
+        @classmethod
+        def _get_audit_collections(cls) -> List[pymongo.collection.Collection]:
+            if not partition_audit_by_month:
+                return [cls.__collection__]
+            return [
+                base[partition_name] for partition_name in cls._get_partition_names()
+            ]
+
+        @classmethod
+        def _get_queried_partition_names(cls, filters: dict) -> List[str]:
+            """
+            :return: Name of the monthly audit collections that might contain documents matching filters.
+            """
+            partition_names = cls._get_partition_names()
+            date_filter = filters.get(cls.audit_date_utc.name)
+            if date_filter is None:
+                return partition_names
+            if not isinstance(date_filter, dict):
+                date_filter = {"$in": [date_filter]}
+            if "$in" in date_filter:
+                if None in date_filter["$in"]:
+                    return partition_names
+                months = {f"{date:%Y%m}" for date in date_filter["$in"]}
+                return [name for name in partition_names if name[-6:] in months]
+
+            lower = date_filter.get("$gte", date_filter.get("$gt"))
+            upper = date_filter.get("$lte", date_filter.get("$lt"))
+            return [
+                name
+                for name in partition_names
+                if (lower is None or name[-6:] >= f"{lower:%Y%m}")
+                and (upper is None or name[-6:] <= f"{upper:%Y%m}")
+            ]
 
     return AuditModel
 
 
-def _versioning_audit(mixin, base, retrieve_user: callable):
+def _sort_key(document: dict, field_name: str) -> tuple:
+    """
+    Sort key of a document field (dot notation is supported), missing values are considered as the lowest.
+    """
+    value = document
+    for key in field_name.split("."):
+        value = value.get(key) if isinstance(value, dict) else None
+    return (value is not None, value)
+
+
+def _versioning_audit(
+    mixin, base, retrieve_user: callable, audit_writer: Optional[AuditWriter]
+):
     class AuditModel(_CRUDModel, base=base, skip_name_check=True):
         """
         Class providing the audit for all versioned MONGODB models.
         """
 
         __collection_name__ = "audit"
+        # Audit is always queried for a single table
+        __indexes__ = [
+            Index("audit_date_utc", ["table_name", "audit_date_utc"]),
+            Index("audit_user", ["table_name", "audit_user"]),
+        ]
 
         table_name = Column(str, is_primary_key=True)
         revision = Column(int, is_primary_key=True)
 
         audit_user = Column(str)
-        audit_date_utc = Column(datetime.datetime)
+        audit_date_utc = Column(datetime.datetime, allow_comparison_signs=True)
         audit_action = Column(Action)
 
         @classmethod
@@ -115,13 +352,51 @@ def _versioning_audit(mixin, base, retrieve_user: callable):
 
         @classmethod
         def _audit_action(cls, action: Action, revision: int):
-            cls.__collection__.insert_one(
+            record = {
+                cls.table_name.name: mixin.__collection_name__,
+                cls.revision.name: revision,
+                cls.audit_user.name: retrieve_user(),
+                cls.audit_date_utc.name: datetime.datetime.utcnow(),
+                cls.audit_action.name: action.value,
+            }
+            if audit_writer:
+                audit_writer.write(cls, record)
+            else:
+                cls.__collection__.insert_one(record)
+
+        @classmethod
+        def _write_audit(cls, records: List[dict]):
+            cls.__collection__.insert_many(records)
+
+        @classmethod
+        def _get_archive_field_names(cls) -> List[str]:
+            return cls.get_field_names()
+
+        @classmethod
+        def _get_archive_chunk(
+            cls, before: datetime.datetime, after_revision: int, chunk_size: int
+        ) -> List[dict]:
+            """
+            :return: Serialized audit records (of this collection) older than before, ordered by revision.
+            """
+            documents = cls.__collection__.find(
+                {
+                    cls.table_name.name: mixin.__collection_name__,
+                    cls.audit_date_utc.name: {"$lt": before},
+                    cls.revision.name: {"$gt": after_revision},
+                },
+                sort=[(cls.revision.name, 1)],
+                limit=chunk_size,
+            )
+            return [cls.serialize(document) for document in documents]
+
+        @classmethod
+        def _delete_archived(cls, before: datetime.datetime, up_to_revision: int):
+            cls.__collection__.delete_many(
                 {
                     cls.table_name.name: mixin.__collection_name__,
-                    cls.revision.name: revision,
-                    cls.audit_user.name: retrieve_user(),
-                    cls.audit_date_utc.name: datetime.datetime.utcnow(),
-                    cls.audit_action.name: action.value,
+                    cls.audit_date_utc.name: {"$lt": before},
+                    cls.revision.name: {"$lte": up_to_revision},
                 }
             )
 
@@ -2,7 +2,13 @@ import datetime
 import enum
 import copy
 
-from sqlalchemy import Column, DateTime, Enum, String, Integer
+from typing import List, Optional
+
+from sqlalchemy import Column, DateTime, Enum, String, Integer, literal, event
+from sqlalchemy.orm import sessionmaker, exc
+from sqlalchemy.orm.query import Query
+
+from layabase._audit_writer import AuditWriter
 
 
 @enum.unique
@@ -29,10 +35,13 @@ def _to_audit_column(column):
     return column
 
 
-def _create_from(model, retrieve_user: callable):
+def _create_from(
+    model, retrieve_user: callable, audit_writer: Optional[AuditWriter] = None
+):
     """
 
     :param model: CRUDModel of the table that should be audited.
+    :param audit_writer: Write audit from a background thread (once change is committed) if provided.
     :return The class providing additional audit fields and features.
     """
 
@@ -43,8 +52,8 @@ def _create_from(model, retrieve_user: callable):
 
         revision = Column(Integer, primary_key=True, autoincrement=True)
 
-        audit_user = Column(String)
-        audit_date_utc = Column(DateTime)
+        audit_user = Column(String, index=True)
+        audit_date_utc = Column(DateTime, index=True)
         # Enum is created with a table specific name to avoid conflict in PostGreSQL (as enum is created outside table)
         audit_action = Column(
             Enum(
@@ -53,6 +62,13 @@ def _create_from(model, retrieve_user: callable):
             )
         )
 
+        @classmethod
+        def _post_init(cls, session):
+            super()._post_init(session)
+            if audit_writer:
+                event.listen(session, "after_commit", cls._queue_committed)
+                event.listen(session, "after_soft_rollback", cls._discard_uncommitted)
+
         @classmethod
         def audit_add(cls, row: dict):
             """
@@ -68,19 +84,107 @@ def _create_from(model, retrieve_user: callable):
             cls._audit_action(Action.Update, dict(row))
 
         @classmethod
-        def audit_remove(cls, **filters):
+        def audit_remove(cls, query: Query):
             """
-            :param filters: Filters as requested.
+            Copy rows that are about to be removed (within the database, using INSERT INTO ... SELECT).
+
+            :param query: Query selecting the rows that are about to be removed.
             """
-            for removed_row in model.get_all(**filters):
-                cls._audit_action(Action.Delete, removed_row)
+            if audit_writer:
+                # Queued rows must be written first to keep revisions in chronological order
+                audit_writer.flush()
+            columns = list(model.__table__.columns)
+            audited_rows = query.with_entities(
+                *columns,
+                literal(retrieve_user(), String),
+                literal(datetime.datetime.utcnow(), DateTime),
+                literal(Action.Delete.value, String),
+            )
+            # Let any error be handled by the caller (main model), same for commit
+            cls._session.execute(
+                cls.__table__.insert().from_select(
+                    [column.name for column in columns]
+                    + [
+                        cls.audit_user.name,
+                        cls.audit_date_utc.name,
+                        cls.audit_action.name,
+                    ],
+                    audited_rows.statement,
+                )
+            )
 
         @classmethod
         def _audit_action(cls, action: Action, row: dict):
             row["audit_user"] = retrieve_user()
             row["audit_date_utc"] = datetime.datetime.utcnow().isoformat()
             row["audit_action"] = action.value
-            # Let any error be handled by the caller (main model), same for commit
-            cls._session.add(cls.schema().load(row, session=cls._session))
+            if audit_writer:
+                # Row will be queued once the change is committed
+                cls._session.info.setdefault(cls, []).append(row)
+            else:
+                # Let any error be handled by the caller (main model), same for commit
+                cls._session.add(cls.schema().load(row, session=cls._session))
+
+        @classmethod
+        def _queue_committed(cls, session):
+            for row in session.info.pop(cls, []):
+                audit_writer.write(cls, row)
+
+        @classmethod
+        def _discard_uncommitted(cls, session, previous_transaction):
+            session.info.pop(cls, None)
+
+        @classmethod
+        def _write_audit(cls, rows: List[dict]):
+            """
+            Write audit rows within a dedicated session (called from the audit writer thread).
+            """
+            session = sessionmaker(bind=cls._session.bind)()
+            try:
+                session.add_all(cls.schema().load(rows, many=True, session=session))
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+            finally:
+                session.close()
+
+        @classmethod
+        def _get_archive_field_names(cls) -> List[str]:
+            return cls.get_field_names()
+
+        @classmethod
+        def _get_archive_chunk(
+            cls, before: datetime.datetime, after_revision: int, chunk_size: int
+        ) -> List[dict]:
+            """
+            :return: Serialized audit rows older than before, ordered by revision.
+            """
+            query = (
+                cls._session.query(cls)
+                .filter(cls.audit_date_utc < before, cls.revision > after_revision)
+                .order_by(cls.revision)
+                .limit(chunk_size)
+            )
+            try:
+                rows = cls.schema().dump(query.all(), many=True)
+                cls._session.close()
+                return rows
+            except exc.sa_exc.DBAPIError as e:
+                cls._handle_connection_failure(e)
+
+        @classmethod
+        def _delete_archived(cls, before: datetime.datetime, up_to_revision: int):
+            try:
+                cls._session.query(cls).filter(
+                    cls.audit_date_utc < before, cls.revision <= up_to_revision
+                ).delete(synchronize_session=False)
+                cls._session.commit()
+            except exc.sa_exc.DBAPIError as e:
+                cls._session.rollback()
+                cls._handle_connection_failure(e)
+            except Exception:
+                cls._session.rollback()
+                raise
 
     return AuditModel
@@ -0,0 +1,238 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()  # Queued to stop the background thread
+
+
+class AuditWriter:
+    """
+    Write audit records in batches, from a background thread.
+
+    Records are queued in-process (bounded queue) and written when batch_size records are queued,
+    every flush_interval seconds, when flush is called (before every removal for example) or at exit.
+    Writing a record blocks the caller while the queue is full (backpressure).
+
+    Audit records might be lost if the process is killed. Do not provide any audit writer to a
+    CRUDController to keep the synchronous behavior (audit is written alongside the change).
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        max_queue_size: int = 10000,
+        put_timeout: float = None,
+    ):
+        """
+        :param batch_size: Maximum number of records written at once. Default to 100.
+        :param flush_interval: Maximum number of seconds a record stays in queue. Default to 1 second.
+        :param max_queue_size: Maximum number of queued records. Default to 10000.
+        :param put_timeout: Maximum number of seconds to wait for a room in a full queue.
+        Default to None (wait until a room is available). An exception is raised on timeout.
+        """
+        if batch_size < 1:
+            raise Exception("Batch size must be a strictly positive integer.")
+        if flush_interval <= 0:
+            raise Exception("Flush interval must be strictly positive.")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        # Records retrieved from the queue but not written yet (only accessed while holding the lock)
+        self._pending: List[tuple] = []
+        self._lock = threading.RLock()
+        self._thread: threading.Thread = None
+        self._pid = None
+        self._closed = False
+        self._written = 0
+        self._flushes = 0
+        self._failed_flushes = 0
+        self._last_flush_latency = 0.0
+        self._max_flush_latency = 0.0
+        atexit.register(self.close)
+
+    def write(self, model, record: dict):
+        """
+        Queue an audit record.
+
+        :param model: Audit model providing a _write_audit(records) class method.
+        :param record: Audit record, as expected by the audit model.
+        """
+        if self._closed:
+            model._write_audit([record])
+            return
+
+        self._ensure_started()
+        try:
+            self._queue.put((model, record), timeout=self.put_timeout)
+        except queue.Full:
+            raise Exception(
+                f"Audit queue is full ({self._queue.maxsize} records are waiting to be written)."
+            )
+
+    def flush(self):
+        """
+        Wait for all queued records to be written.
+        """
+        if self._closed or not self._is_running():
+            self._write_all_pending()
+            return
+
+        flushed = threading.Event()
+        self._queue.put(flushed)
+        flushed.wait()
+
+    def close(self):
+        """
+        Write all queued records and stop the background thread.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        # Writer does not need to be closed at exit anymore (and can be garbage collected)
+        atexit.unregister(self.close)
+        if self._is_running():
+            self._queue.put(_STOP)
+            self._thread.join()
+        else:
+            self._write_all_pending()
+        with self._lock:
+            if self._pending:
+                logger.error(
+                    f"{len(self._pending)} audit records could not be written."
+                )
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        :return: Number of records waiting to be written (queue_depth), number of records written (written),
+        number of flushes (flushes and failed_flushes), last and maximum flush latency in seconds.
+        """
+        with self._lock:
+            nb_pending = len(self._pending)
+        return {
+            "queue_depth": self._queue.qsize() + nb_pending,
+            "written": self._written,
+            "flushes": self._flushes,
+            "failed_flushes": self._failed_flushes,
+            "last_flush_latency": self._last_flush_latency,
+            "max_flush_latency": self._max_flush_latency,
+        }
+
+    def _is_running(self) -> bool:
+        return (
+            self._thread is not None
+            and self._pid == os.getpid()
+            and self._thread.is_alive()
+        )
+
+    def _ensure_started(self):
+        # Checked without locking first as the lock is held while records are written
+        if self._is_running():
+            return
+        with self._lock:
+            # A forked process does not inherit the background thread
+            if not self._is_running():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(
+                    target=self._run, name="layabase-audit-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            flushed = []
+            deadline = time.monotonic() + self.flush_interval
+            while self._nb_pending() < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                if isinstance(item, threading.Event):
+                    flushed.append(item)
+                    break
+                with self._lock:
+                    self._pending.append(item)
+
+            if flushed or stopping:
+                written = self._write_all_pending()
+            else:
+                written = self._write_pending()
+            for event in flushed:
+                event.set()
+            if not written and not stopping:
+                # Avoid retrying continuously if database is not reachable
+                time.sleep(self.flush_interval)
+
+    def _write_all_pending(self) -> bool:
+        """
+        Write queued and pending records (from the calling thread if background thread is not running).
+
+        :return: True if all records were written.
+        """
+        with self._lock:
+            if not self._is_running():
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is not _STOP and not isinstance(item, threading.Event):
+                        self._pending.append(item)
+
+            while self._pending:
+                if not self._write_pending():
+                    return False
+            return True
+
+    def _nb_pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def _write_pending(self) -> bool:
+        """
+        Write the next batch of pending records.
+
+        :return: True if records were written. Records that could not be written are kept to be written later.
+        """
+        # Lock is held while writing so that the same records are never written twice
+        with self._lock:
+            batch = self._pending[: self.batch_size]
+            if not batch:
+                return True
+
+            records_per_model = {}
+            for model, record in batch:
+                records_per_model.setdefault(model, []).append(record)
+
+            start = time.perf_counter()
+            try:
+                for model, records in records_per_model.items():
+                    model._write_audit(records)
+                    # Only keep records that were not written yet (in case another model fails)
+                    written = {id(record) for record in records}
+                    self._pending = [
+                        item for item in self._pending if id(item[1]) not in written
+                    ]
+                    self._written += len(records)
+            except Exception:
+                self._failed_flushes += 1
+                logger.exception("Unable to write audit records.")
+                return False
+            finally:
+                latency = time.perf_counter() - start
+                self._last_flush_latency = latency
+                self._max_flush_latency = max(self._max_flush_latency, latency)
+
+            self._flushes += 1
+            return True
@@ -0,0 +1,316 @@
+import abc
+import collections
+import hashlib
+import os
+import pickle
+import threading
+import time
+import uuid
+from typing import Any, Dict, Optional, Tuple
+
+
+class QueryCache(abc.ABC):
+    """
+    Store query results of a single CRUDController.
+
+    Values are stored pickled so that cached results cannot be altered by callers.
+    Every entry is tagged with the generation of the cache at the time the query was started:
+    clearing the cache starts a new generation, so that a result retrieved before a write (and stored after it)
+    is never served.
+    Inherit from this class to provide another storage.
+    """
+
+    def __init__(self, ttl: Optional[float] = 60.0):
+        """
+        :param ttl: Number of seconds a query result is kept. Default to 60 seconds. None to keep it until evicted.
+        """
+        if ttl is not None and ttl <= 0:
+            raise Exception("Time to live must be strictly positive.")
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        :return: A tuple with True and the cached value if found (and not expired), False and None otherwise.
+        """
+        entry = self._load(key)
+        if entry is not None:
+            generation, stored_at, value = entry
+            if generation != self.generation():
+                self._discard(key)
+            elif self.ttl is None or time.time() - stored_at < self.ttl:
+                self._hits += 1
+                return True, pickle.loads(value)
+            else:
+                self._expirations += 1
+                self._discard(key)
+        self._misses += 1
+        return False, None
+
+    def set(self, key: str, value, generation: Optional[str] = None):
+        """
+        :param generation: Generation of the cache when the query was started. Default to the current generation.
+        Value is not stored if the cache was cleared since then.
+        """
+        current_generation = self.generation()
+        if generation is not None and generation != current_generation:
+            return
+        self._store(key, (current_generation, time.time(), pickle.dumps(value)))
+
+    @abc.abstractmethod
+    def generation(self) -> str:
+        """
+        :return: Identifier of the current generation (changed by every clear).
+        """
+
+    @abc.abstractmethod
+    def clear(self):
+        """
+        Remove every cached value (data changed) and start a new generation.
+        """
+
+    def stats(self) -> Dict[str, int]:
+        """
+        :return: Number of hits, misses, evictions (to respect bounds) and expirations (ttl), number of entries and their size in bytes.
+        """
+        entries, size = self._usage()
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+            "entries": entries,
+            "size": size,
+        }
+
+    @abc.abstractmethod
+    def _load(self, key: str) -> Optional[Tuple[str, float, bytes]]:
+        """
+        :return: Generation, storage time and pickled value (None if not found).
+        """
+
+    @abc.abstractmethod
+    def _store(self, key: str, entry: Tuple[str, float, bytes]):
+        pass
+
+    @abc.abstractmethod
+    def _discard(self, key: str):
+        pass
+
+    @abc.abstractmethod
+    def _usage(self) -> Tuple[int, int]:
+        """
+        :return: Number of entries and their size in bytes.
+        """
+
+
+class MemoryCache(QueryCache):
+    """
+    Cache query results within this process (least recently used entries are evicted first).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        max_size: Optional[int] = 64 * 1024 * 1024,
+        ttl: Optional[float] = 60.0,
+    ):
+        """
+        :param max_entries: Maximum number of cached query results. Default to 1000.
+        :param max_size: Maximum size (in bytes, pickled) of all cached query results. Default to 64MB. None for no limit.
+        Query results bigger than this size are not cached.
+        :param ttl: Number of seconds a query result is kept. Default to 60 seconds. None to keep it until evicted.
+        """
+        super().__init__(ttl)
+        if max_entries < 1:
+            raise Exception(
+                "Maximum number of entries must be a strictly positive integer."
+            )
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self._entries: Dict[str, Tuple[str, float, bytes]] = collections.OrderedDict()
+        self._size = 0
+        self._generation = 0
+
+    def generation(self) -> str:
+        return str(self._generation)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._size = 0
+
+    def _load(self, key: str) -> Optional[Tuple[str, float, bytes]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _store(self, key: str, entry: Tuple[str, float, bytes]):
+        entry_size = len(entry[2])
+        if self.max_size is not None and entry_size > self.max_size:
+            return
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = entry
+            self._size += entry_size
+            while len(self._entries) > self.max_entries or (
+                self.max_size is not None and self._size > self.max_size
+            ):
+                self._pop(next(iter(self._entries)))
+                self._evictions += 1
+
+    def _discard(self, key: str):
+        with self._lock:
+            self._pop(key)
+
+    def _pop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[2])
+
+    def _usage(self) -> Tuple[int, int]:
+        return len(self._entries), self._size
+
+
+class FileCache(QueryCache):
+    """
+    Cache query results as files within a directory, to be shared by several processes (workers).
+    Use a memory backed directory (such as /dev/shm) to share the cache in memory.
+
+    Every process must use the same directory, a dedicated directory per controller is required.
+    The generation is stored in a file within the directory, so that a clear performed by any process
+    invalidates entries stored afterwards by queries started before it.
+    Least recently used entries are evicted first (based on file modification time).
+    Bounds are checked against the usage known by this process (as listed by the last eviction, plus entries it stored since),
+    the directory is only listed once those estimates exceed a bound.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_entries: int = 1000,
+        max_size: Optional[int] = 64 * 1024 * 1024,
+        ttl: Optional[float] = 60.0,
+    ):
+        """
+        :param directory: Directory where cached query results are stored. Created if it does not exist.
+        :param max_entries: Maximum number of cached query results. Default to 1000.
+        :param max_size: Maximum size (in bytes, pickled) of all cached query results. Default to 64MB. None for no limit.
+        :param ttl: Number of seconds a query result is kept. Default to 60 seconds. None to keep it until evicted.
+        """
+        super().__init__(ttl)
+        if max_entries < 1:
+            raise Exception(
+                "Maximum number of entries must be a strictly positive integer."
+            )
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+        self._generation_path = os.path.join(directory, "generation")
+        self._estimated_entries, self._estimated_size = self._usage()
+
+    def generation(self) -> str:
+        try:
+            with open(self._generation_path) as generation_file:
+                return generation_file.read()
+        except FileNotFoundError:
+            return ""
+
+    def clear(self):
+        # New generation first, so that entries of queries started before are ignored even if stored meanwhile
+        self._replace(self._generation_path, uuid.uuid4().hex.encode())
+        for file_name in self._file_names():
+            self._remove(file_name)
+        with self._lock:
+            self._estimated_entries, self._estimated_size = 0, 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(
+            self.directory, f"{hashlib.sha1(key.encode()).hexdigest()}.cache"
+        )
+
+    def _file_names(self):
+        return [
+            file_name
+            for file_name in os.listdir(self.directory)
+            if file_name.endswith(".cache")
+        ]
+
+    def _remove(self, file_name: str):
+        try:
+            os.remove(os.path.join(self.directory, file_name))
+        except FileNotFoundError:
+            pass  # Already removed by another process
+
+    def _replace(self, path: str, content: bytes):
+        # Replace file at once so that other processes never read a partial content
+        temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary_path, "wb") as temporary_file:
+            temporary_file.write(content)
+        os.replace(temporary_path, path)
+
+    def _load(self, key: str) -> Optional[Tuple[str, float, bytes]]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as cache_file:
+                stored_key, entry = pickle.load(cache_file)
+            # Mark as recently used
+            os.utime(path)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+        # Protect against hash collisions
+        return entry if stored_key == key else None
+
+    def _store(self, key: str, entry: Tuple[str, float, bytes]):
+        if self.max_size is not None and len(entry[2]) > self.max_size:
+            return
+        content = pickle.dumps((key, entry))
+        self._replace(self._path(key), content)
+        with self._lock:
+            self._estimated_entries += 1
+            self._estimated_size += len(content)
+            if self._estimated_entries <= self.max_entries and (
+                self.max_size is None or self._estimated_size <= self.max_size
+            ):
+                return
+        self._evict()
+
+    def _discard(self, key: str):
+        self._remove(os.path.basename(self._path(key)))
+
+    def _evict(self):
+        files = []
+        for file_name in self._file_names():
+            try:
+                file_stat = os.stat(os.path.join(self.directory, file_name))
+            except FileNotFoundError:
+                continue
+            files.append((file_stat.st_mtime, file_stat.st_size, file_name))
+        files.sort()
+        size = sum(file_size for _, file_size, _ in files)
+        while len(files) > self.max_entries or (
+            self.max_size is not None and size > self.max_size and len(files) > 1
+        ):
+            _, file_size, file_name = files.pop(0)
+            self._remove(file_name)
+            size -= file_size
+            self._evictions += 1
+        with self._lock:
+            self._estimated_entries, self._estimated_size = len(files), size
+
+    def _usage(self) -> Tuple[int, int]:
+        sizes = []
+        for file_name in self._file_names():
+            try:
+                sizes.append(os.path.getsize(os.path.join(self.directory, file_name)))
+            except FileNotFoundError:
+                continue
+        return len(sizes), sum(sizes)
@@ -1,6 +1,15 @@
+import contextlib
+import copy
+import datetime
 import enum
+import hashlib
+import io
+import itertools
+import json
 import logging
-from typing import List, Union, Iterable
+import time
+import uuid
+from typing import Callable, List, Union, Iterable
 
 from layabase._exceptions import ControllerModelNotSet, ValidationFailed
 
@@ -84,6 +93,18 @@ class CRUDController:
         :param skip_update_indexes: True to never update indexes. Warning, this might lead to invalid indexes on the underlying table or collection. (Mongo only)
         :param skip_log_for_unknown_fields: List of unknown field names that are to be expected.
         :param retrieve_user: Callable returning the user to store in case of audit.
+        :param cache: layabase.MemoryCache (or FileCache) instance to cache query results (get, get_one and get_field_names). Cache is cleared by every write performed through this controller. No cache by default.
+        :param validate_cache_with_revision: True to only serve cached query results if the current revision did not change since they were cached. Writes performed by other processes are then considered (at the cost of reading the revision counter). False by default. (Mongo only, with history and revision_block_size of 1)
+        :param snapshot: True to keep a full in-memory copy of the table or collection (meant for small, read-mostly ones). get and get_one filters are then evaluated in memory (rows are hash indexed on primary keys and indexed fields) unless they cannot be (filter value of another type, unknown fields...). Writes performed through this controller refresh the written rows. Primary key is required. False by default.
+        :param snapshot_refresh_interval: Number of seconds after which the snapshot is fully reloaded (to consider writes performed by other processes). Default to 60 seconds. None to never reload it.
+        :param post_coalescer: layabase.PostCoalescer instance to insert documents provided by concurrent post calls at once. Every document is inserted on its own by default.
+        :param audit_writer: layabase.AuditWriter instance to write audit in batches from a background thread. Audit is written alongside every change by default.
+        :param partition_audit_by_month: True to store audit in one collection per month (named after the audit collection, suffixed by _YYYYMM). Audit queries filtering on audit_date_utc only query the relevant months. Audit is stored in a single collection by default. (Mongo only, without history)
+        :param counter_block_size: Number of auto incremented values reserved at once by this process for a single insert. Values are always reserved at once for many inserts. 1 by default (values are reserved one at a time). (Mongo only)
+        :param shared_revision: False to use a revision counter dedicated to this collection. Revision counter is shared by all versioned collections by default. (Mongo only, with history)
+        :param revision_block_size: Number of revisions reserved at once by this process. Only use it if this process is the only one writing to this collection as revisions would not reflect the order of changes otherwise. 1 by default (revisions are reserved one at a time). (Mongo only, with history)
+        :param changes_revision_lag: Number of most recent revisions whose changes are provided again by the next get_changes call. Writes performed concurrently by other threads or processes might reserve a revision before a more recent revision is written, those writes are provided on next call as long as they are performed within this number of revisions. 10 by default. (Mongo only, with history)
+        :param validation_pool: layabase.ValidationPool instance to validate and deserialize huge lists of documents (post_many, put_many, post_each and import_file chunks) on worker processes. Documents are validated within the calling process by default. (Mongo only)
         """
         if not table_or_collection:
             raise Exception("Table or Collection must be provided.")
@@ -98,6 +119,38 @@ class CRUDController:
         self.supports_offset = True
         # By default, audit user will be blank
         self.retrieve_user = kwargs.pop("retrieve_user", lambda: "")
+        # By default, audit is written alongside every change
+        self.audit_writer = kwargs.pop("audit_writer", None)
+        # By default, query results are not cached
+        self.cache = kwargs.pop("cache", None)
+        # By default, every posted document is inserted on its own
+        self.post_coalescer = kwargs.pop("post_coalescer", None)
+        # By default, every query is performed on the table or collection
+        self.snapshot = kwargs.pop("snapshot", False)
+        self.snapshot_refresh_interval = kwargs.pop("snapshot_refresh_interval", 60.0)
+        if self.snapshot_refresh_interval is not None and (
+            self.snapshot_refresh_interval <= 0
+        ):
+            raise Exception("Snapshot refresh interval must be strictly positive.")
+        self.partition_audit_by_month = kwargs.pop("partition_audit_by_month", False)
+        self.counter_block_size = kwargs.pop("counter_block_size", 1)
+        self.shared_revision = kwargs.pop("shared_revision", True)
+        self.revision_block_size = kwargs.pop("revision_block_size", 1)
+        self.changes_revision_lag = kwargs.pop("changes_revision_lag", 10)
+        # By default, documents are validated within the calling process
+        self.validation_pool = kwargs.pop("validation_pool", None)
+        self.validate_cache_with_revision = kwargs.pop(
+            "validate_cache_with_revision", False
+        )
+        if self.validate_cache_with_revision:
+            if not self.history:
+                raise Exception(
+                    "Cache can only be validated with revision when history is enabled."
+                )
+            if self.revision_block_size != 1:
+                raise Exception(
+                    "Cache cannot be validated with revision when revisions are reserved by block."
+                )
 
         # Generated from table_or_collection, appropriate class depending on what was requested on controller
         self._model = None
@@ -105,13 +158,25 @@ class CRUDController:
         # The response that is always sent for the Model Description
         self._model_description_dictionary = None
 
+        # Created (from the model) on first query if requested
+        self._snapshot = None
+
+        # Version of the data (changed by every write performed through this controller)
+        self._instance_id = uuid.uuid4().hex[:8]
+        self._write_versions = itertools.count(1)
+        self._write_version = 0
+
     @property
     def flask_restx(self):
         from layabase._flask_restx import ParsersAndModels
 
         if not hasattr(self, "_flask_restx"):
             self._flask_restx = ParsersAndModels(
-                self.table_or_collection, self.history, self.audit, self.supports_offset
+                self.table_or_collection,
+                self.history,
+                self.audit,
+                self.supports_offset,
+                get_etag=self.get_etag,
             )
         return self._flask_restx
 
@@ -123,7 +188,11 @@ class CRUDController:
             raise ControllerModelNotSet(self)
         if not isinstance(request_arguments, dict):
             raise ValidationFailed(request_arguments, message="Must be a dictionary.")
-        return self._model.get_all(**request_arguments)
+        return self._cached(
+            "get",
+            request_arguments,
+            lambda: self._retrieve("get_all", request_arguments),
+        )
 
     def get_one(self, request_arguments: dict) -> dict:
         """
@@ -133,7 +202,11 @@ class CRUDController:
             raise ControllerModelNotSet(self)
         if not isinstance(request_arguments, dict):
             raise ValidationFailed(request_arguments, message="Must be a dictionary.")
-        return self._model.get(**request_arguments)
+        return self._cached(
+            "get_one",
+            request_arguments,
+            lambda: self._retrieve("get", request_arguments),
+        )
 
     def get_last(self, request_arguments: dict) -> dict:
         """
@@ -145,6 +218,124 @@ class CRUDController:
             raise ValidationFailed(request_arguments, message="Must be a dictionary.")
         return self._model.get_last(**request_arguments)
 
+    def get_etag(self, request_arguments: dict) -> str:
+        """
+        Return an entity tag (without quotes) identifying the response to a query.
+        It changes whenever data might have changed.
+
+        With history, it relies on the current revision (changes performed by any process are considered).
+        Otherwise (or if revisions are reserved by block, as the revision counter does not change with every write),
+        it relies on writes performed through this controller (changes performed by other processes are not considered).
+
+        :param request_arguments: Query (as provided to get or get_one).
+        """
+        if not self._model:
+            raise ControllerModelNotSet(self)
+        if self.revision_block_size == 1 and hasattr(self._model, "current_revision"):
+            version = str(self._model.current_revision())
+        else:
+            version = f"{self._instance_id}.{self._write_version}"
+        query = hashlib.sha1(_normalize(request_arguments).encode()).hexdigest()[:16]
+        return f"{version}-{query}"
+
+    def _retrieve(self, method_name: str, request_arguments: dict):
+        """
+        Perform a query on the snapshot (if requested and if it can be evaluated in memory), on the model otherwise.
+
+        :param method_name: get_all or get.
+        """
+        if self.snapshot:
+            if self._snapshot is None:
+                from layabase._snapshot import Snapshot
+
+                self._snapshot = Snapshot(self._model, self.snapshot_refresh_interval)
+            result = getattr(self._snapshot, method_name)(request_arguments)
+            if result is not None:
+                return result
+        return getattr(self._model, method_name)(**request_arguments)
+
+    @contextlib.contextmanager
+    def _writing(self):
+        """
+        Consider that data changed once the write is over (even if it failed).
+        The snapshot is fully reloaded on next query if the write failed (it might have been partially performed).
+        """
+        try:
+            yield
+        except Exception:
+            if self._snapshot:
+                self._snapshot.invalidate()
+            raise
+        finally:
+            self._changed()
+
+    def _changed(self):
+        self._write_version = next(self._write_versions)
+        if self.cache:
+            self.cache.clear()
+
+    def _cached(self, method_name: str, request_arguments: dict, retrieve: callable):
+        """
+        Return cached result of a query (retrieve and cache it if not cached yet).
+
+        :param retrieve: Function performing the query.
+        """
+        if not self.cache:
+            return retrieve()
+
+        key = f"{method_name}:{_normalize(request_arguments)}"
+        if self.validate_cache_with_revision:
+            # Results cached for a previous revision are stale (and will be evicted)
+            key = f"{self._model.current_revision()}:{key}"
+        found, result = self.cache.get(key)
+        if found:
+            return result
+        generation = self.cache.generation()
+        write_version = self._write_version
+        result = retrieve()
+        # Do not cache a result that might have been retrieved before a concurrent write (by any process)
+        if write_version == self._write_version:
+            self.cache.set(key, result, generation)
+        return result
+
+    def get_arrow(self, request_arguments: dict, batch_size: int = 10000):
+        """
+        Return models matching those criterion as an Arrow table (requires pyarrow).
+        Values are converted from database values batch by batch, without formatting models as dictionaries.
+
+        Columns are typed according to the column (or field) type: integers (int64), floats and decimals (float64),
+        booleans, dates (date32), date times (timestamp), times (time64) and bytes (binary).
+        Other values are stored as strings (enum names, JSON dictionaries and lists, ...).
+
+        :param batch_size: Maximum number of models fetched and converted at once. Default to 10000.
+        :returns pyarrow.Table
+        """
+        return self._get_arrow(request_arguments, batch_size)
+
+    def _get_arrow(self, request_arguments: dict, batch_size: int):
+        if not self._model:
+            raise ControllerModelNotSet(self)
+        if not isinstance(request_arguments, dict):
+            raise ValidationFailed(request_arguments, message="Must be a dictionary.")
+        if batch_size < 1:
+            raise Exception("Batch size must be a strictly positive integer.")
+        from layabase._arrow import to_table
+
+        column_batches = self._model.iter_columns(
+            batch_size, **copy.deepcopy(request_arguments)
+        )
+        return to_table(column_batches, self._model._get_field_types())
+
+    def get_dataframe(self, request_arguments: dict, batch_size: int = 10000):
+        """
+        Return models matching those criterion as a pandas DataFrame (requires pyarrow and pandas).
+        DataFrame is built from the Arrow table returned by get_arrow.
+
+        :param batch_size: Maximum number of models fetched and converted at once. Default to 10000.
+        :returns pandas.DataFrame
+        """
+        return self._get_arrow(request_arguments, batch_size).to_pandas()
+
     def get_url(self, endpoint: str, *new_dicts) -> str:
         """
         Return URL providing dictionaries.
@@ -175,7 +366,14 @@ class CRUDController:
         """
         if not self._model:
             raise ControllerModelNotSet(self)
-        return self._model.add(new_dict)
+        with self._writing():
+            if self.post_coalescer:
+                new_row = self.post_coalescer.add(self._model, new_dict)
+            else:
+                new_row = self._model.add(new_dict)
+            if self._snapshot:
+                self._snapshot.refresh_rows([new_row])
+        return new_row
 
     def post_many(self, new_dicts: List[dict]) -> List[dict]:
         """
@@ -185,7 +383,139 @@ class CRUDController:
         """
         if not self._model:
             raise ControllerModelNotSet(self)
-        return self._model.add_all(new_dicts)
+        return self._post_many(new_dicts)
+
+    def _post_many(self, new_dicts: List[dict]) -> List[dict]:
+        with self._writing():
+            new_rows = self._model.add_all(new_dicts)
+            if self._snapshot:
+                self._snapshot.refresh_rows(new_rows)
+        return new_rows
+
+    def post_each(self, new_dicts: List[dict]) -> dict:
+        """
+        Add models formatted as a list of dictionaries, each model being inserted (or rejected) independently
+        of the others (unordered insertion). Valid models are inserted even if some others are rejected.
+        :raises ValidationFailed in case the provided data is not a list.
+        :returns Inserted models formatted as dictionaries, per index within new_dicts (inserted)
+        and validation errors per index within new_dicts (errors, same as ValidationFailed errors).
+        """
+        if not self._model:
+            raise ControllerModelNotSet(self)
+        if not new_dicts:
+            raise ValidationFailed([], message="No data provided.")
+        if not isinstance(new_dicts, list):
+            raise ValidationFailed(new_dicts, message="Must be a list of dictionaries.")
+        return self._post_each(new_dicts)
+
+    def _post_each(self, new_dicts: List[dict]) -> dict:
+        inserted = {}
+        errors = {}
+        with self._writing():
+            for index, result in enumerate(self._model.add_each(new_dicts)):
+                if isinstance(result, ValidationFailed):
+                    errors[index] = result.errors
+                else:
+                    inserted[index] = result
+            if self._snapshot:
+                self._snapshot.refresh_rows(list(inserted.values()))
+        return {"inserted": inserted, "errors": errors}
+
+    def import_file(
+        self, path: str, file_format: str = None, chunk_size: int = 1000
+    ) -> dict:
+        """
+        Add models stored in a local file, chunk by chunk (only a chunk of records is held in memory).
+        Records are validated as posted models, each one being inserted (or rejected) independently of the others
+        (as post_each would do).
+
+        :param path: Path to a local csv (with a header line), ndjson (one JSON record per line)
+        or parquet (requires pyarrow) file. csv and ndjson files can be gzip compressed (path suffixed by .gz).
+        csv values are provided as strings and empty csv values are considered as not provided.
+        :param file_format: csv, ndjson or parquet. Default to the one matching the path extension.
+        :param chunk_size: Maximum number of records validated and inserted at once. Default to 1000.
+        :returns Number of inserted models (inserted)
+        and validation errors per line (row number for parquet) within the file (errors).
+        """
+        if not self._model:
+            raise ControllerModelNotSet(self)
+        if chunk_size < 1:
+            raise Exception("Chunk size must be a strictly positive integer.")
+        from layabase._import import read_records
+
+        nb_inserted = 0
+        errors = {}
+        records = read_records(path, file_format)
+        while True:
+            chunk = list(itertools.islice(records, chunk_size))
+            if not chunk:
+                break
+            lines = []
+            new_dicts = []
+            for line, record in chunk:
+                if isinstance(record, ValidationFailed):
+                    errors[line] = record.errors
+                else:
+                    lines.append(line)
+                    new_dicts.append(record)
+            if not new_dicts:
+                continue
+            result = self._post_each(new_dicts)
+            nb_inserted += len(result["inserted"])
+            for index, record_errors in result["errors"].items():
+                errors[lines[index]] = record_errors
+            logger.debug(f"{nb_inserted} records of {path} inserted.")
+
+        logger.info(
+            f"{nb_inserted} records of {path} inserted ({len(errors)} rejected)."
+        )
+        return {"inserted": nb_inserted, "errors": errors}
+
+    def export(
+        self,
+        request_arguments: dict,
+        path_or_stream: Union[str, io.IOBase],
+        file_format: str = None,
+        batch_size: int = 1000,
+    ) -> int:
+        """
+        Write models matching those criterion to a file (or a file-like object), batch by batch
+        (only a batch of models is held in memory). Models are formatted as they would be by get,
+        Parquet columns being typed as they would be by get_arrow.
+
+        :param path_or_stream: Path to a file (replaced if it already exists) or a writable file-like object.
+        csv and ndjson files are gzip compressed if path is suffixed by .gz.
+        :param file_format: csv (with a header line), ndjson (one JSON record per line) or parquet (requires pyarrow).
+        Default to the one matching the path extension.
+        :param batch_size: Maximum number of models fetched and written at once. Default to 1000.
+        :returns Number of exported models.
+        """
+        if not self._model:
+            raise ControllerModelNotSet(self)
+        if not isinstance(request_arguments, dict):
+            raise ValidationFailed(request_arguments, message="Must be a dictionary.")
+        if batch_size < 1:
+            raise Exception("Batch size must be a strictly positive integer.")
+        from layabase._import import deduce_file_format
+        from layabase._export import export
+
+        if not file_format and isinstance(path_or_stream, str):
+            file_format = deduce_file_format(path_or_stream)
+        # Query is validated before writing anything
+        if file_format == "parquet":
+            # Parquet columns are typed from values as stored in database
+            batches = self._model.iter_columns(
+                batch_size, **copy.deepcopy(request_arguments)
+            )
+        else:
+            batches = self._model.iter_all(
+                batch_size, **copy.deepcopy(request_arguments)
+            )
+        nb_exported = export(
+            batches, self._model._get_field_types(), path_or_stream, file_format
+        )
+        logger.info(f"{nb_exported} models exported.")
+        return nb_exported
 
     def put(self, updated_dict: dict) -> (dict, dict):
         """
@@ -196,7 +526,11 @@ class CRUDController:
         """
         if not self._model:
             raise ControllerModelNotSet(self)
-        return self._model.update(updated_dict)
+        with self._writing():
+            previous_row, new_row = self._model.update(updated_dict)
+            if self._snapshot:
+                self._snapshot.refresh_rows([new_row])
+        return previous_row, new_row
 
     def put_many(self, updated_dicts: List[dict]) -> (List[dict], List[dict]):
         """
@@ -207,7 +541,165 @@ class CRUDController:
         """
         if not self._model:
             raise ControllerModelNotSet(self)
-        return self._model.update_all(updated_dicts)
+        return self._put_many(updated_dicts)
+
+    def _put_many(self, updated_dicts: List[dict]) -> (List[dict], List[dict]):
+        with self._writing():
+            previous_rows, new_rows = self._model.update_all(updated_dicts)
+            if self._snapshot:
+                self._snapshot.refresh_rows(new_rows)
+        return previous_rows, new_rows
+
+    def upsert(self, new_dict: dict) -> (bool, dict):
+        """
+        Add a model formatted as a dictionary, or update it if it already exists (same primary key),
+        in a single operation. Only provided fields are updated.
+        :raises ValidationFailed in case Marshmallow validation fail.
+        :returns A tuple containing True if model was inserted, False if it was updated (first item)
+        and new model formatted as a dictionary (second item).
+        """
+        if not self._model:
+            raise ControllerModelNotSet(self)
+        with self._writing():
+            inserted, new_row = self._model.upsert(new_dict)
+            if self._snapshot:
+                self._snapshot.refresh_rows([new_row])
+        return inserted, new_row
+
+    def upsert_many(self, new_dicts: List[dict]) -> (List[bool], List[dict]):
+        """
+        Add models formatted as a list of dictionaries, or update them if they already exist (same primary key),
+        in a single operation. Only provided fields are updated.
+        :raises ValidationFailed in case Marshmallow validation fail.
+        :returns A tuple containing, per model, True if it was inserted, False if it was updated (first item)
+        and new models formatted as a list of dictionaries (second item).
+        """
+        if not self._model:
+            raise ControllerModelNotSet(self)
+        with self._writing():
+            inserted, new_rows = self._model.upsert_all(new_dicts)
+            if self._snapshot:
+                self._snapshot.refresh_rows(new_rows)
+        return inserted, new_rows
+
+    def post_chunks(
+        self,
+        new_dicts: Iterable[dict],
+        chunk_size: int = 1000,
+        best_effort: bool = False,
+    ) -> List[dict]:
+        """
+        Add models formatted as dictionaries, chunk by chunk.
+        Each chunk is validated, inserted and committed on its own (as post_many would do).
+
+        :param new_dicts: Models formatted as dictionaries. Can be an iterator (only one chunk is kept in memory).
+        :param chunk_size: Maximum number of models inserted at once. Default to 1000.
+        :param best_effort: True to keep inserting following chunks if a chunk cannot be inserted.
+        False by default: models inserted by previous chunks are removed and the error is raised (all or nothing).
+        Errors are always provided per index within new_dicts.
+        :raises ValidationFailed in case validation fail (all or nothing).
+        :returns Per chunk results: index of the first model of the chunk (first_index), number of models (size),
+        and either the inserted models formatted as a list of dictionaries (inserted) or the error (error).
+        """
+        if not self._model:
+            raise ControllerModelNotSet(self)
+        if not best_effort and not self._model.get_primary_keys():
+            raise Exception("Primary key is required to remove inserted chunks.")
+
+        results = []
+        for first_index, chunk in _chunks(new_dicts, chunk_size):
+            result = {"first_index": first_index, "size": len(chunk)}
+            try:
+                result["inserted"] = self._post_many(chunk)
+            except Exception as e:
+                _shift_indexes(e, first_index, chunk)
+                if not best_effort:
+                    self._remove_inserted(results)
+                    raise
+                result["error"] = e
+            results.append(result)
+        return results
+
+    def put_chunks(
+        self,
+        updated_dicts: Iterable[dict],
+        chunk_size: int = 1000,
+        best_effort: bool = False,
+    ) -> List[dict]:
+        """
+        Update models formatted as dictionaries, chunk by chunk.
+        Each chunk is validated, updated and committed on its own (as put_many would do).
+
+        :param updated_dicts: Models formatted as dictionaries. Can be an iterator (only one chunk is kept in memory).
+        :param chunk_size: Maximum number of models updated at once. Default to 1000.
+        :param best_effort: True to keep updating following chunks if a chunk cannot be updated.
+        False by default: models updated by previous chunks are restored and the error is raised (all or nothing).
+        Errors are always provided per index within updated_dicts.
+        :raises ValidationFailed in case validation fail (all or nothing).
+        :returns Per chunk results: index of the first model of the chunk (first_index), number of models (size),
+        and either previous and new models formatted as lists of dictionaries (previous and updated)
+        or the error (error).
+        """
+        if not self._model:
+            raise ControllerModelNotSet(self)
+
+        results = []
+        for first_index, chunk in _chunks(updated_dicts, chunk_size):
+            result = {"first_index": first_index, "size": len(chunk)}
+            try:
+                result["previous"], result["updated"] = self._put_many(chunk)
+            except Exception as e:
+                _shift_indexes(e, first_index, chunk)
+                if not best_effort:
+                    self._restore_updated(results)
+                    raise
+                result["error"] = e
+            results.append(result)
+        return results
+
+    def _remove_inserted(self, results: List[dict]):
+        """
+        Compensate insertion of chunks (most recent first).
+        """
+        primary_keys = self._model.get_primary_keys()
+        for result in reversed(results):
+            logger.info(
+                f"Removing {result['size']} rows inserted from index {result['first_index']}..."
+            )
+            if len(primary_keys) == 1:
+                self._delete(
+                    {
+                        primary_keys[0]: [
+                            row[primary_keys[0]] for row in result["inserted"]
+                        ]
+                    }
+                )
+            else:
+                for row in result["inserted"]:
+                    self._delete({key: row[key] for key in primary_keys})
+
+    def _restore_updated(self, results: List[dict]):
+        """
+        Compensate update of chunks (most recent first).
+        """
+        for result in reversed(results):
+            logger.info(
+                f"Restoring {result['size']} rows updated from index {result['first_index']}..."
+            )
+            with self._writing():
+                # Previous rows are fully restored (fields that were not set are not kept)
+                restored_rows = self._model.replace_all(
+                    [
+                        {
+                            field: value
+                            for field, value in row.items()
+                            if field not in _REVISION_FIELDS
+                        }
+                        for row in result["previous"]
+                    ]
+                )[1]
+                if self._snapshot:
+                    self._snapshot.refresh_rows(restored_rows)
 
     def delete(self, request_arguments: dict) -> int:
         """
@@ -218,7 +710,55 @@ class CRUDController:
             raise ControllerModelNotSet(self)
         if not isinstance(request_arguments, dict):
             raise ValidationFailed(request_arguments, message="Must be a dictionary.")
-        return self._model.remove(**request_arguments)
+        return self._delete(request_arguments)
+
+    def _delete(self, request_arguments: dict) -> int:
+        with self._writing():
+            nb_removed = self._model.remove(**request_arguments)
+            if self._snapshot:
+                self._snapshot.remove_matching(request_arguments)
+        return nb_removed
+
+    def delete_chunks(
+        self,
+        request_arguments: dict,
+        chunk_size: int = 1000,
+        pause: float = 0.0,
+        progress: Callable[[int], None] = None,
+    ) -> int:
+        """
+        Remove the model(s) matching those criterion, chunk by chunk.
+        Each chunk is selected by primary key, then removed (and audited) within its own transaction,
+        so that locks are only held on a chunk at a time. With history, each chunk is a new revision.
+
+        :param chunk_size: Maximum number of models removed at once. Default to 1000.
+        :param pause: Number of seconds to wait between chunks (to let replicas catch up for example). No pause by default.
+        :param progress: Callable receiving the number of models removed so far, called after every chunk.
+        :returns Number of removed rows.
+        """
+        if not self._model:
+            raise ControllerModelNotSet(self)
+        if not isinstance(request_arguments, dict):
+            raise ValidationFailed(request_arguments, message="Must be a dictionary.")
+        if chunk_size < 1:
+            raise Exception("Chunk size must be a strictly positive integer.")
+
+        nb_removed = 0
+        while True:
+            with self._writing():
+                # Filters are deserialized (updated) by the model
+                nb_chunk_removed = self._model.remove_chunk(
+                    chunk_size, **copy.deepcopy(request_arguments)
+                )
+                if self._snapshot:
+                    self._snapshot.remove_matching(request_arguments)
+            nb_removed += nb_chunk_removed
+            if nb_chunk_removed and progress:
+                progress(nb_removed)
+            if nb_chunk_removed < chunk_size:
+                return nb_removed
+            if pause:
+                time.sleep(pause)
 
     def get_audit(self, request_arguments: dict) -> List[dict]:
         """
@@ -232,6 +772,32 @@ class CRUDController:
             raise ValidationFailed(request_arguments, message="Must be a dictionary.")
         return self._model.audit_model.get_all(**request_arguments)
 
+    def archive_audit(
+        self,
+        before: datetime.datetime,
+        path: str,
+        file_format: str = "ndjson",
+        chunk_size: int = 1000,
+    ) -> int:
+        """
+        Move audit records older than a cutoff to a gzip compressed file (then remove them from audit).
+        Records are archived by chunk, an interrupted archiving is resumed by calling this method again.
+
+        :param before: Records audited strictly before this date (UTC) are archived.
+        :param path: Path to the gzip file. Records are appended if the file already exists.
+        A progress file (path suffixed by .progress) is stored next to it until archiving is over.
+        :param file_format: ndjson (one JSON record per line) or csv (with a header line). Default to ndjson.
+        :param chunk_size: Maximum number of records read, written and removed at once. Default to 1000.
+        :returns Number of archived records.
+        """
+        if not self._model:
+            raise ControllerModelNotSet(self)
+        if not self._model.audit_model:
+            return 0
+        from layabase._audit_archive import archive
+
+        return archive(self._model.audit_model, before, path, file_format, chunk_size)
+
     def get_model_description(self) -> dict:
         if not self._model_description_dictionary:
             raise ControllerModelNotSet(self)
@@ -246,7 +812,11 @@ class CRUDController:
             raise ControllerModelNotSet(self)
         if not isinstance(request_arguments, dict):
             raise ValidationFailed(request_arguments, message="Must be a dictionary.")
-        return self._model.rollback_to(**request_arguments)
+        with self._writing():
+            nb_rollbacked = self._model.rollback_to(**request_arguments)
+            if self._snapshot:
+                self._snapshot.invalidate()
+        return nb_rollbacked
 
     def get_history(self, request_arguments: dict) -> List[dict]:
         """
@@ -258,13 +828,114 @@ class CRUDController:
             raise ValidationFailed(request_arguments, message="Must be a dictionary.")
         return self._model.get_history(**request_arguments)
 
+    def get_changes(self, request_arguments: dict) -> dict:
+        """
+        Return documents inserted, updated or deleted since a revision (history must be enabled).
+        Provide the returned revision as since_revision to retrieve the next changes.
+
+        :param request_arguments: since_revision (mandatory) and optional filters.
+        :returns A dictionary with inserted, updated and deleted lists of documents and the revision to provide next.
+        """
+        if not self._model:
+            raise ControllerModelNotSet(self)
+        if not self.history:
+            raise Exception("Changes can only be retrieved with history.")
+        if self.revision_block_size != 1:
+            raise Exception(
+                "Changes cannot be retrieved when revisions are reserved by block."
+            )
+        if not isinstance(request_arguments, dict):
+            raise ValidationFailed(request_arguments, message="Must be a dictionary.")
+        return self._model.get_changes(**request_arguments)
+
     def get_field_names(self) -> List[str]:
         """
         Return all model field names formatted as a str list.
         """
         if not self._model:
             raise ControllerModelNotSet(self)
-        return self._model.get_field_names()
+        return self._cached("get_field_names", {}, self._model.get_field_names)
+
+
+# Fields managed by versioning (cannot be provided when updating)
+_REVISION_FIELDS = ("valid_since_revision", "valid_until_revision")
+
+
+def _chunks(dicts: Iterable[dict], chunk_size: int) -> Iterable[tuple]:
+    """
+    Split dictionaries in chunks (without reading more than a chunk at a time).
+
+    :returns Index of the first dictionary of the chunk and the chunk (as a list), per chunk.
+    """
+    if chunk_size < 1:
+        raise Exception("Chunk size must be a strictly positive integer.")
+    if dicts is None or isinstance(dicts, dict):
+        raise ValidationFailed(dicts, message="Must be a list of dictionaries.")
+    dicts = iter(dicts)
+    first_index = 0
+    chunk = list(itertools.islice(dicts, chunk_size))
+    if not chunk:
+        raise ValidationFailed([], message="No data provided.")
+    while chunk:
+        yield first_index, chunk
+        first_index += len(chunk)
+        chunk = list(itertools.islice(dicts, chunk_size))
+
+
+def _shift_indexes(error: Exception, first_index: int, chunk: List[dict]):
+    """
+    Provide validation errors of a chunk per index within all dictionaries (instead of within the chunk).
+    Errors that are not provided per index are provided for the dictionary they relate to
+    (for the first dictionary of the chunk if it cannot be determined).
+    """
+    if not isinstance(error, ValidationFailed):
+        return
+    if all(isinstance(index, int) for index in error.errors):
+        error.errors = {
+            first_index + index: errors for index, errors in error.errors.items()
+        }
+    else:
+        error.errors = {
+            first_index + _index_within(chunk, error.received_data): error.errors
+        }
+
+
+def _index_within(chunk: List[dict], received_data) -> int:
+    """
+    :return: Index of the dictionary (or of the first dictionary containing those values) within the chunk.
+    0 if not found.
+    """
+    for index, row in enumerate(chunk):
+        if row is received_data:
+            return index
+    if isinstance(received_data, dict) and received_data:
+        for index, row in enumerate(chunk):
+            if isinstance(row, dict) and all(
+                field in row and row[field] == value
+                for field, value in received_data.items()
+            ):
+                return index
+    return 0
+
+
+def _normalize(request_arguments: dict) -> str:
+    """
+    Represent a query as a string (identical for equivalent queries).
+    Missing arguments are not considered and the order of filtered values is not relevant (unlike order_by).
+    """
+    return json.dumps(
+        {
+            name: (
+                sorted(value, key=lambda item: json.dumps(item, default=str))
+                if isinstance(value, list) and name != "order_by"
+                else value
+            )
+            for name, value in request_arguments.items()
+            if value is not None
+        },
+        sort_keys=True,
+        default=str,
+    )
 
 
 def load(database_connection_url: str, controllers: Iterable[CRUDController], **kwargs):
@@ -1,23 +1,99 @@
 import copy
 import datetime
+import hashlib
 import inspect
+import itertools
+import json
 import logging
+import os
 import os.path
-from typing import List, Dict, Union, Type, Iterable
+import threading
+import uuid
+from typing import List, Dict, Union, Type, Iterable, Iterator, Optional, Tuple
 
 import pymongo
 import pymongo.errors
 import pymongo.database
 
 from layabase import CRUDController
-from layabase.mongo import Column, DictColumn, IndexType, link
+from layabase.mongo import Column, DictColumn, Index, IndexType, link
 from layabase._exceptions import ValidationFailed
+from layabase._snapshot import SnapshotField
 
 logger = logging.getLogger(__name__)
 
 
 _server_versions: Dict[str, str] = {}
 
+# Collection storing, per collection, the last synchronized indexes and the synchronization lock
+INDEX_SYNCHRONIZATION = "index_synchronization"
+# Maximum duration of an index synchronization (a lock is considered as abandoned after this duration)
+INDEX_SYNCHRONIZATION_TIMEOUT = datetime.timedelta(minutes=30)
+# Maximum number of documents audited (then removed) at once
+REMOVAL_BATCH_SIZE = 1000
+# Index options compared to know if an existing index is the expected one
+_INDEX_OPTIONS = ("unique", "sparse", "partialFilterExpression", "collation")
+# Error code of a write rejected by a unique index
+DUPLICATE_KEY_ERROR = 11000
+# Types of the filter values that can be compared to snapshot values, per field type
+_snapshot_types = {str: (str,), int: (int,), float: (int, float), bool: (bool,)}
+
+
+class _CounterAllocator:
+    """
+    Provide counter values out of blocks reserved at once in the counters collection.
+    Values reserved by a process but not used are lost (values are unique but might not be contiguous).
+    """
+
+    def __init__(self, block_size: int):
+        """
+        :param block_size: Number of values to reserve at once. 1 means that a single value is reserved at a time.
+        """
+        if not isinstance(block_size, int) or block_size < 1:
+            raise Exception("Block size must be a strictly positive integer.")
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        # Next available value (first item) and last reserved value (second item) per counter
+        self._blocks: Dict[tuple, tuple] = {}
+
+    def reserve(
+        self, model, counter_name: str, counter_category: str, nb_values: int = 1
+    ) -> range:
+        """
+        Reserve values for a counter.
+
+        :param model: Model used to increment the counter.
+        :param counter_name: Name of the counter to increment.
+        :param counter_category: Category storing this counter.
+        :param nb_values: Number of values to provide.
+        :return: Range of reserved values (in ascending order).
+        """
+        with self._lock:
+            # Values reserved by the parent process must not be used by a forked process
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._blocks.clear()
+
+            counter = (counter_name, counter_category)
+            next_value, last_value = self._blocks.get(counter, (1, 0))
+            if last_value - next_value + 1 < nb_values:
+                nb_reserved = max(nb_values, self.block_size)
+                last_value = model._increment(
+                    counter_name, counter_category, nb_reserved
+                )
+                next_value = last_value - nb_reserved + 1
+
+            self._blocks[counter] = (next_value + nb_values, last_value)
+            return range(next_value, next_value + nb_values)
+
+    def discard(self, counter_name: str, counter_category: str):
+        """
+        Forget about values reserved for this counter (in case counter was reset for example).
+        """
+        with self._lock:
+            self._blocks.pop((counter_name, counter_category), None)
+
 
 class _CRUDModel:
     """
@@ -31,17 +107,26 @@ class _CRUDModel:
     __collection__: pymongo.collection.Collection = None  # Mongo collection
     __counters__: pymongo.collection.Collection = None  # Mongo counters collection (to increment fields)
     __fields__: List[Column] = []  # All Mongo fields within this model
+    __indexes__: List[Index] = []  # Named indexes (in addition to index_type fields)
     audit_model: Type["_CRUDModel"] = None
     _skip_unknown_fields: bool = True
     _skip_log_for_unknown_fields: List[str] = []
     logger = None
     _server_version: str = ""
+    _counter_allocator: _CounterAllocator = None
+    _checked_sorts: set = set()
+    # layabase.ValidationPool validating huge lists of documents (and key of this model within it)
+    _validation_pool = None
+    _validation_pool_key: int = None
 
     def __init_subclass__(cls, base: pymongo.database.Database = None, **kwargs):
         cls._skip_unknown_fields = kwargs.pop("skip_unknown_fields", True)
         cls._skip_log_for_unknown_fields = kwargs.pop("skip_log_for_unknown_fields", [])
         skip_name_check = kwargs.pop("skip_name_check", False)
         skip_update_indexes = kwargs.pop("skip_update_indexes", False)
+        cls._counter_allocator = _CounterAllocator(kwargs.pop("counter_block_size", 1))
+        cls._checked_sorts = set()
+        cls._validation_pool = kwargs.pop("validation_pool", None)
         super().__init_subclass__(**kwargs)
         cls.logger = logging.getLogger(f"{__name__}.{cls.__collection_name__}")
         cls.__fields__ = [
@@ -49,6 +134,9 @@ class _CRUDModel:
             for field_name, field in inspect.getmembers(cls)
             if isinstance(field, Column)
         ]
+        cls._check_declared_indexes()
+        if cls._validation_pool:
+            cls._validation_pool_key = cls._validation_pool.register(cls)
         # TODO Remove the need for this check, only create models with a base
         if base is not None:  # Allow to not provide base to create fake models
             if not skip_name_check and cls._is_forbidden():
@@ -68,112 +156,91 @@ class _CRUDModel:
     @classmethod
     def _is_forbidden(cls):
         # Counters collection is managed by layabase
+        # Index synchronization collection is managed by layabase
         # Audit collections are managed by layabase
         return (
             not cls.__collection_name__
             or "counters" == cls.__collection_name__
+            or INDEX_SYNCHRONIZATION == cls.__collection_name__
             or cls.__collection_name__.startswith("audit")
         )
 
     @classmethod
-    def update_indexes(cls, document: dict = None):
+    def _get_generated_index_names(cls) -> List[str]:
         """
-        Drop all indexes and recreate them.
-        As advised in https://docs.mongodb.com/manual/tutorial/manage-indexes/#modify-an-index
+        Name of the indexes generated by layabase (cannot be used by declared indexes).
         """
-        if cls._check_indexes(document):
-            cls.logger.info("Updating indexes...")
-            cls.__collection__.drop_indexes()
-            cls._create_indexes(IndexType.Unique, document)
-            cls._create_indexes(IndexType.Other, document)
-            cls.logger.info("Indexes updated.")
-            if cls.audit_model:
-                cls.audit_model.update_indexes(document)
+        return [f"uidx{cls.__collection_name__}", f"idx{cls.__collection_name__}"]
 
     @classmethod
-    def _check_indexes(cls, document: dict) -> bool:
+    def _check_declared_indexes(cls):
+        index_names = set(cls._get_generated_index_names())
+        for index in cls.__indexes__:
+            if index.name in index_names:
+                raise Exception(
+                    f"{index.name} index is already defined on {cls.__collection_name__}."
+                )
+            index_names.add(index.name)
+            index.check_fields(cls.__fields__)
+
+    @classmethod
+    def update_indexes(cls, document: dict = None):
         """
-        Check if indexes are present and if criteria have been modified
+        Create missing indexes and drop the ones that are not expected anymore.
+        Indexes are created before dropping the ones they replace (unless they conflict).
+        Only one process at a time can update the indexes of a collection.
+        Synchronization is skipped if expected indexes did not change since the last successful synchronization.
+
         :param document: Data specified by the user at the time of the index creation.
         """
-        criteria = [
-            field_name
-            for field_name in cls._get_index_fields(IndexType.Other, document, "")
-        ]
-        unique_criteria = [
-            field_name
-            for field_name in cls._get_index_fields(IndexType.Unique, document, "")
-        ]
-        index_name = f"idx{cls.__collection_name__}"
-        unique_index_name = f"uidx{cls.__collection_name__}"
-        indexes = cls.__collection__.list_indexes()
-        cls.logger.debug(f"Checking existing indexes: {indexes}")
-        indexes = {
-            index["name"]: index["key"].keys()
-            for index in indexes
-            if "name" in index and "key" in index
-        }
-        return (
-            (criteria and index_name not in indexes)
-            or (not criteria and index_name in indexes)
-            or (criteria and index_name in indexes and criteria != indexes[index_name])
-            or (unique_criteria and unique_index_name not in indexes)
-            or (not unique_criteria and unique_index_name in indexes)
-            or (
-                unique_criteria
-                and unique_index_name in indexes
-                and unique_criteria != indexes[unique_index_name]
-            )
+        _synchronize_indexes(
+            cls.__collection__, cls._get_expected_indexes(document), cls.logger
         )
+        if cls.audit_model:
+            cls.audit_model.update_indexes(document)
 
     @classmethod
-    def _create_indexes(cls, index_type: IndexType, document: dict, condition=None):
+    def _get_expected_indexes(cls, document: dict) -> Dict[str, dict]:
         """
-        Create indexes of specified type.
+        Indexes that should exist on the collection.
+
         :param document: Data specified by the user at the time of the index creation.
+        :return: Index description (key and options) per index name.
         """
-        try:
+        condition = cls._get_index_condition()
+        indexes = {}
+        for index_type, index_name in (
+            (IndexType.Unique, f"uidx{cls.__collection_name__}"),
+            # Avoid using auto generated index name that might be too long
+            (IndexType.Other, f"idx{cls.__collection_name__}"),
+        ):
             criteria = [
                 (field_name, pymongo.ASCENDING)
                 for field_name in cls._get_index_fields(index_type, document, "")
             ]
             if criteria:
-                # Avoid using auto generated index name that might be too long
-                index_name = (
-                    f"uidx{cls.__collection_name__}"
-                    if index_type == IndexType.Unique
-                    else f"idx{cls.__collection_name__}"
-                )
-                cls.logger.info(
-                    f"Create {index_name} {index_type.name} index on {cls.__collection_name__} using {criteria} criteria."
-                )
-                if condition is None or cls._server_version < "3.2":
-                    cls.__collection__.create_index(
-                        criteria, unique=index_type == IndexType.Unique, name=index_name
-                    )
-                else:
-                    try:
-                        cls.__collection__.create_index(
-                            criteria,
-                            unique=index_type == IndexType.Unique,
-                            name=index_name,
-                            partialFilterExpression=condition,
-                        )
-                    except pymongo.errors.OperationFailure:
-                        cls.logger.exception(
-                            f"Unable to create a {index_type.name} index."
-                        )
-                        cls.__collection__.create_index(
-                            criteria,
-                            unique=index_type == IndexType.Unique,
-                            name=index_name,
-                        )
-        except pymongo.errors.DuplicateKeyError:
-            cls.logger.exception(
-                f"Duplicate key found for {criteria} criteria "
-                f"when creating a {index_type.name} index."
-            )
-            raise
+                index = {"key": criteria}
+                if index_type == IndexType.Unique:
+                    index["unique"] = True
+                if condition:
+                    index["partialFilterExpression"] = condition
+                indexes[index_name] = index
+        for declared_index in cls.__indexes__:
+            index = declared_index.description()
+            if condition:
+                index["partialFilterExpression"] = {
+                    **index.get("partialFilterExpression", {}),
+                    **condition,
+                }
+            indexes[declared_index.name] = index
+        return indexes
+
+    @classmethod
+    def _get_index_condition(cls) -> Optional[dict]:
+        """
+        Partial filter expression applied to every index of this collection (if any).
+        """
+        return None
 
     @classmethod
     def _get_index_fields(
@@ -231,31 +298,175 @@ class _CRUDModel:
         """
         Return all documents matching provided filters.
         """
-        limit = filters.pop("limit", 0) or 0
-        offset = filters.pop("offset", 0) or 0
-        errors = cls.validate_query(filters)
-        if errors:
-            raise ValidationFailed(filters, errors)
-
-        cls.deserialize_query(filters)
+        offset, limit, sort = cls._to_find_arguments(filters)
 
         if cls.logger.isEnabledFor(logging.DEBUG):
             if filters:
                 cls.logger.debug(f"Query documents matching {filters}...")
             else:
                 cls.logger.debug(f"Query all documents...")
-        documents = cls.__collection__.find(filters, skip=offset, limit=limit)
+        documents = cls._find(filters, offset, limit, sort)
         if cls.logger.isEnabledFor(logging.DEBUG):
-            nb_documents = (
-                cls.__collection__.count_documents(filters, skip=offset, limit=limit)
-                if limit
-                else cls.__collection__.count_documents(filters, skip=offset)
-            )
             cls.logger.debug(
-                f'{nb_documents if nb_documents else "No corresponding"} documents retrieved.'
+                f'{len(documents) if documents else "No corresponding"} documents retrieved.'
             )
         return [cls.serialize(document) for document in documents]
 
+    @classmethod
+    def iter_all(cls, batch_size: int, **filters) -> Iterator[List[dict]]:
+        """
+        Return all documents matching provided filters, batch by batch.
+        Documents are fetched batch_size at a time from the server (cursor batch size).
+
+        :param batch_size: Maximum number of documents fetched and serialized at once.
+        """
+        offset, limit, sort = cls._to_find_arguments(filters)
+        if cls.logger.isEnabledFor(logging.DEBUG):
+            cls.logger.debug(f"Iterate over documents matching {filters}...")
+        cursor = cls.__collection__.find(
+            filters, skip=offset, limit=limit, sort=sort or None, batch_size=batch_size
+        )
+        return cls._iter_batches(cursor, batch_size)
+
+    @classmethod
+    def _iter_batches(cls, cursor, batch_size: int) -> Iterator[List[dict]]:
+        try:
+            while True:
+                batch = list(itertools.islice(cursor, batch_size))
+                if not batch:
+                    break
+                yield [cls.serialize(document) for document in batch]
+        finally:
+            cursor.close()
+
+    @classmethod
+    def iter_columns(cls, batch_size: int, **filters) -> Iterator[Dict[str, list]]:
+        """
+        Return field values (as stored in Mongo) of all documents matching provided filters, batch by batch.
+        Documents are fetched batch_size at a time from the server (cursor batch size) and are not serialized.
+        Missing values are provided as default values.
+
+        :param batch_size: Maximum number of documents fetched at once.
+        """
+        offset, limit, sort = cls._to_find_arguments(filters)
+        projection = {field.name: True for field in cls.__fields__}
+        projection.setdefault("_id", False)
+        cursor = cls.__collection__.find(
+            filters,
+            projection=projection,
+            skip=offset,
+            limit=limit,
+            sort=sort or None,
+            batch_size=batch_size,
+        )
+        return cls._iter_column_batches(cursor, batch_size)
+
+    @classmethod
+    def _iter_column_batches(cls, cursor, batch_size: int) -> Iterator[Dict[str, list]]:
+        try:
+            while True:
+                batch = list(itertools.islice(cursor, batch_size))
+                if not batch:
+                    break
+                yield {
+                    field.name: [_get_value(document, field) for document in batch]
+                    for field in cls.__fields__
+                }
+        finally:
+            cursor.close()
+
+    @classmethod
+    def _to_find_arguments(cls, filters: dict) -> (int, int, List[Tuple[str, int]]):
+        """
+        Validate and deserialize filters (in place).
+
+        :return: A tuple with the number of skipped documents, the maximum number of documents (0 means no limit)
+        and the Mongo sort specification.
+        """
+        limit = filters.pop("limit", 0) or 0
+        offset = filters.pop("offset", 0) or 0
+        errors = cls.validate_query(filters)
+        sort, order_by_errors = cls._to_sort(filters.get("order_by") or [])
+        if order_by_errors:
+            errors["order_by"] = order_by_errors
+        if errors:
+            raise ValidationFailed(filters, errors)
+
+        filters.pop("order_by", None)
+        cls.deserialize_query(filters)
+        return offset, limit, sort
+
+    @classmethod
+    def _find(
+        cls, filters: dict, offset: int, limit: int, sort: List[Tuple[str, int]]
+    ) -> List[dict]:
+        """
+        Query documents matching deserialized filters.
+
+        :param limit: Maximum number of documents. 0 means no limit.
+        :param sort: Mongo sort specification. Empty means natural order.
+        """
+        return list(
+            cls.__collection__.find(
+                filters, skip=offset, limit=limit, sort=sort or None
+            )
+        )
+
+    @classmethod
+    def _to_sort(
+        cls, order_by: Union[str, List[str]]
+    ) -> (List[Tuple[str, int]], List[str]):
+        """
+        Convert order_by to a Mongo sort specification.
+
+        :param order_by: Field names (dot notation can be used for dictionary fields).
+        Prefix a field name by - for a descending order (+ or no prefix for an ascending order).
+        :return: A tuple with the sort specification and the errors that might have occurred.
+        """
+        fields = {field.name: field for field in cls.__fields__}
+        sort = []
+        errors = []
+        for field_name in [order_by] if isinstance(order_by, str) else order_by:
+            direction = pymongo.ASCENDING
+            if field_name[:1] in ("-", "+"):
+                if field_name[0] == "-":
+                    direction = pymongo.DESCENDING
+                field_name = field_name[1:]
+            field = fields.get(field_name.split(".", maxsplit=1)[0])
+            is_sub_field = "." in field_name
+            if not field or (is_sub_field and field.field_type not in (dict, list)):
+                errors.append(f"Unknown field {field_name}.")
+            sort.append((field_name, direction))
+
+        if sort and not errors:
+            cls._check_sort_index(sort)
+        return sort, errors
+
+    @classmethod
+    def _check_sort_index(cls, sort: List[Tuple[str, int]]):
+        """
+        Warn (once per sort specification) if no index can be used to sort.
+        """
+        sort = tuple(sort)
+        if sort in cls._checked_sorts:
+            return
+        cls._checked_sorts.add(sort)
+
+        reversed_sort = tuple(
+            (field_name, -direction) for field_name, direction in sort
+        )
+        index_keys = [[("_id", pymongo.ASCENDING)]] + [
+            index["key"] for index in cls._get_expected_indexes(None).values()
+        ]
+        if not any(
+            tuple(index_key[: len(sort)]) in (sort, reversed_sort)
+            for index_key in index_keys
+        ):
+            cls.logger.warning(
+                f"No index can be used to sort by {list(sort)}. "
+                "Sorting will be performed in memory (consider declaring an index)."
+            )
+
     @classmethod
     def get_history(cls, **filters) -> List[dict]:
         """
@@ -275,6 +486,49 @@ class _CRUDModel:
     def get_field_names(cls) -> List[str]:
         return [field.name for field in cls.__fields__]
 
+    @classmethod
+    def _get_field_types(cls) -> Dict[str, type]:
+        return {field.name: field.field_type for field in cls.__fields__}
+
+    @classmethod
+    def _get_snapshot_fields(cls) -> Dict[str, SnapshotField]:
+        """
+        Fields that can be queried on a snapshot.
+        Filters on fields with None as a valid filter are always performed on the database.
+        Values missing in documents are considered as the default value (as they are serialized).
+        """
+        declared_index_fields = {
+            field_name for index in cls.__indexes__ for field_name, _ in index.fields
+        }
+        return {
+            field.name: SnapshotField(
+                types=_snapshot_types.get(field.field_type, ()),
+                # Documents without value do not match comparisons
+                allow_comparison_signs=field.allow_comparison_signs
+                and field.default_value is None,
+                indexed=field.index_type is not None
+                or field.name in declared_index_fields,
+            )
+            for field in cls.__fields__
+            if not field.allow_none_as_filter
+        }
+
+    @classmethod
+    def _to_snapshot_sort(
+        cls, order_by: Union[str, List[str]]
+    ) -> Optional[List[Tuple[str, bool]]]:
+        sort, errors = cls._to_sort(order_by)
+        if errors:
+            return None
+        return [
+            (field_name, direction == pymongo.DESCENDING)
+            for field_name, direction in sort
+        ]
+
+    @classmethod
+    def _is_valid_query(cls, filters: dict) -> bool:
+        return not cls.validate_query(filters)
+
     @classmethod
     def validate_query(cls, filters: dict) -> dict:
         """
@@ -445,8 +699,70 @@ class _CRUDModel:
         except pymongo.errors.BulkWriteError as e:
             raise ValidationFailed(documents, message=str(e.details))
 
+    @classmethod
+    def add_each(cls, documents: List[dict]) -> list:
+        """
+        Add documents at once, each document being inserted (or rejected) independently of the others.
+
+        :returns For each document (in order), the inserted document formatted as a dictionary
+        or the ValidationFailed exception explaining why it was not inserted.
+        """
+        results = [None] * len(documents)
+        deserialized_documents = copy.deepcopy(documents)
+        errors = cls.validate_and_deserialize_each_insert(deserialized_documents)
+        new_documents = {}
+        for index, document in enumerate(deserialized_documents):
+            if index in errors:
+                results[index] = ValidationFailed(documents[index], errors[index])
+            else:
+                new_documents[index] = document
+
+        if not new_documents:
+            return results
+
+        # Reserve all auto incremented values at once
+        cls._set_auto_incremented_values(list(new_documents.values()))
+        if cls.logger.isEnabledFor(logging.DEBUG):
+            cls.logger.debug(f"Inserting {list(new_documents.values())}...")
+        write_errors = cls._insert_many(list(new_documents.values()), ordered=False)
+        if cls.logger.isEnabledFor(logging.DEBUG):
+            cls.logger.debug(
+                f"{len(new_documents) - len(write_errors)} documents inserted."
+            )
+        for position, (index, new_document) in enumerate(new_documents.items()):
+            write_error = write_errors.get(position)
+            if not write_error:
+                results[index] = cls.serialize(new_document)
+            elif write_error.get("code") == DUPLICATE_KEY_ERROR:
+                results[index] = ValidationFailed(
+                    cls.serialize(new_document), message="This document already exists."
+                )
+            else:
+                results[index] = ValidationFailed(
+                    cls.serialize(new_document), message=write_error.get("errmsg")
+                )
+        return results
+
     @classmethod
     def validate_and_deserialize_insert(cls, documents: List[dict]) -> dict:
+        if cls._validation_pool and len(documents) >= cls._validation_pool.threshold:
+            errors = cls._validation_pool.validate_and_deserialize(
+                cls._validation_pool_key, "insert", documents
+            )
+        else:
+            errors = cls._validate_and_deserialize_inserts(documents)
+
+        if not errors:
+            # Reserve all auto incremented values at once
+            cls._set_auto_incremented_values(documents)
+
+        return errors
+
+    @classmethod
+    def _validate_and_deserialize_inserts(cls, documents: List[dict]) -> dict:
+        """
+        Same as validate_and_deserialize_insert without providing auto incremented values.
+        """
         errors = {}
 
         for index, document in enumerate(documents):
@@ -458,7 +774,32 @@ class _CRUDModel:
             if (
                 not errors
             ):  # Skip deserialization in case errors were found as it will stop
-                cls.deserialize_insert(document)
+                cls._deserialize_insert_values(document)
+
+        return errors
+
+    @classmethod
+    def validate_and_deserialize_each_insert(cls, documents: List[dict]) -> dict:
+        """
+        Same as validate_and_deserialize_insert, but valid documents are deserialized even if some others are not
+        valid (and auto incremented values are not provided).
+        """
+        if cls._validation_pool and len(documents) >= cls._validation_pool.threshold:
+            return cls._validation_pool.validate_and_deserialize(
+                cls._validation_pool_key, "insert_each", documents
+            )
+        return cls._validate_and_deserialize_each_insert(documents)
+
+    @classmethod
+    def _validate_and_deserialize_each_insert(cls, documents: List[dict]) -> dict:
+        errors = {}
+
+        for index, document in enumerate(documents):
+            document_errors = cls.validate_insert(document)
+            if document_errors:
+                errors[index] = document_errors
+            else:
+                cls._deserialize_insert_values(document)
 
         return errors
 
@@ -530,27 +871,86 @@ class _CRUDModel:
         :param document: Document that should be inserted.
         Each entry if composed of a field name associated to a value.
         """
+        cls._deserialize_insert_values(document)
+        cls._set_auto_incremented_values([document])
+
+    @classmethod
+    def _deserialize_insert_values(cls, document: dict):
+        """
+        Same as deserialize_insert without providing auto incremented values.
+        """
         cls._remove_dot_notation(document)
 
         for field in cls.__fields__:
             field.deserialize_insert(document)
-            if field.should_auto_increment:
-                document[field.name] = cls._increment(*field.get_counter(document))
 
     @classmethod
-    def _increment(cls, counter_name: str, counter_category: str = None) -> int:
+    def _set_auto_incremented_values(
+        cls, documents: List[dict], provided_field_names: List[List[str]] = None
+    ):
+        """
+        Set auto incremented fields values, reserving all values of a counter at once.
+
+        :param documents: Documents that should be inserted (in insertion order).
+        :param provided_field_names: Names of the fields provided by each document (values of those fields are kept).
+        Values are set for every document by default.
+        """
+        if provided_field_names is None:
+            provided_field_names = [[]] * len(documents)
+
+        for field in cls.__fields__:
+            if not field.should_auto_increment:
+                continue
+
+            documents_per_counter = {}
+            for document, field_names in zip(documents, provided_field_names):
+                if field.name in field_names:
+                    continue
+                documents_per_counter.setdefault(
+                    tuple(field.get_counter(document)), []
+                ).append(document)
+
+            for counter, counter_documents in documents_per_counter.items():
+                values = cls._reserve(*counter, nb_values=len(counter_documents))
+                for document, value in zip(counter_documents, values):
+                    document[field.name] = value
+
+    @classmethod
+    def _reserve(
+        cls, counter_name: str, counter_category: str = None, nb_values: int = 1
+    ) -> range:
         """
-        Increment a counter by one.
+        Reserve values of a counter (thanks to values reserved by this process if any).
 
         :param counter_name: Name of the counter to increment. Will be created at 0 if not existing yet.
         :param counter_category: Category storing those counters. Default to model table name.
-        :return: New counter value.
+        :param nb_values: Number of values to reserve.
+        :return: Reserved values (in ascending order).
+        """
+        return cls._counter_allocator.reserve(
+            cls,
+            counter_name,
+            counter_category if counter_category else cls.__collection__.name,
+            nb_values,
+        )
+
+    @classmethod
+    def _increment(
+        cls, counter_name: str, counter_category: str = None, nb_values: int = 1
+    ) -> int:
+        """
+        Increment a counter.
+
+        :param counter_name: Name of the counter to increment. Will be created at 0 if not existing yet.
+        :param counter_category: Category storing those counters. Default to model table name.
+        :param nb_values: Number of values to reserve at once. Default to 1.
+        :return: New counter value (last reserved value).
         """
         counter_key = {
             "_id": counter_category if counter_category else cls.__collection__.name
         }
         counter_update = {
-            "$inc": {f"{counter_name}.counter": 1},
+            "$inc": {f"{counter_name}.counter": nb_values},
             "$set": {f"{counter_name}.last_update_time": datetime.datetime.utcnow()},
         }
         counter_element = cls.__counters__.find_one_and_update(
@@ -573,13 +973,20 @@ class _CRUDModel:
         counter_key = {
             "_id": counter_category if counter_category else cls.__collection__.name
         }
-        counter_element = cls.__counters__.find_one(counter_key)
-        return counter_element[counter_name]["counter"] if counter_element else 0
+        counter_element = cls.__counters__.find_one(
+            counter_key, projection={f"{counter_name}.counter": True}
+        )
+        return (
+            counter_element[counter_name]["counter"]
+            if counter_element and counter_name in counter_element
+            else 0
+        )
 
     @classmethod
     def reset_counters(cls):
         """
         reset the class related counters
+        Note that values already reserved by other processes are not discarded.
 
         """
         for field in cls.__fields__:
@@ -587,13 +994,17 @@ class _CRUDModel:
                 cls._reset_counter(*field.get_counter({}))
 
     @classmethod
-    def _reset_counter(cls, counter_name: str):
+    def _reset_counter(cls, counter_name: str, counter_category: str = None):
         """
         Reset a counter.
 
         :param counter_name: Name of the counter to reset. Will be created at 0 if not existing yet.
+        :param counter_category: Category storing those counters. Default to model table name.
         """
-        counter_key = {"_id": cls.__collection__.name}
+        counter_category = (
+            counter_category if counter_category else cls.__collection__.name
+        )
+        counter_key = {"_id": counter_category}
         counter_update = {
             "$set": {
                 f"{counter_name}.counter": 0,
@@ -601,6 +1012,7 @@ class _CRUDModel:
             }
         }
         cls.__counters__.find_one_and_update(counter_key, counter_update, upsert=True)
+        cls._counter_allocator.discard(counter_name, counter_category)
         return
 
     @classmethod
@@ -665,8 +1077,54 @@ class _CRUDModel:
                 message="One document already exists.",
             )
 
+    @classmethod
+    def replace_all(cls, documents: List[dict]) -> (List[dict], List[dict]):
+        """
+        Replace documents formatted as a list of dictionary.
+        Unlike update_all, documents are fully provided: fields that are not provided are removed.
+
+        :raises ValidationFailed in case validation fail.
+        :returns A tuple containing previous documents (first item) and new documents (second item).
+        """
+        if not documents:
+            raise ValidationFailed([], message="No data provided.")
+
+        if not isinstance(documents, list):
+            raise ValidationFailed(documents, message="Must be a list.")
+
+        # Missing fields are provided as None by serialization, they are not stored
+        new_documents = [
+            _without_none(document) if isinstance(document, dict) else document
+            for document in documents
+        ]
+
+        # Documents are fully provided (as on insert) but auto incremented values must be kept
+        errors = cls._validate_and_deserialize_inserts(new_documents)
+        if errors:
+            raise ValidationFailed(documents, errors)
+
+        if cls.logger.isEnabledFor(logging.DEBUG):
+            cls.logger.debug(f"Replacing {new_documents}...")
+        previous_documents, replaced_documents = cls._update_many(
+            new_documents, replace=True
+        )
+        if cls.logger.isEnabledFor(logging.DEBUG):
+            cls.logger.debug(f"Documents replaced by {replaced_documents}.")
+        return (
+            [cls.serialize(document) for document in previous_documents],
+            [cls.serialize(document) for document in replaced_documents],
+        )
+
     @classmethod
     def validate_and_deserialize_update(cls, documents: List[dict]) -> dict:
+        if cls._validation_pool and len(documents) >= cls._validation_pool.threshold:
+            return cls._validation_pool.validate_and_deserialize(
+                cls._validation_pool_key, "update", documents
+            )
+        return cls._validate_and_deserialize_updates(documents)
+
+    @classmethod
+    def _validate_and_deserialize_updates(cls, documents: List[dict]) -> dict:
         errors = {}
 
         for index, document in enumerate(documents):
@@ -778,6 +1236,148 @@ class _CRUDModel:
         for field in updated_fields:
             field.deserialize_update(document)
 
+    @classmethod
+    def upsert(cls, document: dict) -> (bool, dict):
+        """
+        Insert a document formatted as a dictionary, or update it if it already exists (same primary key).
+        Only provided fields are updated (auto incremented values are only provided on insertion).
+
+        :raises ValidationFailed in case validation fail.
+        :returns A tuple containing True if document was inserted, False if it was updated (first item)
+        and new document (second item).
+        """
+        errors = cls.validate_upsert(document)
+        if errors:
+            raise ValidationFailed(document, errors)
+
+        keys, update = cls._deserialize_upserts([document])[0]
+        try:
+            if cls.logger.isEnabledFor(logging.DEBUG):
+                cls.logger.debug(f"Upserting {document}...")
+            inserted, new_document = cls._upsert_one(keys, update)
+            if cls.logger.isEnabledFor(logging.DEBUG):
+                cls.logger.debug(
+                    f"Document {'inserted' if inserted else 'updated'} to {new_document}."
+                )
+            return inserted, cls.serialize(new_document)
+        except pymongo.errors.DuplicateKeyError:
+            raise ValidationFailed(
+                cls.serialize(document), message="This document already exists."
+            )
+
+    @classmethod
+    def upsert_all(cls, documents: List[dict]) -> (List[bool], List[dict]):
+        """
+        Insert documents formatted as a list of dictionaries, or update them if they already exist (same primary key).
+        Only provided fields are updated (auto incremented values are only provided on insertion).
+
+        :raises ValidationFailed in case validation fail.
+        :returns A tuple containing, per document, True if it was inserted, False if it was updated (first item)
+        and new documents (second item).
+        """
+        if not documents:
+            raise ValidationFailed([], message="No data provided.")
+
+        if not isinstance(documents, list):
+            raise ValidationFailed(documents, message="Must be a list of dictionaries.")
+
+        errors = {}
+        for index, document in enumerate(documents):
+            document_errors = cls.validate_upsert(document)
+            if document_errors:
+                errors[index] = document_errors
+        if errors:
+            raise ValidationFailed(documents, errors)
+
+        upserts = cls._deserialize_upserts(copy.deepcopy(documents))
+        try:
+            if cls.logger.isEnabledFor(logging.DEBUG):
+                cls.logger.debug(f"Upserting {upserts}...")
+            inserted, new_documents = cls._upsert_many(upserts)
+            if cls.logger.isEnabledFor(logging.DEBUG):
+                cls.logger.debug(
+                    f"{sum(inserted)} documents inserted and {len(inserted) - sum(inserted)} updated."
+                )
+            return inserted, [cls.serialize(document) for document in new_documents]
+        except pymongo.errors.DuplicateKeyError:
+            raise ValidationFailed(
+                [cls.serialize(document) for document in documents],
+                message="One document already exists.",
+            )
+
+    @classmethod
+    def validate_upsert(cls, document: dict) -> dict:
+        """
+        Validate a document upsert request (document must be valid for insertion, including its primary key).
+
+        :return: Validation errors that might have occurred. Empty if no error occurred.
+        Entry would be composed of a field name associated to a list of error messages.
+        """
+        if not cls.get_primary_keys():
+            return {"": ["Primary key is required to upsert."]}
+
+        errors = cls.validate_insert(document)
+        if not errors:
+            for field in cls.__fields__:
+                if field.is_primary_key and document.get(field.name) is None:
+                    errors[field.name] = ["Missing data for required field."]
+        return errors
+
+    @classmethod
+    def _deserialize_upserts(cls, documents: List[dict]) -> List[Tuple[dict, dict]]:
+        """
+        Convert (valid) documents to upsert requests.
+
+        :return: Filter (primary keys) and update (as in find_one_and_update), per document.
+        """
+        provided_field_names = []
+        for document in documents:
+            cls._remove_dot_notation(document)
+            provided_field_names.append(list(document))
+            for field in cls.__fields__:
+                field.deserialize_insert(document)
+        keys_per_document = [
+            cls._to_primary_keys_model(document) for document in documents
+        ]
+        # Auto incremented values are only reserved for documents that do not exist yet (provided values are kept,
+        # so that a provided auto incremented primary key is used to match the existing document)
+        if any(
+            field.should_auto_increment and field.name not in field_names
+            for field in cls.__fields__
+            for field_names in provided_field_names
+        ):
+            existing = cls._existing_primary_key_values(keys_per_document)
+            new_documents = [
+                (document, field_names)
+                for document, field_names in zip(documents, provided_field_names)
+                if cls._to_primary_key_values(document) not in existing
+            ]
+            cls._set_auto_incremented_values(
+                [document for document, _ in new_documents],
+                [field_names for _, field_names in new_documents],
+            )
+
+        upserts = []
+        for document, field_names, keys in zip(
+            documents, provided_field_names, keys_per_document
+        ):
+            update = {"$set": {**keys}}
+            for field in cls.__fields__:
+                if field.is_primary_key:
+                    continue
+                if field.should_auto_increment and field.name not in field_names:
+                    if field.name in document:
+                        update.setdefault("$setOnInsert", {})[field.name] = document[
+                            field.name
+                        ]
+                elif field.name in document:
+                    update["$set"][field.name] = document[field.name]
+                elif field.name in field_names:
+                    # None values are not stored
+                    update.setdefault("$unset", {})[field.name] = ""
+            upserts.append((keys, update))
+        return upserts
+
     @classmethod
     def remove(cls, **filters) -> int:
         """
@@ -803,6 +1403,26 @@ class _CRUDModel:
             cls.logger.debug(f"{nb_removed} documents removed.")
         return nb_removed
 
+    @classmethod
+    def remove_chunk(cls, chunk_size: int, **filters) -> int:
+        """
+        Remove up to chunk_size documents matching those criteria (selected by identifier).
+
+        :param filters: Provided filters.
+        Each entry if composed of a field name associated to a value.
+        :returns Number of removed documents.
+        """
+        errors = cls.validate_remove(filters)
+        if errors:
+            raise ValidationFailed(filters, errors)
+
+        cls.deserialize_query(filters)
+
+        nb_removed = cls._delete_chunk(filters, chunk_size)
+        if cls.logger.isEnabledFor(logging.DEBUG):
+            cls.logger.debug(f"{nb_removed} documents removed.")
+        return nb_removed
+
     @classmethod
     def validate_remove(cls, filters: dict) -> dict:
         """
@@ -816,11 +1436,19 @@ class _CRUDModel:
         return cls.validate_query(filters)
 
     @classmethod
-    def _insert_many(cls, documents: List[dict]):
-        cls.__collection__.insert_many(documents)
+    def _insert_many(
+        cls, documents: List[dict], ordered: bool = True
+    ) -> Dict[int, dict]:
+        """
+        :param ordered: False to keep inserting documents after a failure.
+        :return: Write error per document index (if not ordered, an exception is raised otherwise).
+        """
+        write_errors = _insert_many(cls.__collection__, documents, ordered)
         if cls.audit_model:
-            for document in documents:
-                cls.audit_model.audit_add(document)
+            for index, document in enumerate(documents):
+                if index not in write_errors:
+                    cls.audit_model.audit_add(document)
+        return write_errors
 
     @classmethod
     def _insert_one(cls, document: dict) -> dict:
@@ -846,7 +1474,9 @@ class _CRUDModel:
         return previous_document, new_document
 
     @classmethod
-    def _update_many(cls, documents: List[dict]) -> (List[dict], List[dict]):
+    def _update_many(
+        cls, documents: List[dict], replace: bool = False
+    ) -> (List[dict], List[dict]):
         previous_documents = []
         new_documents = []
         for document in documents:
@@ -857,7 +1487,7 @@ class _CRUDModel:
 
             new_document = cls.__collection__.find_one_and_update(
                 document_keys,
-                {"$set": document},
+                _to_update(previous_document, document, replace),
                 return_document=pymongo.ReturnDocument.AFTER,
             )
             previous_documents.append(previous_document)
@@ -866,13 +1496,140 @@ class _CRUDModel:
                 cls.audit_model.audit_update(new_document)
         return previous_documents, new_documents
 
+    @classmethod
+    def _upsert_one(cls, keys: dict, update: dict) -> (bool, dict):
+        previous_document = cls._find_one_and_upsert(keys, update)
+        inserted = previous_document is None
+        new_document = _upserted(previous_document, keys, update)
+        if cls.audit_model:
+            if inserted:
+                cls.audit_model.audit_add(new_document)
+            else:
+                cls.audit_model.audit_update(new_document)
+        return inserted, new_document
+
+    @classmethod
+    def _upsert_many(cls, upserts: List[Tuple[dict, dict]]) -> (List[bool], List[dict]):
+        inserted = []
+        new_documents = []
+        # Every document is upserted (and returned as upserted) atomically
+        for keys, update in upserts:
+            document_inserted, new_document = cls._upsert_one(keys, update)
+            inserted.append(document_inserted)
+            new_documents.append(new_document)
+        return inserted, new_documents
+
+    @classmethod
+    def _existing_primary_key_values(cls, keys_per_document: List[dict]) -> set:
+        """
+        :return: Primary key values (as returned by _to_primary_key_values) of the existing documents.
+        """
+        return {
+            cls._to_primary_key_values(document)
+            for document in cls.__collection__.find(
+                {"$or": keys_per_document},
+                projection={
+                    "_id": False,
+                    **dict.fromkeys(cls.get_primary_keys(), True),
+                },
+            )
+        }
+
+    @classmethod
+    def _find_one_and_upsert(cls, keys: dict, update: dict) -> Optional[dict]:
+        """
+        Upsert a document (retrying once if a concurrent upsert inserted it meanwhile).
+        Auto incremented values are set if an inserted document was considered as existing
+        (removed since existing documents were checked).
+
+        :return: Previous document, None if document was inserted.
+        """
+
+        def find_one_and_upsert() -> Optional[dict]:
+            return cls.__collection__.find_one_and_update(
+                keys,
+                update,
+                upsert=True,
+                projection={"_id": False},
+                return_document=pymongo.ReturnDocument.BEFORE,
+            )
+
+        try:
+            previous_document = find_one_and_upsert()
+        except pymongo.errors.DuplicateKeyError:
+            # Document was inserted by a concurrent upsert, it can now be updated
+            previous_document = find_one_and_upsert()
+        if previous_document is None:
+            new_document = _upserted(None, keys, update)
+            missing_values = [
+                field.name
+                for field in cls.__fields__
+                if field.should_auto_increment and field.name not in new_document
+            ]
+            if missing_values:
+                cls._set_auto_incremented_values([new_document], [list(new_document)])
+                values = {name: new_document[name] for name in missing_values}
+                cls.__collection__.update_one(keys, {"$set": values})
+                update.setdefault("$setOnInsert", {}).update(values)
+        return previous_document
+
+    @classmethod
+    def _to_primary_key_values(cls, document: dict) -> tuple:
+        return tuple(
+            json.dumps(document.get(field_name), default=str)
+            for field_name in cls.get_primary_keys()
+        )
+
     @classmethod
     def _delete_many(cls, filters: dict) -> int:
         if cls.audit_model:
-            cls.audit_model.audit_remove(**filters)
+            nb_removed = cls._audit_and_delete_many(filters)
+        else:
+            nb_removed = cls.__collection__.delete_many(filters).deleted_count
         if filters == {}:
             cls.reset_counters()
-        return cls.__collection__.delete_many(filters).deleted_count
+        return nb_removed
+
+    @classmethod
+    def _delete_chunk(cls, filters: dict, chunk_size: int) -> int:
+        documents = list(
+            cls.__collection__.find(
+                filters,
+                projection=None if cls.audit_model else {"_id": True},
+                limit=chunk_size,
+            )
+        )
+        nb_removed = 0
+        if documents:
+            if cls.audit_model:
+                cls.audit_model.audit_remove(documents)
+            nb_removed = cls.__collection__.delete_many(
+                {"_id": {"$in": [document["_id"] for document in documents]}}
+            ).deleted_count
+        # Counters can only be reset once the last chunk was removed
+        if (
+            len(documents) < chunk_size
+            and filters == {}
+            and cls.__collection__.find_one({}, projection={"_id": True}) is None
+        ):
+            cls.reset_counters()
+        return nb_removed
+
+    @classmethod
+    def _audit_and_delete_many(cls, filters: dict) -> int:
+        """
+        Audit then remove matching documents, by batch.
+        Only documents that were audited are removed (even if other documents start matching filters meanwhile).
+        """
+        nb_removed = 0
+        while True:
+            documents = list(cls.__collection__.find(filters, limit=REMOVAL_BATCH_SIZE))
+            if not documents:
+                return nb_removed
+            cls.audit_model.audit_remove(documents)
+            nb_removed += cls.__collection__.delete_many(
+                {"_id": {"$in": [document["_id"] for document in documents]}}
+            ).deleted_count
 
     @classmethod
     def _to_primary_keys_model(cls, document: dict) -> dict:
@@ -894,6 +1651,274 @@ class _CRUDModel:
         return description
 
 
+def _insert_many(
+    collection: pymongo.collection.Collection, documents: List[dict], ordered: bool
+) -> Dict[int, dict]:
+    """
+    Insert documents at once.
+
+    :param ordered: False to keep inserting documents after a failure.
+    :return: Write error per document index (if not ordered, an exception is raised otherwise).
+    """
+    try:
+        collection.insert_many(documents, ordered=ordered)
+    except pymongo.errors.BulkWriteError as e:
+        if ordered or e.details.get("writeConcernErrors"):
+            raise
+        return {error["index"]: error for error in e.details["writeErrors"]}
+    return {}
+
+
+def _upserted(previous_document: Optional[dict], keys: dict, update: dict) -> dict:
+    """
+    :return: Document resulting of an upsert (as performed by the server).
+    """
+    if previous_document is None:
+        return {**keys, **update["$set"], **update.get("$setOnInsert", {})}
+    new_document = {**previous_document, **update["$set"]}
+    for field_name in update.get("$unset", {}):
+        new_document.pop(field_name, None)
+    return new_document
+
+
+def _to_update(previous_document: dict, document: dict, replace: bool) -> dict:
+    """
+    :param replace: True to remove fields of the previous document that are not within the new document.
+    :return: Update operation setting document fields.
+    """
+    update = {"$set": document}
+    if replace:
+        removed_field_names = [
+            field_name
+            for field_name in previous_document
+            if field_name != "_id" and field_name not in document
+        ]
+        if removed_field_names:
+            update["$unset"] = dict.fromkeys(removed_field_names, "")
+    return update
+
+
+def _without_none(document: dict) -> dict:
+    """
+    :return: A copy of the document without None values (and without dictionaries only containing None values).
+    """
+    new_document = {}
+    for field_name, value in document.items():
+        if isinstance(value, dict):
+            value = _without_none(value) or None
+        if value is not None:
+            new_document[field_name] = copy.deepcopy(value)
+    return new_document
+
+
+def _get_value(document: dict, field: Column):
+    """
+    :return: Field value as stored in Mongo (default value if not stored).
+    """
+    value = document.get(field.name)
+    return field.get_default_value(document) if value is None else value
+
+
+def _synchronize_indexes(
+    collection: pymongo.collection.Collection,
+    expected_indexes: Dict[str, dict],
+    collection_logger: logging.Logger,
+) -> None:
+    """
+    Ensure that collection indexes are the expected ones.
+    Synchronization is skipped if another process is already synchronizing this collection indexes
+    or if expected indexes did not change since the last successful synchronization.
+
+    :param collection: Mongo collection (Mandatory).
+    :param expected_indexes: Index description (key and options) per index name (Mandatory).
+    :param collection_logger: Logger to use to report synchronization progress (Mandatory).
+    """
+    synchronizations = collection.database[INDEX_SYNCHRONIZATION]
+    fingerprint = _fingerprint(expected_indexes)
+    synchronization = synchronizations.find_one({"_id": collection.name}) or {}
+    if synchronization.get("fingerprint") == fingerprint:
+        collection_logger.debug("Indexes are already up to date.")
+        return
+
+    owner = uuid.uuid4().hex
+    if not _lock_indexes(synchronizations, collection.name, owner):
+        collection_logger.info("Indexes are being updated by another process.")
+        return
+
+    try:
+        collection_logger.info("Updating indexes...")
+        _update_indexes(collection, expected_indexes, collection_logger)
+        synchronizations.update_one(
+            {"_id": collection.name}, {"$set": {"fingerprint": fingerprint}}
+        )
+        collection_logger.info("Indexes updated.")
+    finally:
+        synchronizations.update_one(
+            {"_id": collection.name, "locked_by": owner},
+            {"$unset": {"locked_by": "", "locked_until": ""}},
+        )
+
+
+def _fingerprint(value) -> str:
+    return hashlib.sha1(
+        json.dumps(value, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def _lock_indexes(
+    synchronizations: pymongo.collection.Collection, collection_name: str, owner: str
+) -> bool:
+    """
+    Acquire the index synchronization lock of a collection.
+
+    :return: True if lock was acquired, False if it is already held by another process.
+    """
+    now = datetime.datetime.utcnow()
+    try:
+        synchronizations.find_one_and_update(
+            {
+                "_id": collection_name,
+                "$or": [
+                    {"locked_until": {"$exists": False}},
+                    {"locked_until": {"$lt": now}},
+                ],
+            },
+            {
+                "$set": {
+                    "locked_by": owner,
+                    "locked_until": now + INDEX_SYNCHRONIZATION_TIMEOUT,
+                }
+            },
+            upsert=True,
+        )
+        return True
+    except pymongo.errors.DuplicateKeyError:
+        # Document exists but lock is held (upsert is trying to create it again)
+        return False
+
+
+def _update_indexes(
+    collection: pymongo.collection.Collection,
+    expected_indexes: Dict[str, dict],
+    collection_logger: logging.Logger,
+) -> None:
+    """
+    Create missing indexes, then drop the ones that are not expected anymore.
+    An existing index is only dropped before creating a new one if they share the same key.
+    An index replacing an existing one with the same name (but another key) is created under another name.
+    """
+    existing_indexes = {
+        index["name"]: _to_index_description(index)
+        for index in collection.list_indexes()
+        if index.get("name") != "_id_"
+    }
+    collection_logger.debug(f"Checking existing indexes: {existing_indexes}")
+    stale_indexes = {
+        index_name: index
+        for index_name, index in existing_indexes.items()
+        if not any(
+            _is_matching(index, expected_index)
+            for expected_index in expected_indexes.values()
+        )
+    }
+    for index_name, index in expected_indexes.items():
+        existing_index_name = next(
+            (
+                existing_index_name
+                for existing_index_name, existing_index in existing_indexes.items()
+                if _is_matching(existing_index, index)
+            ),
+            None,
+        )
+        if existing_index_name:
+            continue
+
+        if (
+            index_name in existing_indexes
+            and existing_indexes[index_name]["key"] != index["key"]
+        ):
+            # Index names are unique, the replaced index is dropped once the new one is created
+            index_name = f"{index_name}_{_fingerprint(index)[:8]}"
+
+        for stale_index_name, stale_index in list(stale_indexes.items()):
+            # Server does not allow two indexes with the same key
+            if stale_index["key"] == index["key"]:
+                collection_logger.info(
+                    f"Drop {stale_index_name} index (replaced by {index_name} index)."
+                )
+                collection.drop_index(stale_index_name)
+                del stale_indexes[stale_index_name]
+
+        _create_index(collection, index_name, index, collection_logger)
+
+    for stale_index_name in stale_indexes:
+        collection_logger.info(f"Drop {stale_index_name} index.")
+        collection.drop_index(stale_index_name)
+
+
+def _to_index_description(index: dict) -> dict:
+    """
+    Convert an index as returned by list_indexes to the format of an expected index.
+    """
+    description = {
+        "key": [
+            (field_name, int(direction) if isinstance(direction, float) else direction)
+            for field_name, direction in index["key"].items()
+        ]
+    }
+    for option in _INDEX_OPTIONS:
+        if index.get(option):
+            description[option] = index[option]
+    return description
+
+
+def _is_matching(existing_index: dict, expected_index: dict) -> bool:
+    """
+    Check if an existing index is the expected one.
+    Server provides every collation setting, while only some of them are expected.
+    """
+    existing_index = dict(existing_index)
+    expected_index = dict(expected_index)
+    existing_collation = existing_index.pop("collation", {})
+    expected_collation = expected_index.pop("collation", {})
+    return existing_index == expected_index and all(
+        existing_collation.get(setting) == value
+        for setting, value in expected_collation.items()
+    )
+
+
+def _create_index(
+    collection: pymongo.collection.Collection,
+    index_name: str,
+    index: dict,
+    collection_logger: logging.Logger,
+) -> None:
+    """
+    Create an index (without partial filter if it is not supported by the server).
+    """
+    criteria = index["key"]
+    options = {option: value for option, value in index.items() if option != "key"}
+    collection_logger.info(
+        f"Create {index_name} index on {collection.name} using {criteria} criteria and {options} options."
+    )
+    try:
+        if "partialFilterExpression" in options:
+            try:
+                collection.create_index(criteria, name=index_name, **options)
+                return
+            except pymongo.errors.OperationFailure:
+                collection_logger.exception(
+                    f"Unable to create {index_name} partial index."
+                )
+                del options["partialFilterExpression"]
+        collection.create_index(criteria, name=index_name, **options)
+    except pymongo.errors.DuplicateKeyError:
+        collection_logger.exception(
+            f"Duplicate key found for {criteria} criteria when creating {index_name} index."
+        )
+        raise
+
+
 def _load(
     database_connection_url: str, controllers: Iterable[CRUDController], **kwargs
 ) -> pymongo.database.Database:
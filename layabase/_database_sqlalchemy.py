@@ -1,12 +1,21 @@
 import datetime
+import itertools
 import logging
 import urllib.parse
-from typing import List, Dict, Type, Iterable
+from typing import List, Dict, Type, Iterable, Iterator, Optional, Tuple
 import operator
 
 from marshmallow import ValidationError, EXCLUDE
 from marshmallow_sqlalchemy import SQLAlchemyAutoSchema
-from sqlalchemy import create_engine, inspect, Column, text, or_, and_
+from sqlalchemy import (
+    create_engine,
+    inspect,
+    Column,
+    text,
+    or_,
+    and_,
+    literal_column,
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, exc, PropComparator
 from sqlalchemy.orm.query import Query
@@ -19,6 +28,7 @@ from layabase._exceptions import (
     DatabaseError,
 )
 from layabase import ComparisonSigns, CRUDController
+from layabase._snapshot import SnapshotField
 
 
 logger = logging.getLogger(__name__)
@@ -30,6 +40,8 @@ _operators = {
     ComparisonSigns.Lower: operator.lt,
     ComparisonSigns.LowerOrEqual: operator.le,
 }
+# Types of the filter values that can be compared to snapshot values, per column type
+_snapshot_types = {str: (str,), int: (int,), float: (int, float), bool: (bool,)}
 
 
 class CRUDModel:
@@ -74,6 +86,82 @@ class CRUDModel:
         """
         Return all SQLAlchemy models.
         """
+        query = cls._query(filters)
+        try:
+            result = query.all()
+            cls._session.close()
+            return result
+        except exc.sa_exc.DBAPIError as e:
+            cls._handle_connection_failure(e)
+
+    @classmethod
+    def iter_all(cls, batch_size: int, **filters) -> Iterator[List[dict]]:
+        """
+        Return all models formatted as dictionaries, batch by batch.
+        Rows are fetched batch_size at a time from the database (server-side cursor if supported by the driver).
+
+        :param batch_size: Maximum number of rows fetched and serialized at once.
+        """
+        query = cls._query(filters).yield_per(batch_size)
+        return cls._iter_batches(query, batch_size)
+
+    @classmethod
+    def _iter_batches(cls, query: Query, batch_size: int) -> Iterator[List[dict]]:
+        try:
+            rows = iter(query)
+            while True:
+                batch = list(itertools.islice(rows, batch_size))
+                if not batch:
+                    break
+                yield cls.schema().dump(batch, many=True)
+                # Serialized rows are not needed anymore
+                cls._session.expunge_all()
+        except exc.sa_exc.DBAPIError as e:
+            cls._handle_connection_failure(e)
+        finally:
+            cls._session.close()
+
+    @classmethod
+    def iter_columns(cls, batch_size: int, **filters) -> Iterator[Dict[str, list]]:
+        """
+        Return column values (as returned by the database driver) of all models, batch by batch.
+        Rows are fetched batch_size at a time from the database (server-side cursor if supported by the driver)
+        and are neither loaded as models nor serialized.
+
+        :param batch_size: Maximum number of rows fetched at once.
+        """
+        field_names = list(cls._get_field_types())
+        query = (
+            cls._query(filters)
+            .with_entities(*[getattr(cls, field_name) for field_name in field_names])
+            .yield_per(batch_size)
+        )
+        return cls._iter_column_batches(query, field_names, batch_size)
+
+    @classmethod
+    def _iter_column_batches(
+        cls, query: Query, field_names: List[str], batch_size: int
+    ) -> Iterator[Dict[str, list]]:
+        try:
+            rows = iter(query)
+            while True:
+                batch = list(itertools.islice(rows, batch_size))
+                if not batch:
+                    break
+                yield {
+                    field_name: list(values)
+                    for field_name, values in zip(field_names, zip(*batch))
+                }
+        except exc.sa_exc.DBAPIError as e:
+            cls._handle_connection_failure(e)
+        finally:
+            cls._session.close()
+
+    @classmethod
+    def _query(cls, filters: dict) -> Query:
+        """
+        Query selecting models matching provided filters (limit, offset and order_by included).
+        """
         cls._check_required_query_fields(filters)
 
         query = cls._session.query(cls)
@@ -134,13 +222,7 @@ class CRUDModel:
             query = query.limit(query_limit)
         if query_offset:
             query = query.offset(query_offset)
-
-        try:
-            result = query.all()
-            cls._session.close()
-            return result
-        except exc.sa_exc.DBAPIError as e:
-            cls._handle_connection_failure(e)
+        return query
 
     @classmethod
     def customize_query(cls, query: Query) -> Query:
@@ -256,6 +338,92 @@ class CRUDModel:
             cls._session.rollback()
             raise
 
+    @classmethod
+    def add_each(cls, rows: List[dict], chunk_size: int = 100) -> list:
+        """
+        Add rows within a single transaction, each row being inserted (or rejected) independently of the others.
+        Rows are flushed by chunk, each chunk within a savepoint. Rows of a chunk that cannot be flushed are then
+        flushed one by one (each within a savepoint) so that only the faulty ones are rejected.
+
+        :param chunk_size: Maximum number of rows flushed within a savepoint. Default to 100.
+        :returns For each row (in order), the inserted model formatted as a dictionary
+        or the ValidationFailed exception explaining why it was not inserted.
+        """
+        results = [None] * len(rows)
+        models = {}
+        for index, row in enumerate(rows):
+            if not row:
+                results[index] = ValidationFailed({}, message="No data provided.")
+                continue
+            row = cls._remove_auto_incremented_fields(row)
+            try:
+                # Transient so that existing rows are not updated (leading to a duplicate error instead)
+                models[index] = row, cls.schema().load(
+                    row, session=cls._session, transient=True
+                )
+            except exc.sa_exc.DBAPIError as e:
+                raise DatabaseError(e) from e
+            except ValidationError as e:
+                results[index] = ValidationFailed(row, e.messages)
+
+        if not models:
+            return results
+
+        try:
+            indexes = list(models)
+            for start in range(0, len(indexes), chunk_size):
+                chunk = indexes[start : start + chunk_size]
+                if not cls._flush_within_savepoint(
+                    [models[index][1] for index in chunk]
+                ):
+                    continue
+                for index in chunk:
+                    row = models[index][0]
+                    # Previous savepoint rollback reverted (and expired) models
+                    model = cls.schema().load(row, session=cls._session, transient=True)
+                    error = cls._flush_within_savepoint([model])
+                    if isinstance(error, exc.FlushError):
+                        # Conflict with a row flushed by a previous savepoint
+                        del models[index]
+                        results[index] = ValidationFailed(
+                            row, message="This row already exists."
+                        )
+                    elif error:
+                        del models[index]
+                        results[index] = ValidationFailed(row, message=str(error.orig))
+                    else:
+                        models[index] = row, model
+            if cls.audit_model:
+                for row, _ in models.values():
+                    cls.audit_model.audit_add(row)
+            cls._session.commit()
+        except exc.sa_exc.DBAPIError as e:
+            cls._session.rollback()
+            cls._handle_connection_failure(e)
+        except Exception:
+            cls._session.rollback()
+            raise
+
+        for index, (_, model) in models.items():
+            results[index] = _model_field_values(model)
+        return results
+
+    @classmethod
+    def _flush_within_savepoint(cls, models: list) -> Optional[Exception]:
+        """
+        :returns The database error (or the conflict with an already flushed model) that prevented models
+        to be flushed (savepoint was rolled back), if any.
+        """
+        savepoint = cls._session.begin_nested()
+        try:
+            cls._session.add_all(models)
+            cls._session.flush()
+        except (exc.sa_exc.DBAPIError, exc.FlushError) as e:
+            savepoint.rollback()
+            return e
+        savepoint.commit()
+        return None
+
     @classmethod
     def _remove_auto_incremented_fields(cls, row: dict) -> dict:
         if isinstance(row, dict):
@@ -318,6 +486,26 @@ class CRUDModel:
             cls._session.rollback()
             raise
 
+    @classmethod
+    def replace_all(cls, rows: List[dict]) -> (List[dict], List[dict]):
+        """
+        Replace models formatted as a list of dictionaries.
+        Unlike update_all, rows are fully provided: fields that are not provided are set to None.
+
+        :raises ValidationFailed in case Marshmallow validation fail.
+        :returns A tuple containing previous models formatted as a list of dictionaries (first item)
+        and new models formatted as a list of dictionaries (second item).
+        """
+        if not isinstance(rows, list):
+            raise ValidationFailed(rows, message="Must be a list of dictionaries.")
+        field_names = cls.get_field_names()
+        return cls.update_all(
+            [
+                {**dict.fromkeys(field_names), **row} if isinstance(row, dict) else row
+                for row in rows
+            ]
+        )
+
     @classmethod
     def update(cls, row: dict) -> (dict, dict):
         """
@@ -358,6 +546,159 @@ class CRUDModel:
             cls._session.rollback()
             raise
 
+    @classmethod
+    def upsert(cls, row: dict) -> (bool, dict):
+        """
+        Insert a model formatted as a dictionary, or update it if it already exists (same primary key).
+        Only provided fields are updated.
+
+        :raises ValidationFailed in case Marshmallow validation fail.
+        :returns A tuple containing True if model was inserted, False if it was updated (first item)
+        and new model formatted as a dictionary (second item).
+        """
+        if not row:
+            raise ValidationFailed({}, message="No data provided.")
+        if not isinstance(row, dict):
+            raise ValidationFailed(row, message="Must be a dictionary.")
+        errors = cls._validate_upserts([row])
+        if errors:
+            raise ValidationFailed(row, errors[0])
+        inserted, new_rows = cls._upsert([row])
+        return inserted[0], new_rows[0]
+
+    @classmethod
+    def upsert_all(cls, rows: List[dict]) -> (List[bool], List[dict]):
+        """
+        Insert models formatted as a list of dictionaries, or update them if they already exist (same primary key).
+        Only provided fields are updated.
+
+        :raises ValidationFailed in case Marshmallow validation fail.
+        :returns A tuple containing, per model, True if it was inserted, False if it was updated (first item)
+        and new models formatted as a list of dictionaries (second item).
+        """
+        if not rows:
+            raise ValidationFailed({}, message="No data provided.")
+        if not isinstance(rows, list):
+            raise ValidationFailed(rows, message="Must be a list of dictionaries.")
+        errors = cls._validate_upserts(rows)
+        if errors:
+            raise ValidationFailed(rows, errors)
+        return cls._upsert(rows)
+
+    @classmethod
+    def _validate_upserts(cls, rows: List[dict]) -> dict:
+        """
+        :return: Validation errors (rows must be valid for insertion, including their primary key), per row index.
+        """
+        errors = {}
+        for index, row in enumerate(rows):
+            if not isinstance(row, dict):
+                errors[index] = {"": ["Must be a dictionary."]}
+                continue
+            row_errors = cls.schema().validate(row, session=cls._session)
+            for primary_key in cls.get_primary_keys():
+                if row.get(primary_key) is None:
+                    row_errors[primary_key] = ["Missing data for required field."]
+            if row_errors:
+                errors[index] = row_errors
+        return errors
+
+    @classmethod
+    def _upsert(cls, rows: List[dict]) -> (List[bool], List[dict]):
+        """
+        Upsert valid rows within a single transaction, using INSERT ... ON CONFLICT DO UPDATE if supported.
+        """
+        try:
+            if cls._session.get_bind().dialect.name == "postgresql":
+                inserted, new_rows = cls._upsert_on_conflict(rows)
+            else:
+                inserted, new_rows = cls._upsert_by_merging(rows)
+            if cls.audit_model:
+                for row_inserted, new_row in zip(inserted, new_rows):
+                    if row_inserted:
+                        cls.audit_model.audit_add(new_row)
+                    else:
+                        cls.audit_model.audit_update(new_row)
+            cls._session.commit()
+            return inserted, new_rows
+        except exc.sa_exc.DBAPIError as e:
+            cls._session.rollback()
+            cls._handle_connection_failure(e)
+        except Exception:
+            cls._session.rollback()
+            raise
+
+    @classmethod
+    def _upsert_on_conflict(cls, rows: List[dict]) -> (List[bool], List[dict]):
+        """
+        Upsert rows using a single INSERT ... ON CONFLICT DO UPDATE statement per set of provided columns.
+        """
+        from sqlalchemy.dialects import postgresql
+
+        primary_keys = cls.get_primary_keys()
+        column_names = cls.get_field_names()
+        # Statements use table column keys while models use mapped attribute names
+        mapped_columns = inspect(cls).columns
+        column_keys = {
+            attribute_name: column.key
+            for attribute_name, column in mapped_columns.items()
+        }
+        values_per_columns = {}
+        for index, row in enumerate(rows):
+            model = cls.schema().load(row, session=cls._session, transient=True)
+            provided = tuple(name for name in column_names if name in row)
+            values_per_columns.setdefault(provided, []).append(
+                (index, {column_keys[name]: getattr(model, name) for name in provided})
+            )
+
+        primary_key_columns = [column_keys[key] for key in primary_keys]
+        inserted = [False] * len(rows)
+        new_rows = [None] * len(rows)
+        for provided, indexed_values in values_per_columns.items():
+            statement = postgresql.insert(cls.__table__).values(
+                [values for _, values in indexed_values]
+            )
+            # Primary keys are "updated" when no other column is provided so that row is returned
+            updated = [
+                column_keys[name] for name in provided if name not in primary_keys
+            ] or primary_key_columns
+            statement = statement.on_conflict_do_update(
+                index_elements=primary_key_columns,
+                set_={key: statement.excluded[key] for key in updated},
+            ).returning(
+                *(
+                    column.label(attribute_name)
+                    for attribute_name, column in mapped_columns.items()
+                ),
+                # Row was inserted if no transaction ever updated it
+                literal_column("xmax = 0").label("layabase_inserted"),
+            )
+            indexes = {
+                tuple(values[key] for key in primary_key_columns): index
+                for index, values in indexed_values
+            }
+            for result in cls._session.execute(statement):
+                result = dict(result)
+                index = indexes[tuple(result[key] for key in primary_keys)]
+                inserted[index] = result.pop("layabase_inserted")
+                new_rows[index] = _model_field_values(cls(**result))
+        return inserted, new_rows
+
+    @classmethod
+    def _upsert_by_merging(cls, rows: List[dict]) -> (List[bool], List[dict]):
+        """
+        Upsert rows by loading existing rows (if any) then inserting or updating them.
+        """
+        inserted = []
+        models = []
+        for row in rows:
+            model = cls.schema().load(row, session=cls._session)
+            inserted.append(not inspect(model).persistent)
+            models.append(model)
+        cls._session.add_all(models)
+        cls._session.flush()
+        return inserted, _models_field_values(models)
+
     @classmethod
     def remove(cls, **filters) -> int:
         """
@@ -367,17 +708,11 @@ class CRUDModel:
         """
         cls._check_required_query_fields(filters)
         try:
-            query = cls._session.query(cls)
-            for column_name, value in filters.items():
-                if value is not None:
-                    if isinstance(value, list):
-                        if value:
-                            query = query.filter(getattr(cls, column_name).in_(value))
-                    else:
-                        query = query.filter(getattr(cls, column_name) == value)
+            query = cls._removal_query(filters)
             if cls.audit_model:
-                cls.audit_model.audit_remove(**filters)
-            nb_removed = query.delete(synchronize_session="fetch")
+                cls.audit_model.audit_remove(query)
+            # Session is closed after every operation, there is no object to synchronize
+            nb_removed = query.delete(synchronize_session=False)
             cls._session.commit()
             return nb_removed
         except exc.sa_exc.DBAPIError as e:
@@ -387,6 +722,65 @@ class CRUDModel:
             cls._session.rollback()
             raise
 
+    @classmethod
+    def remove_chunk(cls, chunk_size: int, **filters) -> int:
+        """
+        Remove up to chunk_size models matching those criterion (selected by primary key), within a transaction.
+
+        :returns Number of removed rows.
+        """
+        cls._check_required_query_fields(filters)
+        try:
+            primary_keys = [getattr(cls, key) for key in cls.get_primary_keys()]
+            keys = (
+                cls._removal_query(filters)
+                .with_entities(*primary_keys)
+                .limit(chunk_size)
+                .all()
+            )
+            if not keys:
+                cls._session.commit()
+                return 0
+            if len(primary_keys) == 1:
+                chunk_filter = primary_keys[0].in_([key for key, in keys])
+            else:
+                chunk_filter = or_(
+                    *[
+                        and_(
+                            *[
+                                column == value
+                                for column, value in zip(primary_keys, key)
+                            ]
+                        )
+                        for key in keys
+                    ]
+                )
+            query = cls._session.query(cls).filter(chunk_filter)
+            if cls.audit_model:
+                cls.audit_model.audit_remove(query)
+            # Session is closed after every operation, there is no object to synchronize
+            nb_removed = query.delete(synchronize_session=False)
+            cls._session.commit()
+            return nb_removed
+        except exc.sa_exc.DBAPIError as e:
+            cls._session.rollback()
+            cls._handle_connection_failure(e)
+        except Exception:
+            cls._session.rollback()
+            raise
+
+    @classmethod
+    def _removal_query(cls, filters: dict) -> Query:
+        query = cls._session.query(cls)
+        for column_name, value in filters.items():
+            if value is not None:
+                if isinstance(value, list):
+                    if value:
+                        query = query.filter(getattr(cls, column_name).in_(value))
+                else:
+                    query = query.filter(getattr(cls, column_name) == value)
+        return query
+
     @classmethod
     def schema(cls) -> SQLAlchemyAutoSchema:
         """
@@ -458,6 +852,66 @@ class CRUDModel:
     def get_field_names(cls) -> List[str]:
         return [field.name for field in cls.schema().fields.values()]
 
+    @classmethod
+    def _get_field_types(cls) -> Dict[str, type]:
+        """
+        Python type of the values stored in each column (str if unknown).
+        """
+        field_types = {}
+        for name, column in inspect(cls).columns.items():
+            try:
+                field_types[name] = column.type.python_type
+            except NotImplementedError:
+                field_types[name] = str
+        return field_types
+
+    @classmethod
+    def _get_snapshot_fields(cls) -> Dict[str, SnapshotField]:
+        """
+        Columns that can be queried on a snapshot.
+        Filters on columns interpreting * character are always performed on the database.
+        """
+        fields = {}
+        for name, column in inspect(cls).columns.items():
+            layabase_info = column.info.get("layabase", {})
+            try:
+                types = _snapshot_types.get(column.type.python_type, ())
+            except NotImplementedError:
+                types = ()
+            if layabase_info.get("interpret_star_character", False):
+                types = ()
+            fields[name] = SnapshotField(
+                types=types,
+                allow_comparison_signs=layabase_info.get(
+                    "allow_comparison_signs", False
+                ),
+                indexed=bool(column.primary_key or column.index or column.unique),
+            )
+        return fields
+
+    @classmethod
+    def _to_snapshot_sort(cls, order_by: list) -> Optional[List[Tuple[str, bool]]]:
+        """
+        Only column names, optionally followed by asc or desc, can be sorted on a snapshot.
+        """
+        sort = []
+        for column in order_by:
+            if not isinstance(column, str):
+                return None
+            column_name, *direction = column.split()
+            direction = [keyword.lower() for keyword in direction]
+            if direction not in ([], ["asc"], ["desc"]):
+                return None
+            sort.append((column_name, direction == ["desc"]))
+        return sort
+
+    @classmethod
+    def _is_valid_query(cls, filters: dict) -> bool:
+        return all(
+            required_field in filters
+            for required_field in cls._get_required_query_fields()
+        )
+
 
 def _create_model(controller: CRUDController, base) -> Type[CRUDModel]:
     model: Type[CRUDModel] = type(
@@ -471,6 +925,9 @@ def _create_model(controller: CRUDController, base) -> Type[CRUDModel]:
     controller.supports_offset = _supports_offset(base.metadata.bind.url.drivername)
 
     if controller.audit:
+        if controller.partition_audit_by_month:
+            raise Exception("Audit can only be partitioned by month for Mongo.")
+
         from layabase._audit_sqlalchemy import _create_from, _to_audit_column
 
         table_copy = type(
@@ -486,7 +943,7 @@ def _create_model(controller: CRUDController, base) -> Type[CRUDModel]:
         model.audit_model = type(
             f"{controller.table_or_collection.__name__}_SQLAlchemyAuditModel",
             (
-                _create_from(model, controller.retrieve_user),
+                _create_from(model, controller.retrieve_user, controller.audit_writer),
                 table_copy,
                 CRUDModel,
                 base,
@@ -0,0 +1,112 @@
+import contextlib
+import csv
+import gzip
+import io
+import json
+import logging
+from typing import Dict, Iterable, List, Union
+
+from layabase._serialization import to_csv_value, to_json_value
+
+logger = logging.getLogger(__name__)
+
+FILE_FORMATS = ("csv", "ndjson", "parquet")
+
+
+def export(
+    batches: Iterable[List[dict]],
+    field_types: Dict[str, type],
+    path_or_stream: Union[str, io.IOBase],
+    file_format: str,
+) -> int:
+    """
+    Write serialized records to a file (or a file-like object), batch by batch (in constant memory).
+
+    :param batches: Serialized records, batch by batch (csv and ndjson).
+    Values (as stored in database) per field name, batch by batch (parquet).
+    :param field_types: Python type of each field (in order).
+    :param path_or_stream: Path to a file (replaced if it already exists) or a writable file-like object.
+    csv and ndjson files are gzip compressed if path is suffixed by .gz.
+    :param file_format: csv (with a header line), ndjson (one JSON record per line) or parquet (requires pyarrow),
+    parquet columns being typed as in an Arrow table (see layabase._arrow).
+    :return: Number of exported records.
+    """
+    if file_format not in FILE_FORMATS:
+        raise Exception(f"File format must be one of {FILE_FORMATS}.")
+
+    if file_format == "parquet":
+        return _write_parquet(batches, field_types, path_or_stream)
+
+    with _open_text(path_or_stream) as file:
+        if file_format == "csv":
+            return _write_csv(batches, list(field_types), file)
+        return _write_ndjson(batches, file)
+
+
+@contextlib.contextmanager
+def _open_text(path_or_stream: Union[str, io.IOBase]):
+    if isinstance(path_or_stream, str):
+        open_file = gzip.open if path_or_stream.endswith(".gz") else open
+        with open_file(path_or_stream, "wt", encoding="utf-8", newline="") as file:
+            yield file
+    elif isinstance(path_or_stream, io.TextIOBase):
+        yield path_or_stream
+    else:
+        # Binary stream
+        file = io.TextIOWrapper(
+            path_or_stream, encoding="utf-8", newline="", write_through=True
+        )
+        try:
+            yield file
+        finally:
+            file.flush()
+            # Leave the provided stream open
+            file.detach()
+
+
+def _write_csv(batches: Iterable[List[dict]], field_names: List[str], file) -> int:
+    writer = csv.DictWriter(file, fieldnames=field_names, extrasaction="ignore")
+    writer.writeheader()
+    nb_exported = 0
+    for batch in batches:
+        writer.writerows(
+            {
+                field_name: to_csv_value(record.get(field_name))
+                for field_name in field_names
+            }
+            for record in batch
+        )
+        nb_exported += len(batch)
+        logger.debug(f"{nb_exported} records exported.")
+    return nb_exported
+
+
+def _write_ndjson(batches: Iterable[List[dict]], file) -> int:
+    nb_exported = 0
+    for batch in batches:
+        for record in batch:
+            file.write(json.dumps(record, default=to_json_value))
+            file.write("\n")
+        nb_exported += len(batch)
+        logger.debug(f"{nb_exported} records exported.")
+    return nb_exported
+
+
+def _write_parquet(
+    column_batches: Iterable[Dict[str, list]],
+    field_types: Dict[str, type],
+    path_or_stream: Union[str, io.IOBase],
+) -> int:
+    import pyarrow
+    import pyarrow.parquet
+    from layabase._arrow import to_record_batches, to_schema
+
+    schema = to_schema(field_types)
+    nb_exported = 0
+    with pyarrow.parquet.ParquetWriter(path_or_stream, schema) as writer:
+        # Only one batch of records is converted (and held in memory) at a time
+        for record_batch in to_record_batches(column_batches, field_types, schema):
+            writer.write_table(pyarrow.Table.from_batches([record_batch], schema))
+            nb_exported += record_batch.num_rows
+            logger.debug(f"{nb_exported} records exported.")
+    return nb_exported
@@ -1,14 +1,20 @@
+import flask
 import flask_restx
 from layabase._api import add_get_query_fields, add_delete_query_fields, add_rollback_query_fields, \
-    add_history_query_fields, add_get_audit_query_fields, post_request_fields, put_request_fields, get_response_fields, \
-    get_history_response_fields, get_audit_response_fields, get_description_response_fields
+    add_history_query_fields, add_get_audit_query_fields, add_changes_query_fields, post_request_fields, \
+    put_request_fields, get_response_fields, get_history_response_fields, get_audit_response_fields, \
+    get_changes_response_fields, get_description_response_fields
 
 
 class ParsersAndModels:
-    def __init__(self, table_or_collection, history: bool, audit: bool, supports_offset: bool):
+    def __init__(
+        self, table_or_collection, history: bool, audit: bool, supports_offset: bool, get_etag: callable = None
+    ):
         self.table_or_collection = table_or_collection
         self.history = history
         self.audit = audit
+        # Provide the entity tag of a query (used to answer conditional requests)
+        self._get_etag = get_etag
 
         self.query_get_parser = flask_restx.reqparse.RequestParser()
         add_get_query_fields(table_or_collection, self.query_get_parser, supports_offset)
@@ -18,9 +24,11 @@ class ParsersAndModels:
 
         self.query_rollback_parser = flask_restx.reqparse.RequestParser()
         self.query_get_history_parser = flask_restx.reqparse.RequestParser()
+        self.query_get_changes_parser = flask_restx.reqparse.RequestParser()
         if history:
             add_rollback_query_fields(table_or_collection, self.query_rollback_parser)
             add_history_query_fields(table_or_collection, self.query_get_history_parser, supports_offset)
+            add_changes_query_fields(table_or_collection, self.query_get_changes_parser)
 
         self.query_get_audit_parser = flask_restx.reqparse.RequestParser()
         if audit:
@@ -35,6 +43,7 @@ class ParsersAndModels:
         # CRUD response marshallers
         self.get_response_model = None
         self.get_history_response_model = None
+        self.get_changes_response_model = None
         self.get_audit_response_model = None
         self.get_model_description_response_model = None
 
@@ -60,6 +69,11 @@ class ParsersAndModels:
             f"{self.table_or_collection.__name__}_GetHistoryResponseModel",
             get_history_response_fields(self.table_or_collection, namespace),
         )
+        if self.history:
+            self.get_changes_response_model = namespace.model(
+                f"{self.table_or_collection.__name__}_GetChangesResponseModel",
+                get_changes_response_fields(self.get_history_response_model),
+            )
         if self.audit:
             self.get_audit_response_model = namespace.model(
                 f"{self.table_or_collection.__name__}_GetAuditResponseModel",
@@ -71,3 +85,21 @@ class ParsersAndModels:
             f"{self.table_or_collection.__name__}_GetDescriptionResponseModel",
             get_description_response_fields(self.table_or_collection),
         )
+
+    def conditional_get(self, get: callable, request_arguments: dict):
+        """
+        Answer a GET request with an ETag header.
+        Data is not retrieved (304 Not Modified is answered) if the client If-None-Match header matches it.
+
+        :param get: Controller method to call to retrieve data (get or get_one for instance).
+        :param request_arguments: Parsed query arguments.
+        :return: A tuple with response data, status code and headers.
+        """
+        if not self._get_etag:
+            raise Exception("Entity tags cannot be computed without a controller.")
+        # Computed before retrieving data so that a concurrent change leads to a new entity tag
+        etag = self._get_etag(request_arguments)
+        headers = {"ETag": f'"{etag}"'}
+        if flask.request.if_none_match.contains_weak(etag):
+            return None, 304, headers
+        return get(request_arguments), 200, headers
@@ -0,0 +1,99 @@
+import csv
+import datetime
+import gzip
+import json
+import os
+from typing import Iterator, Optional, Tuple, Union
+
+from layabase._exceptions import ValidationFailed
+
+FILE_FORMATS = ("csv", "ndjson", "parquet")
+# File format per file extension
+_EXTENSIONS = {
+    ".csv": "csv",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".parquet": "parquet",
+}
+
+
+def read_records(
+    path: str, file_format: str = None
+) -> Iterator[Tuple[int, Union[dict, ValidationFailed]]]:
+    """
+    Read records of a local file, one at a time.
+
+    :param path: Path to a local csv (with a header line), ndjson (one JSON record per line) or parquet file.
+    csv and ndjson files can be gzip compressed (path suffixed by .gz).
+    :param file_format: csv, ndjson or parquet. Default to the one matching the path extension.
+    :return: Line (row number for parquet) and record (or the error explaining why it could not be read), per record.
+    """
+    if "://" in path:
+        raise Exception("Only local files can be imported.")
+
+    file_format = file_format or deduce_file_format(path)
+    if file_format not in FILE_FORMATS:
+        raise Exception(f"File format must be one of {FILE_FORMATS}.")
+
+    if file_format == "parquet":
+        yield from _read_parquet(path)
+        return
+
+    open_file = gzip.open if path.endswith(".gz") else open
+    with open_file(path, "rt", encoding="utf-8", newline="") as file:
+        if file_format == "csv":
+            yield from _read_csv(file)
+        else:
+            yield from _read_ndjson(file)
+
+
+def deduce_file_format(path: str) -> Optional[str]:
+    """
+    File format matching the extension of this path (ignoring .gz suffix), None if unknown.
+    """
+    if path.endswith(".gz"):
+        path = path[:-3]
+    return _EXTENSIONS.get(os.path.splitext(path)[1].lower())
+
+
+def _read_csv(file) -> Iterator[Tuple[int, dict]]:
+    reader = csv.DictReader(file)
+    for row in reader:
+        # Values are provided as strings, empty values are considered as not provided
+        yield reader.line_num, {
+            field_name: value
+            for field_name, value in row.items()
+            if field_name is not None and value not in ("", None)
+        }
+
+
+def _read_ndjson(file) -> Iterator[Tuple[int, Union[dict, ValidationFailed]]]:
+    for line_number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError as e:
+            yield line_number, ValidationFailed(line, message=f"Not a valid JSON: {e}")
+
+
+def _read_parquet(path: str) -> Iterator[Tuple[int, dict]]:
+    import pyarrow.parquet
+
+    row_number = 0
+    for batch in pyarrow.parquet.ParquetFile(path).iter_batches():
+        columns = batch.to_pydict()
+        for values in zip(*columns.values()):
+            row_number += 1
+            yield row_number, {
+                field_name: _to_text(value)
+                for field_name, value in zip(columns, values)
+                if value is not None
+            }
+
+
+def _to_text(value):
+    # Dates and times are validated as they would be received (ISO-8601 formatted)
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return value
@@ -0,0 +1,106 @@
+import threading
+from typing import Dict, List, Optional
+
+
+class _Batch:
+    def __init__(self):
+        self.documents: List[dict] = []
+        self.results: Optional[list] = None
+        # Set when no more document can be added to the batch
+        self.full = threading.Event()
+        # Set when batch was written (results are available)
+        self.written = threading.Event()
+
+
+class PostCoalescer:
+    """
+    Insert documents provided by concurrent CRUDController.post calls at once (group commit).
+
+    The first caller waits up to max_delay seconds (or until max_documents are waiting) for other callers,
+    then inserts every waiting document at once (one insert_many for Mongo, one transaction for SQLAlchemy)
+    on behalf of every caller. Each caller still receives its own inserted document or its own error.
+
+    A post that does not run concurrently with another one is delayed by max_delay seconds.
+    With history (Mongo), documents inserted at once share the same revision.
+    """
+
+    def __init__(self, max_delay: float = 0.005, max_documents: int = 100):
+        """
+        :param max_delay: Maximum number of seconds to wait for other documents. Default to 5 milliseconds.
+        :param max_documents: Maximum number of documents inserted at once. Default to 100.
+        """
+        if max_delay < 0:
+            raise Exception("Maximum delay must be positive.")
+        if max_documents < 1:
+            raise Exception(
+                "Maximum number of documents must be a strictly positive integer."
+            )
+        self.max_delay = max_delay
+        self.max_documents = max_documents
+        self._lock = threading.Lock()
+        self._writing_lock = threading.Lock()
+        # Batch currently waiting for documents, per model
+        self._batches: Dict[type, _Batch] = {}
+        self._inserts = 0
+        self._documents = 0
+
+    def add(self, model, document: dict) -> dict:
+        """
+        Insert a document (alongside documents provided concurrently).
+
+        :param model: Model providing an add_each(documents) class method.
+        :raises ValidationFailed in case validation fail (for this document).
+        :returns The inserted document formatted as a dictionary.
+        """
+        with self._lock:
+            batch = self._batches.get(model)
+            is_leader = batch is None
+            if is_leader:
+                batch = self._batches[model] = _Batch()
+            position = len(batch.documents)
+            batch.documents.append(document)
+            if len(batch.documents) >= self.max_documents:
+                del self._batches[model]
+                batch.full.set()
+
+        if is_leader:
+            self._write(model, batch)
+        else:
+            batch.written.wait()
+
+        result = batch.results[position]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def metrics(self) -> Dict[str, int]:
+        """
+        :return: Number of insertions performed (inserts) and number of documents inserted by them (documents).
+        """
+        return {"inserts": self._inserts, "documents": self._documents}
+
+    def _write(self, model, batch: _Batch):
+        batch.full.wait(self.max_delay)
+        # Batches are written one at a time (SQLAlchemy session cannot be shared by threads)
+        # The batch keeps receiving documents while the previous one is written
+        with self._writing_lock:
+            with self._lock:
+                if self._batches.get(model) is batch:
+                    del self._batches[model]
+            self._write_documents(model, batch)
+
+    def _write_documents(self, model, batch: _Batch):
+        try:
+            batch.results = model.add_each(batch.documents)
+            with self._lock:
+                self._inserts += 1
+                self._documents += len(batch.documents)
+        except Exception as e:
+            # Every document failed for the same reason (database cannot be reached for example)
+            batch.results = [e] * len(batch.documents)
+        finally:
+            if batch.results is None:
+                batch.results = [Exception("Document could not be inserted.")] * len(
+                    batch.documents
+                )
+            batch.written.set()
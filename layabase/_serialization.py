@@ -0,0 +1,19 @@
+import datetime
+import json
+
+
+def to_json_value(value):
+    """
+    Convert values that are not JSON serializable (dates, ObjectId, ...) to string.
+    """
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def to_csv_value(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=to_json_value)
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
@@ -0,0 +1,309 @@
+import collections
+import copy
+import operator
+import threading
+import time
+from typing import Dict, List, Optional
+
+from layabase._database import ComparisonSigns
+from layabase._exceptions import ValidationFailed
+
+SnapshotField = collections.namedtuple(
+    "SnapshotField", ["types", "allow_comparison_signs", "indexed"]
+)
+SnapshotField.__doc__ = """
+Description of a queryable field for a snapshot.
+
+:param types: Types of the filter values that can be compared in memory (empty if none can be compared).
+:param allow_comparison_signs: If comparison signs can be evaluated in memory.
+:param indexed: If rows should be hash indexed on this field.
+"""
+
+_operators = {
+    ComparisonSigns.Greater: operator.gt,
+    ComparisonSigns.GreaterOrEqual: operator.ge,
+    ComparisonSigns.Lower: operator.lt,
+    ComparisonSigns.LowerOrEqual: operator.le,
+}
+
+
+class Snapshot:
+    """
+    Full in-memory copy of a (small, read-mostly) table or collection, queried without reaching the database.
+
+    Rows are hash indexed on primary keys and indexed fields.
+    Queries that cannot be evaluated in memory (filter values of another type, unknown fields, ...) must be
+    performed on the database instead (None is returned).
+
+    The model must provide the following class methods (in addition to get_all and get_primary_keys):
+     - _get_snapshot_fields() -> Dict[str, SnapshotField] (every queryable field)
+     - _to_snapshot_sort(order_by) -> Optional[List[Tuple[str, bool]]] (field name and descending, None if not supported)
+     - _is_valid_query(filters) -> bool (False if querying the database would fail validation)
+    """
+
+    def __init__(self, model, refresh_interval: Optional[float]):
+        """
+        :param refresh_interval: Number of seconds after which the snapshot is fully refreshed (on next query).
+        None to only refresh it with writes performed through the controller.
+        """
+        self._primary_keys = model.get_primary_keys()
+        if not self._primary_keys:
+            raise Exception(
+                "A snapshot can only be kept for a table or collection with a primary key."
+            )
+        self._model = model
+        self._fields: Dict[str, SnapshotField] = model._get_snapshot_fields()
+        self.refresh_interval = refresh_interval
+        self._lock = threading.RLock()
+        # Rows per primary key, in natural order
+        self._rows: Dict[tuple, dict] = {}
+        self._positions: Dict[tuple, int] = {}
+        self._next_position = 0
+        # Primary keys per value, per indexed field
+        self._indexes: Dict[str, Dict[object, set]] = {}
+        # Time of the last full refresh, None if a full refresh is required
+        self._refreshed_at: Optional[float] = None
+
+    def refresh(self):
+        """
+        Reload every row from the database.
+        """
+        with self._lock:
+            rows = self._model.get_all()
+            self._rows = {}
+            self._positions = {}
+            self._next_position = 0
+            self._indexes = {
+                field_name: {}
+                for field_name, field in self._fields.items()
+                if field.indexed and field.types
+            }
+            for row in rows:
+                self._put(row)
+            self._refreshed_at = time.monotonic()
+
+    def invalidate(self):
+        """
+        Fully refresh the snapshot on next query.
+        """
+        self._refreshed_at = None
+
+    def refresh_rows(self, rows: List[dict]):
+        """
+        Reload (or remove if they do not exist anymore) the rows sharing the primary keys of those rows.
+        """
+        if self._refreshed_at is None or not rows:
+            return  # Every row will be reloaded anyway
+
+        keys = [self._key(row) for row in rows]
+        if len(self._primary_keys) == 1:
+            current_rows = self._model.get_all(
+                **{self._primary_keys[0]: [key[0] for key in keys]}
+            )
+        else:
+            current_rows = [
+                current_row
+                for key in keys
+                for current_row in self._model.get_all(
+                    **dict(zip(self._primary_keys, key))
+                )
+            ]
+        with self._lock:
+            current_keys = set()
+            for current_row in current_rows:
+                self._put(current_row)
+                current_keys.add(self._key(current_row))
+            for key in keys:
+                if key not in current_keys:
+                    self._discard(key)
+
+    def remove_matching(self, filters: dict):
+        """
+        Remove the rows matching those filters (as provided to remove).
+        """
+        with self._lock:
+            if self._refreshed_at is None:
+                return  # Every row will be reloaded anyway
+            keys = self._select(filters)
+            if keys is None:
+                self.invalidate()
+                return
+            for key in keys:
+                self._discard(key)
+
+    def get_all(self, filters: dict) -> Optional[List[dict]]:
+        """
+        :return: Rows matching filters (as provided to get_all), None if filters cannot be evaluated in memory.
+        """
+        filters = dict(filters)
+        limit = filters.pop("limit", None) or 0
+        offset = filters.pop("offset", None) or 0
+        order_by = filters.pop("order_by", None)
+        sort = self._model._to_snapshot_sort(order_by) if order_by else []
+        if sort is None or not self._model._is_valid_query(filters):
+            return None
+        for field_name, _ in sort:
+            field = self._fields.get(field_name)
+            if field is None or not field.types:
+                return None
+
+        with self._lock:
+            self._ensure_refreshed()
+            keys = self._select(filters)
+            if keys is None:
+                return None
+            rows = [self._rows[key] for key in keys]
+
+        # Sort by the least significant field first (sort is stable)
+        for field_name, descending in reversed(sort):
+            rows.sort(
+                key=lambda row: _sort_key(row.get(field_name)), reverse=descending
+            )
+        return copy.deepcopy(rows[offset : offset + limit if limit else None])
+
+    def get(self, filters: dict) -> Optional[dict]:
+        """
+        :return: Row matching filters (as provided to get), empty if there is none,
+        None if filters cannot be evaluated in memory.
+        :raises ValidationFailed if more than one row match.
+        """
+        for value in filters.values():
+            if isinstance(value, list) and len(value) > 1:
+                return None
+        if not self._model._is_valid_query(filters):
+            return None
+
+        with self._lock:
+            self._ensure_refreshed()
+            keys = self._select(filters)
+            if keys is None:
+                return None
+            if len(keys) > 1:
+                raise ValidationFailed(
+                    filters, message="More than one result: Consider another filtering."
+                )
+            return copy.deepcopy(self._rows[keys[0]]) if keys else {}
+
+    def _ensure_refreshed(self):
+        if self._refreshed_at is None or (
+            self.refresh_interval is not None
+            and time.monotonic() - self._refreshed_at >= self.refresh_interval
+        ):
+            self.refresh()
+
+    def _key(self, row: dict) -> tuple:
+        return tuple(row.get(primary_key) for primary_key in self._primary_keys)
+
+    def _put(self, row: dict):
+        key = self._key(row)
+        previous_row = self._rows.get(key)
+        if previous_row is None:
+            self._positions[key] = self._next_position
+            self._next_position += 1
+        else:
+            self._unindex(key, previous_row)
+        # Replacing a row keeps its position
+        self._rows[key] = row
+        for field_name, index in self._indexes.items():
+            index.setdefault(row.get(field_name), set()).add(key)
+
+    def _discard(self, key: tuple):
+        row = self._rows.pop(key, None)
+        if row is not None:
+            del self._positions[key]
+            self._unindex(key, row)
+
+    def _unindex(self, key: tuple, row: dict):
+        for field_name, index in self._indexes.items():
+            keys = index.get(row.get(field_name))
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del index[row.get(field_name)]
+
+    def _select(self, filters: dict) -> Optional[List[tuple]]:
+        """
+        :return: Primary keys of the rows matching filters (in natural order), None if filters cannot be evaluated in memory.
+        """
+        conditions = []
+        candidates = None
+        for field_name, value in filters.items():
+            field = self._fields.get(field_name)
+            if field is None:
+                return None
+            if value is None or (isinstance(value, list) and not value):
+                continue
+            condition = self._to_condition(field, value)
+            if condition is None:
+                return None
+            equality_values, comparisons = condition
+            conditions.append((field_name, equality_values, comparisons))
+            index = self._indexes.get(field_name)
+            if index is not None and not comparisons:
+                keys = set().union(*(index.get(value, ()) for value in equality_values))
+                if candidates is None or len(keys) < len(candidates):
+                    candidates = keys
+
+        if candidates is None:
+            keys = self._rows.keys()
+        else:
+            keys = sorted(candidates, key=self._positions.__getitem__)
+        return [
+            key
+            for key in keys
+            if all(
+                _matches(self._rows[key].get(field_name), equality_values, comparisons)
+                for field_name, equality_values, comparisons in conditions
+            )
+        ]
+
+    @staticmethod
+    def _to_condition(field: SnapshotField, value) -> Optional[tuple]:
+        """
+        :return: Equality values and comparisons (sign and value) of a filter, None if it cannot be evaluated in memory.
+        """
+        equality_values = []
+        comparisons = []
+        for value_in_list in value if isinstance(value, list) else [value]:
+            if isinstance(value_in_list, tuple):
+                if not field.allow_comparison_signs or len(value_in_list) != 2:
+                    return None
+                sign, value_in_list = value_in_list
+                if sign not in _operators:
+                    return None
+                comparisons.append((_operators[sign], value_in_list))
+            else:
+                equality_values.append(value_in_list)
+            if not _is_of_type(value_in_list, field.types):
+                return None
+        return equality_values, comparisons
+
+
+def _is_of_type(value, types: tuple) -> bool:
+    # bool is a subclass of int but values would not be equal
+    if isinstance(value, bool):
+        return bool in types
+    return isinstance(value, types)
+
+
+def _matches(row_value, equality_values: list, comparisons: list) -> bool:
+    """
+    A value matches if it equals any of the equality values or if it satisfies every comparison.
+    """
+    if row_value is None:
+        return False
+    if row_value in equality_values:
+        return True
+    if not comparisons:
+        return False
+    try:
+        return all(compare(row_value, value) for compare, value in comparisons)
+    except TypeError:
+        return False
+
+
+def _sort_key(value) -> tuple:
+    """
+    Missing values are considered as the lowest.
+    """
+    return value is not None, value
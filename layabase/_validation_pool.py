@@ -0,0 +1,176 @@
+import concurrent.futures
+import concurrent.futures.process
+import itertools
+import math
+import multiprocessing
+import os
+import threading
+import weakref
+from typing import Dict, List, Optional
+
+# Models that can be validated by worker processes, per key (inherited by forked worker processes)
+_models = weakref.WeakValueDictionary()
+_model_keys = itertools.count(1)
+
+
+def _validate_and_deserialize(
+    model_key: int, operation: str, documents: List[dict]
+) -> (Dict[int, dict], List[dict]):
+    """
+    Performed by a worker process.
+
+    :return: Validation errors per index within documents and deserialized documents (if there is no error).
+    """
+    model = _models[model_key]
+    if operation == "insert":
+        errors = model._validate_and_deserialize_inserts(documents)
+    elif operation == "insert_each":
+        # Valid documents are deserialized even if some others are not valid
+        return model._validate_and_deserialize_each_insert(documents), documents
+    else:
+        errors = model._validate_and_deserialize_updates(documents)
+    # Deserialized documents are not used in case of error
+    return errors, [] if errors else documents
+
+
+class ValidationPool:
+    """
+    Validate and deserialize huge lists of documents (Mongo post_many, put_many, post_each and import_file)
+    on a pool of processes,
+    so that validation of nested dictionary and list fields is not limited to a single core.
+
+    Documents are split into chunks validated in parallel, validation errors being merged back per index (in order).
+    Lists smaller than threshold are validated within the calling process.
+
+    Worker processes are forked (they inherit model definitions), this is not available on Windows.
+    Worker processes are started on first use (and restarted on next use if a model was linked since then).
+    """
+
+    def __init__(
+        self, max_workers: int = None, threshold: int = 1000, chunk_size: int = None
+    ):
+        """
+        :param max_workers: Number of worker processes. Default to the number of processors.
+        :param threshold: Minimum number of documents to be validated on worker processes. Default to 1000.
+        :param chunk_size: Number of documents validated at once by a worker process.
+        Default to splitting documents evenly between worker processes.
+        """
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise Exception("Validation pool requires processes to be forked.")
+        if max_workers is not None and max_workers < 1:
+            raise Exception(
+                "Maximum number of workers must be a strictly positive integer."
+            )
+        if threshold < 1:
+            raise Exception("Threshold must be a strictly positive integer.")
+        if chunk_size is not None and chunk_size < 1:
+            raise Exception("Chunk size must be a strictly positive integer.")
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.threshold = threshold
+        self.chunk_size = chunk_size
+        self._lock = threading.Lock()
+        self._executor: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        # Worker processes do not know models linked after they were started
+        self._outdated = False
+        self._validations = 0
+        self._documents = 0
+
+    def register(self, model) -> int:
+        """
+        Allow worker processes to validate documents of this model.
+
+        :param model: Model providing _validate_and_deserialize_inserts(documents) -> dict,
+        _validate_and_deserialize_each_insert(documents) -> dict
+        and _validate_and_deserialize_updates(documents) -> dict class methods.
+        :return: Key identifying this model.
+        """
+        key = next(_model_keys)
+        _models[key] = model
+        with self._lock:
+            if self._executor:
+                self._outdated = True
+        return key
+
+    def validate_and_deserialize(
+        self, model_key: int, operation: str, documents: List[dict]
+    ) -> Dict[int, dict]:
+        """
+        Validate documents on worker processes and deserialize them (in place) if they are all valid.
+
+        :param model_key: Key returned by register.
+        :param operation: insert, update or insert_each (valid documents are deserialized even if some others
+        are not valid).
+        :return: Validation errors per index within documents. Empty if no error occurred.
+        """
+        chunk_size = self.chunk_size or math.ceil(len(documents) / self.max_workers)
+        starts = range(0, len(documents), chunk_size)
+        executor = self._get_executor()
+        try:
+            futures = [
+                executor.submit(
+                    _validate_and_deserialize,
+                    model_key,
+                    operation,
+                    documents[start : start + chunk_size],
+                )
+                for start in starts
+            ]
+            results = [future.result() for future in futures]
+        except concurrent.futures.process.BrokenProcessPool:
+            # Worker processes will be restarted on next use
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            raise
+
+        errors = {}
+        deserialized_documents = []
+        for start, (chunk_errors, chunk_documents) in zip(starts, results):
+            errors.update(
+                {
+                    start + index: document_errors
+                    for index, document_errors in chunk_errors.items()
+                }
+            )
+            deserialized_documents.extend(chunk_documents)
+
+        if not errors or operation == "insert_each":
+            for document, deserialized_document in zip(
+                documents, deserialized_documents
+            ):
+                document.clear()
+                document.update(deserialized_document)
+
+        self._validations += 1
+        self._documents += len(documents)
+        return errors
+
+    def _get_executor(self) -> concurrent.futures.ProcessPoolExecutor:
+        with self._lock:
+            if self._outdated:
+                # Pending validations are still performed by previous worker processes
+                self._executor.shutdown(wait=False)
+                self._executor = None
+                self._outdated = False
+            if not self._executor:
+                self._executor = concurrent.futures.ProcessPoolExecutor(
+                    self.max_workers, mp_context=multiprocessing.get_context("fork")
+                )
+            return self._executor
+
+    def metrics(self) -> Dict[str, int]:
+        """
+        :return: Number of validations performed on worker processes (validations)
+        and number of documents validated by them (documents).
+        """
+        return {"validations": self._validations, "documents": self._documents}
+
+    def shutdown(self):
+        """
+        Stop worker processes (they will be started again on next use).
+        """
+        with self._lock:
+            if self._executor:
+                self._executor.shutdown()
+                self._executor = None
+                self._outdated = False
@@ -1,15 +1,24 @@
+import json
 import logging
-from typing import List, Dict
+from typing import List, Dict, Iterator, Optional, Tuple
 
 import pymongo
 
-from layabase._database_mongo import _CRUDModel
+from layabase._database_mongo import (
+    _CRUDModel,
+    _CounterAllocator,
+    _insert_many,
+    _to_update,
+    _upserted,
+)
 from layabase.mongo import Column, IndexType
 from layabase._exceptions import ValidationFailed
+from layabase._snapshot import SnapshotField
 
 logger = logging.getLogger(__name__)
 
 REVISION_COUNTER = ("revision", "shared")
+CHANGES_REVISION_LAG = 10
 
 
 class VersionedCRUDModel(_CRUDModel):
@@ -26,26 +35,73 @@ class VersionedCRUDModel(_CRUDModel):
         index_type=IndexType.Unique,
         description="Record is valid until this revision (excluded).",
     )
+    _revision_counter: tuple = REVISION_COUNTER
+    _revision_allocator: _CounterAllocator = None
+    _changes_revision_lag: int = CHANGES_REVISION_LAG
 
-    @classmethod
-    def update_indexes(cls, document: dict = None):
+    def __init_subclass__(cls, **kwargs):
         """
-        Drop all indexes and recreate them.
-        As advised in https://docs.mongodb.com/manual/tutorial/manage-indexes/#modify-an-index
+        :param shared_revision: False to use a revision counter dedicated to this collection.
+        Default to True (revision counter is shared by all versioned collections).
+        :param revision_block_size: Number of revisions reserved at once by this process.
+        Revisions would not reflect the order of changes if more than one process is writing to this collection.
+        Default to 1 (a single revision is reserved at a time).
+        :param changes_revision_lag: Number of most recent revisions that are not considered as settled by get_changes.
+        Default to 10.
         """
-        if cls._check_indexes(document):
-            logger.info("Updating indexes Versioning...")
-            cls.__collection__.drop_indexes()
-            condition = {"valid_until_revision": {"$lt": 0}}
-            cls._create_indexes(IndexType.Unique, document, condition)
-            cls._create_indexes(IndexType.Other, document, condition)
-            logger.info("Indexes updated.")
-            if cls.audit_model:
-                cls.audit_model.update_indexes(document)
+        shared_revision = kwargs.pop("shared_revision", True)
+        changes_revision_lag = kwargs.pop("changes_revision_lag", CHANGES_REVISION_LAG)
+        if not isinstance(changes_revision_lag, int) or changes_revision_lag < 0:
+            raise Exception("Changes revision lag must be a positive integer.")
+        cls._changes_revision_lag = changes_revision_lag
+        cls._revision_allocator = _CounterAllocator(
+            kwargs.pop("revision_block_size", 1)
+        )
+        super().__init_subclass__(**kwargs)
+        # Dedicated category, as the collection name category stores auto incremented fields counters
+        cls._revision_counter = (
+            REVISION_COUNTER
+            if shared_revision
+            else (REVISION_COUNTER[0], f"revision_{cls.__collection_name__}")
+        )
+
+    @classmethod
+    def _get_versioned_indexes(cls, document: dict) -> Dict[str, dict]:
+        indexes = super()._get_expected_indexes(document)
+        for declared_index in cls.__indexes__:
+            index = indexes[declared_index.name]
+            field_names = [field_name for field_name, _ in index["key"]]
+            # Previous versions of a document share the same values
+            if declared_index.unique and "valid_until_revision" not in field_names:
+                index["key"].append(("valid_until_revision", pymongo.ASCENDING))
+        return indexes
+
+    @classmethod
+    def _get_generated_index_names(cls) -> List[str]:
+        return super()._get_generated_index_names() + [f"ridx{cls.__collection_name__}"]
+
+    @classmethod
+    def _get_expected_indexes(cls, document: dict) -> Dict[str, dict]:
+        indexes = cls._get_versioned_indexes(document)
+        # Changes since a revision (all versions are indexed)
+        indexes[f"ridx{cls.__collection_name__}"] = {
+            "key": [
+                (cls.valid_until_revision.name, pymongo.ASCENDING),
+                (cls.valid_since_revision.name, pymongo.ASCENDING),
+            ]
+        }
+        return indexes
+
+    @classmethod
+    def _get_index_condition(cls) -> Optional[dict]:
+        # Only current documents are indexed (partial indexes are available since Mongo 3.2)
+        if cls._server_version < "3.2":
+            return None
+        return {"valid_until_revision": {"$lt": 0}}
 
     @classmethod
     def _insert_one(cls, document: dict) -> dict:
-        revision = cls._increment(*REVISION_COUNTER)
+        revision = cls._increment_revision()
         document[cls.valid_since_revision.name] = revision
         document[cls.valid_until_revision.name] = -1
         cls.__collection__.insert_one(document)
@@ -54,14 +110,17 @@ class VersionedCRUDModel(_CRUDModel):
         return document
 
     @classmethod
-    def _insert_many(cls, documents: List[dict]):
-        revision = cls._increment(*REVISION_COUNTER)
+    def _insert_many(
+        cls, documents: List[dict], ordered: bool = True
+    ) -> Dict[int, dict]:
+        revision = cls._increment_revision()
         for document in documents:
             document[cls.valid_since_revision.name] = revision
             document[cls.valid_until_revision.name] = -1
-        cls.__collection__.insert_many(documents)
-        if cls.audit_model:
+        write_errors = _insert_many(cls.__collection__, documents, ordered)
+        if cls.audit_model and len(write_errors) < len(documents):
             cls.audit_model.audit_add(revision)
+        return write_errors
 
     @classmethod
     def _update_one(cls, document: dict) -> (dict, dict):
@@ -73,7 +132,7 @@ class VersionedCRUDModel(_CRUDModel):
         if not previous_document:
             raise ValidationFailed(document_keys, message="The document to update could not be found.")
 
-        revision = cls._increment(*REVISION_COUNTER)
+        revision = cls._increment_revision()
 
         # Set previous version as expired (insert previous as expired)
         cls.__collection__.insert_one(
@@ -93,10 +152,12 @@ class VersionedCRUDModel(_CRUDModel):
         return previous_document, new_document
 
     @classmethod
-    def _update_many(cls, documents: List[dict]) -> (List[dict], List[dict]):
+    def _update_many(
+        cls, documents: List[dict], replace: bool = False
+    ) -> (List[dict], List[dict]):
         previous_documents = []
         new_documents = []
-        revision = cls._increment(*REVISION_COUNTER)
+        revision = cls._increment_revision()
         for document in documents:
             document_keys = cls._to_primary_keys_model(document)
             document_keys[cls.valid_until_revision.name] = -1
@@ -116,7 +177,7 @@ class VersionedCRUDModel(_CRUDModel):
             document[cls.valid_until_revision.name] = -1
             new_document = cls.__collection__.find_one_and_update(
                 document_keys,
-                {"$set": document},
+                _to_update(previous_document, document, replace),
                 return_document=pymongo.ReturnDocument.AFTER,
             )
 
@@ -127,6 +188,63 @@ class VersionedCRUDModel(_CRUDModel):
             cls.audit_model.audit_update(revision)
         return previous_documents, new_documents
 
+    @classmethod
+    def _upsert_one(cls, keys: dict, update: dict) -> (bool, dict):
+        revision = cls._increment_revision()
+        inserted, new_document = cls._upsert_version(keys, update, revision)
+        if cls.audit_model:
+            if inserted:
+                cls.audit_model.audit_add(revision)
+            else:
+                cls.audit_model.audit_update(revision)
+        return inserted, new_document
+
+    @classmethod
+    def _upsert_many(cls, upserts: List[Tuple[dict, dict]]) -> (List[bool], List[dict]):
+        inserted = []
+        new_documents = []
+        revision = cls._increment_revision()
+        for keys, update in upserts:
+            document_inserted, new_document = cls._upsert_version(
+                keys, update, revision
+            )
+            inserted.append(document_inserted)
+            new_documents.append(new_document)
+
+        if cls.audit_model:
+            # A single audit record per revision
+            if all(inserted):
+                cls.audit_model.audit_add(revision)
+            else:
+                cls.audit_model.audit_update(revision)
+        return inserted, new_documents
+
+    @classmethod
+    def _existing_primary_key_values(cls, keys_per_document: List[dict]) -> set:
+        return super()._existing_primary_key_values(
+            [{**keys, cls.valid_until_revision.name: -1} for keys in keys_per_document]
+        )
+
+    @classmethod
+    def _upsert_version(cls, keys: dict, update: dict, revision: int) -> (bool, dict):
+        """
+        Insert a new valid version or update the valid version (keeping previous one as expired).
+
+        :return: A tuple containing True if document was inserted (first item) and new version (second item).
+        """
+        keys = {**keys, cls.valid_until_revision.name: -1}
+        update = {
+            **update,
+            "$set": {**update["$set"], cls.valid_since_revision.name: revision},
+        }
+        previous_document = cls._find_one_and_upsert(keys, update)
+        if previous_document:
+            # Set previous version as expired (insert previous as expired)
+            cls.__collection__.insert_one(
+                {**previous_document, cls.valid_until_revision.name: revision}
+            )
+        return previous_document is None, _upserted(previous_document, keys, update)
+
     @classmethod
     def remove(cls, **filters) -> int:
         filters.pop(cls.valid_since_revision.name, None)
@@ -135,7 +253,7 @@ class VersionedCRUDModel(_CRUDModel):
 
     @classmethod
     def _delete_many(cls, filters: dict) -> int:
-        revision = cls._increment(*REVISION_COUNTER)
+        revision = cls._increment_revision()
         if cls.audit_model:
             cls.audit_model.audit_remove(revision)
         if filters == {"valid_until_revision": -1}:
@@ -144,6 +262,36 @@ class VersionedCRUDModel(_CRUDModel):
             filters, {"$set": {cls.valid_until_revision.name: revision}}
         ).modified_count
 
+    @classmethod
+    def remove_chunk(cls, chunk_size: int, **filters) -> int:
+        filters.pop(cls.valid_since_revision.name, None)
+        filters[cls.valid_until_revision.name] = -1
+        return super().remove_chunk(chunk_size, **filters)
+
+    @classmethod
+    def _delete_chunk(cls, filters: dict, chunk_size: int) -> int:
+        documents = list(
+            cls.__collection__.find(filters, projection={"_id": True}, limit=chunk_size)
+        )
+        nb_removed = 0
+        if documents:
+            # Every chunk is a new revision
+            revision = cls._increment_revision()
+            if cls.audit_model:
+                cls.audit_model.audit_remove(revision)
+            nb_removed = cls.__collection__.update_many(
+                {"_id": {"$in": [document["_id"] for document in documents]}},
+                {"$set": {cls.valid_until_revision.name: revision}},
+            ).modified_count
+        # Counters can only be reset once the last chunk was removed
+        if (
+            len(documents) < chunk_size
+            and filters == {"valid_until_revision": -1}
+            and cls.__collection__.find_one(filters, projection={"_id": True}) is None
+        ):
+            cls.reset_counters()
+        return nb_removed
+
     @classmethod
     def _get_revision(cls, filters: dict) -> int:
         # TODO Use an int Column validate + deserialize
@@ -199,10 +347,130 @@ class VersionedCRUDModel(_CRUDModel):
         filters[cls.valid_until_revision.name] = -1
         return super().get_all(**filters)
 
+    @classmethod
+    def iter_all(cls, batch_size: int, **filters) -> Iterator[List[dict]]:
+        """
+        Return all valid documents corresponding to query, batch by batch.
+        """
+        filters.pop(cls.valid_since_revision.name, None)
+        filters[cls.valid_until_revision.name] = -1
+        return super().iter_all(batch_size, **filters)
+
+    @classmethod
+    def iter_columns(cls, batch_size: int, **filters) -> Iterator[Dict[str, list]]:
+        """
+        Return field values of all valid documents corresponding to query, batch by batch.
+        """
+        filters.pop(cls.valid_since_revision.name, None)
+        filters[cls.valid_until_revision.name] = -1
+        return super().iter_columns(batch_size, **filters)
+
     @classmethod
     def get_history(cls, **filters) -> List[dict]:
         return super().get_all(**filters)
 
+    @classmethod
+    def _get_snapshot_fields(cls) -> Dict[str, SnapshotField]:
+        fields = super()._get_snapshot_fields()
+        # Snapshot only contains valid documents
+        for field in (cls.valid_since_revision, cls.valid_until_revision):
+            fields[field.name] = SnapshotField(
+                types=(), allow_comparison_signs=False, indexed=False
+            )
+        return fields
+
+    @classmethod
+    def get_changes(cls, **filters) -> dict:
+        """
+        Return documents that were inserted, updated or deleted since a revision (up to the current revision).
+
+        A write might reserve a revision and be performed after a more recent revision was written.
+        The returned revision is therefore the current revision minus a safety lag,
+        changes performed within the most recent revisions are provided again on next call.
+
+        :param filters: since_revision (mandatory) and optional filters on fields.
+        Documents leaving the filtered documents since the revision are considered as deleted.
+        :return: A dictionary containing inserted, updated (current version) and deleted (last version) documents,
+        and the revision to be provided as since_revision for the next call.
+        """
+        since_revision = filters.pop("since_revision", None)
+        if since_revision is None:
+            raise ValidationFailed(
+                filters, {"since_revision": ["Missing data for required field."]}
+            )
+        if not isinstance(since_revision, int) or since_revision < 0:
+            raise ValidationFailed(
+                filters, {"since_revision": ["Not a valid positive int."]}
+            )
+
+        filters.pop(cls.valid_since_revision.name, None)
+        filters.pop(cls.valid_until_revision.name, None)
+        errors = cls.validate_query(filters)
+        if errors:
+            raise ValidationFailed(filters, errors)
+
+        cls.deserialize_query(filters)
+
+        # Documents are retrieved as they were at this revision (changes performed while querying are ignored)
+        revision = cls.current_revision()
+
+        # Version (valid at the revision) of documents that changed since the revision
+        changed = cls.__collection__.find(
+            {
+                "$and": [
+                    {
+                        **filters,
+                        cls.valid_since_revision.name: {
+                            "$gt": since_revision,
+                            "$lte": revision,
+                        },
+                    },
+                    {
+                        "$or": [
+                            {cls.valid_until_revision.name: -1},
+                            {cls.valid_until_revision.name: {"$gt": revision}},
+                        ]
+                    },
+                ]
+            },
+            projection={"_id": False},
+        )
+        # Version (valid at since revision) of documents that changed since the revision
+        previous = cls.__collection__.find(
+            {
+                **filters,
+                cls.valid_until_revision.name: {
+                    "$gt": since_revision,
+                    "$lte": revision,
+                },
+                cls.valid_since_revision.name: {"$lte": since_revision},
+            },
+            projection={"_id": False},
+        )
+        previous = {cls._to_primary_key(document): document for document in previous}
+
+        inserted = []
+        updated = []
+        for document in changed:
+            if previous.pop(cls._to_primary_key(document), None):
+                updated.append(cls.serialize(document))
+            else:
+                inserted.append(cls.serialize(document))
+
+        return {
+            "inserted": inserted,
+            "updated": updated,
+            "deleted": [cls.serialize(document) for document in previous.values()],
+            # Revisions reserved by writes that are still being performed are not settled yet
+            "revision": max(since_revision, revision - cls._changes_revision_lag),
+        }
+
+    @classmethod
+    def _to_primary_key(cls, document: dict) -> str:
+        return json.dumps(
+            cls._to_primary_keys_model(document), sort_keys=True, default=str
+        )
+
     @classmethod
     def rollback_to(cls, **filters) -> int:
         revision = cls._get_revision(filters)
@@ -231,7 +499,7 @@ class VersionedCRUDModel(_CRUDModel):
         if errors:
             raise ValidationFailed({**filters, "revision": revision}, errors)
 
-        new_revision = cls._increment(*REVISION_COUNTER)
+        new_revision = cls._increment_revision()
 
         # Update currently valid as non valid anymore (new version since this validity)
         for expired_document in expired_documents:
@@ -278,6 +546,10 @@ class VersionedCRUDModel(_CRUDModel):
         """
         return {}  # No validation by default
 
+    @classmethod
+    def _increment_revision(cls) -> int:
+        return cls._revision_allocator.reserve(cls, *cls._revision_counter)[0]
+
     @classmethod
     def current_revision(cls) -> int:
-        return cls._get_counter(*REVISION_COUNTER)
+        return cls._get_counter(*cls._revision_counter)
@@ -1,6 +1,6 @@
 import enum
 import datetime
-from typing import Dict, List, Union
+from typing import Dict, List, Union, Tuple
 
 import pymongo.database
 import iso8601
@@ -1199,6 +1199,85 @@ class ListColumn(Column):
         return [self.list_item_column.example()]
 
 
+class Index:
+    """
+    Definition of a named Mongo index.
+    Declare indexes as a list within the __indexes__ collection property.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fields: List[Union[str, Tuple[str, Union[int, str]]]],
+        **kwargs,
+    ):
+        """
+        :param name: Name of the index. Should be unique within the collection.
+        :param fields: Indexed fields, in index order.
+        Each field is either a field name (ascending order) or a tuple with field name and direction
+        (pymongo.ASCENDING, pymongo.DESCENDING or any other pymongo index type).
+        Dot notation can be used to index a field within a dictionary field.
+
+        :param unique: If index should reject duplicate values.
+        Should be a boolean value. Default to False.
+        :param sparse: If index should only reference documents containing indexed fields.
+        Should be a boolean value. Default to False.
+        :param partial_filter: Only index documents matching this filter (Mongo 3.2+).
+        Should be a dictionary. Default to None (every document is indexed).
+        :param collation: Language specific rules for string comparison (Mongo 3.4+).
+        Should be a dictionary (with at least a locale). Default to None (simple binary comparison).
+        """
+        if not name:
+            raise Exception("Index name must be provided.")
+        if not fields:
+            raise Exception(f"{name} index must contain at least one field.")
+        self.name = name
+        self.fields: List[Tuple[str, Union[int, str]]] = [
+            (field, pymongo.ASCENDING) if isinstance(field, str) else tuple(field)
+            for field in fields
+        ]
+        self.unique: bool = bool(kwargs.pop("unique", False))
+        self.sparse: bool = bool(kwargs.pop("sparse", False))
+        self.partial_filter: dict = kwargs.pop("partial_filter", None)
+        self.collation: dict = kwargs.pop("collation", None)
+
+    def __str__(self):
+        return self.name
+
+    def check_fields(self, fields: List[Column]):
+        """
+        Ensure that indexed fields are known.
+
+        :param fields: Known fields.
+        """
+        fields = {field.name: field for field in fields}
+        for field_name, _ in self.fields:
+            field = fields.get(field_name.split(".", maxsplit=1)[0])
+            if not field:
+                raise Exception(
+                    f"{self.name} index refers to an unknown field: {field_name}."
+                )
+            if "." in field_name and field.field_type not in (dict, list):
+                raise Exception(
+                    f"{self.name} index refers to a sub field of {field.name}, which is not a dictionary or a list."
+                )
+
+    def description(self) -> dict:
+        """
+        :return: Index key and options as expected by pymongo create_index.
+        """
+        index = {"key": list(self.fields)}
+        if self.unique:
+            index["unique"] = True
+        if self.sparse:
+            index["sparse"] = True
+        if self.partial_filter:
+            index["partialFilterExpression"] = self.partial_filter
+        if self.collation:
+            index["collation"] = self.collation
+        return index
+
+
 def link(controller: CRUDController, base: pymongo.database.Database):
     """
     Link controller related collection to provided database.
@@ -1209,10 +1288,16 @@ def link(controller: CRUDController, base: pymongo.database.Database):
         import layabase._versioning_mongo
 
         crud_model = layabase._versioning_mongo.VersionedCRUDModel
+        crud_model_parameters = {
+            "shared_revision": controller.shared_revision,
+            "revision_block_size": controller.revision_block_size,
+            "changes_revision_lag": controller.changes_revision_lag,
+        }
     else:
         from layabase._database_mongo import _CRUDModel
 
         crud_model = _CRUDModel
+        crud_model_parameters = {}
 
     class ControllerModel(
         controller.table_or_collection,
@@ -1222,6 +1307,9 @@ def link(controller: CRUDController, base: pymongo.database.Database):
         skip_unknown_fields=controller.skip_unknown_fields,
         skip_update_indexes=controller.skip_update_indexes,
         skip_log_for_unknown_fields=controller.skip_log_for_unknown_fields,
+        counter_block_size=controller.counter_block_size,
+        validation_pool=controller.validation_pool,
+        **crud_model_parameters,
     ):
         pass
 
@@ -1235,6 +1323,8 @@ def link(controller: CRUDController, base: pymongo.database.Database):
             model=ControllerModel,
             base=base,
             retrieve_user=controller.retrieve_user,
+            audit_writer=controller.audit_writer,
+            partition_audit_by_month=controller.partition_audit_by_month,
         )
 
     controller._model_description_dictionary = ControllerModel.description_dictionary()
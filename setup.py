@@ -27,6 +27,10 @@ extra_requirements = {
         "SQLAlchemy==1.*",
         "marshmallow_sqlalchemy==0.23.*",
     ],
+    # Used to import and export parquet files
+    "parquet": ["pyarrow==3.*"],
+    # Used to retrieve query results as Arrow tables or pandas DataFrames
+    "dataframe": ["pyarrow==3.*", "pandas==1.*"],
 }
 
 # Add all extra requirements to testing
@@ -0,0 +1,229 @@
+import threading
+import time
+
+import pytest
+import sqlalchemy
+
+import layabase
+import layabase._audit_writer
+import layabase.mongo
+
+
+@pytest.fixture
+def audit_writer():
+    writer = layabase.AuditWriter(batch_size=2, flush_interval=0.05)
+    yield writer
+    writer.close()
+
+
+@pytest.fixture
+def mongo_controller(audit_writer) -> layabase.CRUDController:
+    class TestCollection:
+        __collection_name__ = "test"
+
+        key = layabase.mongo.Column(str, is_primary_key=True)
+        value = layabase.mongo.Column(int)
+
+    controller = layabase.CRUDController(
+        TestCollection, audit=True, audit_writer=audit_writer
+    )
+    layabase.load("mongomock", [controller])
+    return controller
+
+
+@pytest.fixture
+def sql_controller(audit_writer) -> layabase.CRUDController:
+    class TestTable:
+        __tablename__ = "test"
+
+        key = sqlalchemy.Column(sqlalchemy.String, primary_key=True)
+        value = sqlalchemy.Column(sqlalchemy.Integer)
+
+    controller = layabase.CRUDController(
+        TestTable, audit=True, audit_writer=audit_writer
+    )
+    layabase.load("sqlite:///:memory:", [controller])
+    return controller
+
+
+def _audit_actions(controller: layabase.CRUDController) -> list:
+    return [(audit["audit_action"], audit["key"]) for audit in controller.get_audit({})]
+
+
+def test_invalid_batch_size():
+    with pytest.raises(Exception) as exception_info:
+        layabase.AuditWriter(batch_size=0)
+    assert (
+        str(exception_info.value) == "Batch size must be a strictly positive integer."
+    )
+
+
+def test_invalid_flush_interval():
+    with pytest.raises(Exception) as exception_info:
+        layabase.AuditWriter(flush_interval=0)
+    assert str(exception_info.value) == "Flush interval must be strictly positive."
+
+
+def test_mongo_audit_is_written_on_flush(
+    mongo_controller: layabase.CRUDController, audit_writer: layabase.AuditWriter
+):
+    mongo_controller.post_many([{"key": "1", "value": 1}, {"key": "2", "value": 2}])
+    mongo_controller.put({"key": "1", "value": 3})
+    audit_writer.flush()
+    assert audit_writer.metrics()["queue_depth"] == 0
+    assert audit_writer.metrics()["written"] == 3
+    audits = mongo_controller.get_audit({})
+    assert [(audit["audit_action"], audit["revision"]) for audit in audits] == [
+        ("Insert", 1),
+        ("Insert", 2),
+        ("Update", 3),
+    ]
+
+
+def test_mongo_queued_audit_is_written_before_removal(
+    mongo_controller: layabase.CRUDController, audit_writer: layabase.AuditWriter
+):
+    mongo_controller.post({"key": "1", "value": 1})
+    assert mongo_controller.delete({}) == 1
+    assert _audit_actions(mongo_controller) == [("Insert", "1"), ("Delete", "1")]
+    assert [audit["revision"] for audit in mongo_controller.get_audit({})] == [1, 2]
+
+
+def test_sql_audit_is_written_on_flush(
+    sql_controller: layabase.CRUDController, audit_writer: layabase.AuditWriter
+):
+    sql_controller.post_many([{"key": "1", "value": 1}, {"key": "2", "value": 2}])
+    sql_controller.put({"key": "1", "value": 3})
+    audit_writer.flush()
+    assert audit_writer.metrics()["written"] == 3
+    assert _audit_actions(sql_controller) == [("I", "1"), ("I", "2"), ("U", "1")]
+
+
+def test_sql_queued_audit_is_written_before_removal(
+    sql_controller: layabase.CRUDController,
+):
+    sql_controller.post({"key": "1", "value": 1})
+    assert sql_controller.delete({}) == 1
+    assert _audit_actions(sql_controller) == [("I", "1"), ("D", "1")]
+
+
+def test_sql_audit_is_not_queued_on_rollback(
+    sql_controller: layabase.CRUDController,
+    audit_writer: layabase.AuditWriter,
+    monkeypatch,
+):
+    sql_controller.post({"key": "1", "value": 1})
+    session = sql_controller._model._session
+
+    def commit():
+        raise Exception("Commit failed")
+
+    monkeypatch.setattr(session, "commit", commit)
+    with pytest.raises(Exception):
+        sql_controller.post({"key": "2", "value": 2})
+    monkeypatch.undo()
+    audit_writer.flush()
+    assert _audit_actions(sql_controller) == [("I", "1")]
+
+
+def test_audit_is_written_on_close(
+    mongo_controller: layabase.CRUDController, audit_writer: layabase.AuditWriter
+):
+    mongo_controller.post({"key": "1", "value": 1})
+    audit_writer.close()
+    assert _audit_actions(mongo_controller) == [("Insert", "1")]
+    # Once closed, audit is written synchronously
+    mongo_controller.post({"key": "2", "value": 2})
+    assert _audit_actions(mongo_controller) == [("Insert", "1"), ("Insert", "2")]
+
+
+def test_failed_write_is_retried(
+    mongo_controller: layabase.CRUDController,
+    audit_writer: layabase.AuditWriter,
+    monkeypatch,
+):
+    audit_model = mongo_controller._model.audit_model
+    original_write_audit = audit_model._write_audit
+    failures = []
+
+    def write_audit(records):
+        if not failures:
+            failures.append(records)
+            raise Exception("Database is down")
+        return original_write_audit(records)
+
+    monkeypatch.setattr(audit_model, "_write_audit", write_audit)
+    mongo_controller.post({"key": "1", "value": 1})
+    audit_writer.flush()
+    audit_writer.flush()
+    assert _audit_actions(mongo_controller) == [("Insert", "1")]
+    metrics = audit_writer.metrics()
+    assert metrics["failed_flushes"] == 1
+    assert metrics["written"] == 1
+    assert metrics["queue_depth"] == 0
+
+
+def test_full_queue_raises_after_timeout(mongo_controller: layabase.CRUDController):
+    writer = layabase.AuditWriter(max_queue_size=1, put_timeout=0.01)
+    audit_model = mongo_controller._model.audit_model
+    writing = threading.Event()
+    release = threading.Event()
+    original_write_audit = audit_model._write_audit
+
+    def write_audit(records):
+        writing.set()
+        release.wait()
+        return original_write_audit(records)
+
+    audit_model._write_audit = write_audit
+    try:
+        writer.write(audit_model, {"key": "1", "audit_action": "Insert"})
+        writing.wait()
+        # Background thread is busy writing first record, queue can only hold one more record
+        writer.write(audit_model, {"key": "2", "audit_action": "Insert"})
+        with pytest.raises(Exception) as exception_info:
+            writer.write(audit_model, {"key": "3", "audit_action": "Insert"})
+        assert (
+            str(exception_info.value)
+            == "Audit queue is full (1 records are waiting to be written)."
+        )
+    finally:
+        release.set()
+        writer.close()
+        del audit_model._write_audit
+
+
+def test_closed_writer_is_not_closed_again_at_exit(monkeypatch):
+    registered = []
+    monkeypatch.setattr(layabase._audit_writer.atexit, "register", registered.append)
+    monkeypatch.setattr(layabase._audit_writer.atexit, "unregister", registered.remove)
+    writer = layabase.AuditWriter()
+    assert registered == [writer.close]
+    writer.close()
+    assert registered == []
+
+
+def test_concurrent_flushes_write_records_once():
+    written = []
+
+    class AuditModel:
+        @classmethod
+        def _write_audit(cls, records):
+            # Leave time for other threads to write the same records
+            time.sleep(0.01)
+            written.extend(records)
+
+    writer = layabase.AuditWriter(batch_size=2)
+    try:
+        # Records queued by a process that has no running background thread (forked for example)
+        for key in range(10):
+            writer._queue.put((AuditModel, {"key": key}))
+        threads = [threading.Thread(target=writer.flush) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sorted(record["key"] for record in written) == list(range(10))
+        assert writer.metrics()["written"] == 10
+    finally:
+        writer.close()
@@ -0,0 +1,127 @@
+import os
+import time
+
+import pytest
+
+import layabase
+
+
+@pytest.mark.parametrize(
+    "create_cache",
+    [
+        lambda directory: layabase.MemoryCache(max_entries=2),
+        lambda directory: layabase.FileCache(directory, max_entries=2),
+    ],
+    ids=["memory", "file"],
+)
+def test_least_recently_used_is_evicted(create_cache, tmpdir):
+    cache = create_cache(str(tmpdir))
+    cache.set("1", 1)
+    time.sleep(0.01)
+    cache.set("2", 2)
+    time.sleep(0.01)
+    assert cache.get("1") == (True, 1)
+    time.sleep(0.01)
+    cache.set("3", 3)
+    assert cache.get("2") == (False, None)
+    assert cache.get("1") == (True, 1)
+    assert cache.get("3") == (True, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+@pytest.mark.parametrize(
+    "create_cache",
+    [
+        lambda directory: layabase.MemoryCache(max_size=30),
+        lambda directory: layabase.FileCache(directory, max_size=30),
+    ],
+    ids=["memory", "file"],
+)
+def test_memory_bound(create_cache, tmpdir):
+    cache = create_cache(str(tmpdir))
+    cache.set("too big", "x" * 100)
+    assert cache.get("too big") == (False, None)
+    cache.set("small", "x")
+    assert cache.get("small") == (True, "x")
+
+
+@pytest.mark.parametrize(
+    "create_cache",
+    [
+        lambda directory: layabase.MemoryCache(ttl=0.05),
+        lambda directory: layabase.FileCache(directory, ttl=0.05),
+    ],
+    ids=["memory", "file"],
+)
+def test_expired_entries_are_not_served(create_cache, tmpdir):
+    cache = create_cache(str(tmpdir))
+    cache.set("1", 1)
+    assert cache.get("1") == (True, 1)
+    time.sleep(0.06)
+    assert cache.get("1") == (False, None)
+    stats = cache.stats()
+    assert stats["expirations"] == 1
+    assert stats["entries"] == 0
+
+
+def test_file_cache_is_shared_between_instances(tmpdir):
+    first = layabase.FileCache(str(tmpdir))
+    second = layabase.FileCache(str(tmpdir))
+    first.set("1", [1])
+    assert second.get("1") == (True, [1])
+    second.clear()
+    assert first.get("1") == (False, None)
+
+
+def test_result_retrieved_before_a_clear_by_another_process_is_not_served(tmpdir):
+    worker = layabase.FileCache(str(tmpdir))
+    other_worker = layabase.FileCache(str(tmpdir))
+    # Query started by a worker
+    generation = worker.generation()
+    # Write (and clear) performed by another worker in the meantime
+    other_worker.clear()
+    worker.set("1", "stale", generation)
+    assert other_worker.get("1") == (False, None)
+    assert worker.get("1") == (False, None)
+    worker.set("1", "up to date", worker.generation())
+    assert other_worker.get("1") == (True, "up to date")
+
+
+def test_entries_of_a_previous_generation_are_not_served():
+    cache = layabase.MemoryCache()
+    generation = cache.generation()
+    cache.clear()
+    cache.set("1", 1, generation)
+    assert cache.get("1") == (False, None)
+    assert cache.stats()["entries"] == 0
+
+
+def test_file_cache_directory_is_only_listed_to_evict(tmpdir, monkeypatch):
+    cache = layabase.FileCache(str(tmpdir), max_entries=3)
+    listings = []
+    original_listdir = os.listdir
+
+    def listdir(path):
+        listings.append(path)
+        return original_listdir(path)
+
+    monkeypatch.setattr(os, "listdir", listdir)
+    for key in range(3):
+        cache.set(str(key), key)
+    assert listings == []
+    cache.set("3", 3)
+    assert len(listings) == 1
+    monkeypatch.undo()
+    assert cache.stats()["entries"] == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_query_cache_is_abstract():
+    with pytest.raises(TypeError):
+        layabase.QueryCache()
+
+
+def test_invalid_time_to_live():
+    with pytest.raises(Exception) as exception_info:
+        layabase.MemoryCache(ttl=0)
+    assert str(exception_info.value) == "Time to live must be strictly positive."
@@ -60,7 +60,9 @@ def app(controller: layabase.CRUDController):
 
     @namespace.route("/test/description")
     class TestDescriptionResource(flask_restx.Resource):
-        @namespace.marshal_with(controller.flask_restx.get_model_description_response_model)
+        @namespace.marshal_with(
+            controller.flask_restx.get_model_description_response_model
+        )
         def get(self):
             return {}
 
@@ -78,13 +80,16 @@ def app(controller: layabase.CRUDController):
 
 
 def test_query_get_parser(client):
-    response = client.get("/test_parsers?key=1&mandatory=2&optional=3&limit=4&offset=5")
+    response = client.get(
+        "/test_parsers?key=1&mandatory=2&optional=3&limit=4&offset=5&order_by=-key"
+    )
     assert response.json == {
         "key": ["1"],
         "limit": 4,
         "mandatory": [2],
         "offset": 5,
         "optional": ["3"],
+        "order_by": ["-key"],
     }
 
 
@@ -145,6 +150,13 @@ def test_open_api_definition(client):
                             "type": "integer",
                             "minimum": 0,
                         },
+                        {
+                            "name": "order_by",
+                            "in": "query",
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "collectionFormat": "multi",
+                        },
                         {
                             "name": "X-Fields",
                             "in": "header",
@@ -304,6 +316,13 @@ def test_open_api_definition(client):
                             "type": "integer",
                             "minimum": 0,
                         },
+                        {
+                            "name": "order_by",
+                            "in": "query",
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "collectionFormat": "multi",
+                        },
                     ],
                     "tags": ["Test"],
                 },
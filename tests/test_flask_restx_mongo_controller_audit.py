@@ -86,6 +86,7 @@ def test_query_get_parser(client):
         "limit": 1,
         "mandatory": [2],
         "offset": 0,
+        "order_by": None,
         "optional": ["3"],
     }
 
@@ -102,6 +103,7 @@ def test_query_get_audit_parser(client):
         "limit": 1,
         "mandatory": [2],
         "offset": 0,
+        "order_by": None,
         "optional": ["3"],
         "revision": [1],
     }
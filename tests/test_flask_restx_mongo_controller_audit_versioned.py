@@ -109,6 +109,7 @@ def test_get_versioned_audit_parser_fields(client):
         "audit_user": ["test"],
         "limit": 1,
         "offset": 0,
+        "order_by": None,
         "revision": [1],
     }
 
@@ -158,6 +159,13 @@ def test_open_api_definition(client):
                             "type": "integer",
                             "minimum": 0,
                         },
+                        {
+                            "name": "order_by",
+                            "in": "query",
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "collectionFormat": "multi",
+                        },
                         {
                             "name": "X-Fields",
                             "in": "header",
@@ -275,6 +283,13 @@ def test_open_api_definition(client):
                             "type": "integer",
                             "minimum": 0,
                         },
+                        {
+                            "name": "order_by",
+                            "in": "query",
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "collectionFormat": "multi",
+                        },
                         {
                             "name": "X-Fields",
                             "in": "header",
@@ -339,6 +354,13 @@ def test_open_api_definition(client):
                             "type": "integer",
                             "minimum": 0,
                         },
+                        {
+                            "name": "order_by",
+                            "in": "query",
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "collectionFormat": "multi",
+                        },
                         {
                             "name": "X-Fields",
                             "in": "header",
@@ -429,6 +451,13 @@ def test_open_api_definition(client):
                             "type": "integer",
                             "minimum": 0,
                         },
+                        {
+                            "name": "order_by",
+                            "in": "query",
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "collectionFormat": "multi",
+                        },
                     ],
                     "tags": ["Test"],
                 }
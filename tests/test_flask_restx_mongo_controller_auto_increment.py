@@ -172,6 +172,13 @@ def test_open_api_definition(client):
                             "type": "integer",
                             "minimum": 0,
                         },
+                        {
+                            "name": "order_by",
+                            "in": "query",
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "collectionFormat": "multi",
+                        },
                         {
                             "name": "X-Fields",
                             "in": "header",
@@ -96,6 +96,7 @@ def test_query_with_int_and_less_than_sign_in_int_column_returns_tuple(client):
         "int_value": ["(<ComparisonSigns.Lower: '<'>, 1)"],
         "limit": None,
         "offset": None,
+        "order_by": None,
     }
 
 
@@ -108,6 +109,7 @@ def test_query_with_int_and_greater_than_sign_in_int_column_returns_tuple(client
         "int_value": ["(<ComparisonSigns.Greater: '>'>, 1)"],
         "limit": None,
         "offset": None,
+        "order_by": None,
     }
 
 
@@ -120,6 +122,7 @@ def test_query_with_int_and_less_than_or_equal_sign_in_int_column_returns_tuple(
         "int_value": ["(<ComparisonSigns.LowerOrEqual: '<='>, 1)"],
         "limit": None,
         "offset": None,
+        "order_by": None,
     }
 
 
@@ -134,6 +137,7 @@ def test_query_with_int_and_greater_than_or_equal_sign_in_int_column_returns_tup
         "int_value": ["(<ComparisonSigns.GreaterOrEqual: '>='>, 1)"],
         "limit": None,
         "offset": None,
+        "order_by": None,
     }
 
 
@@ -146,6 +150,7 @@ def test_query_with_float_and_less_than_sign_in_float_column_returns_tuple(clien
         "int_value": None,
         "limit": None,
         "offset": None,
+        "order_by": None,
     }
 
 
@@ -158,6 +163,7 @@ def test_query_with_float_and_greater_than_sign_in_float_column_returns_tuple(cl
         "int_value": None,
         "limit": None,
         "offset": None,
+        "order_by": None,
     }
 
 
@@ -172,6 +178,7 @@ def test_query_with_float_and_less_than_or_equal_sign_in_float_column_returns_tu
         "int_value": None,
         "limit": None,
         "offset": None,
+        "order_by": None,
     }
 
 
@@ -186,6 +193,7 @@ def test_query_with_float_and_greater_than_or_equal_sign_in_float_column_returns
         "int_value": None,
         "limit": None,
         "offset": None,
+        "order_by": None,
     }
 
 
@@ -198,6 +206,7 @@ def test_query_with_date_and_less_than_sign_in_date_column_returns_tuple(client)
         "int_value": None,
         "limit": None,
         "offset": None,
+        "order_by": None,
     }
 
 
@@ -210,6 +219,7 @@ def test_query_with_date_and_greater_than_sign_in_date_column_returns_tuple(clie
         "int_value": None,
         "limit": None,
         "offset": None,
+        "order_by": None,
     }
 
 
@@ -226,6 +236,7 @@ def test_query_with_date_and_less_than_or_equal_sign_in_date_column_returns_tupl
         "int_value": None,
         "limit": None,
         "offset": None,
+        "order_by": None,
     }
 
 
@@ -242,6 +253,7 @@ def test_query_with_date_and_greater_than_or_equal_sign_in_date_column_returns_t
         "int_value": None,
         "limit": None,
         "offset": None,
+        "order_by": None,
     }
 
 
@@ -259,6 +271,7 @@ def test_query_with_datetime_and_less_than_sign_in_datetime_column_returns_tuple
         "int_value": None,
         "limit": None,
         "offset": None,
+        "order_by": None,
     }
 
 
@@ -276,6 +289,7 @@ def test_query_with_datetime_and_greater_than_sign_in_datetime_column_returns_tu
         "int_value": None,
         "limit": None,
         "offset": None,
+        "order_by": None,
     }
 
 
@@ -294,6 +308,7 @@ def test_query_with_datetime_and_less_than_or_equal_sign_in_datetime_column_retu
         "int_value": None,
         "limit": None,
         "offset": None,
+        "order_by": None,
     }
 
 
@@ -312,6 +327,7 @@ def test_query_with_datetime_and_greater_than_or_equal_sign_in_datetime_column_r
         "int_value": None,
         "limit": None,
         "offset": None,
+        "order_by": None,
     }
 
 
@@ -329,6 +345,7 @@ def test_query_with_int_range_using_comparison_signs_in_int_column_returns_list_
         ],
         "limit": None,
         "offset": None,
+        "order_by": None,
     }
 
 
@@ -346,6 +363,7 @@ def test_query_with_float_range_using_comparison_signs_in_float_column_returns_l
         "int_value": None,
         "limit": None,
         "offset": None,
+        "order_by": None,
     }
 
 
@@ -363,6 +381,7 @@ def test_query_with_date_range_using_comparison_signs_in_date_column_returns_lis
         "int_value": None,
         "limit": None,
         "offset": None,
+        "order_by": None,
     }
 
 
@@ -386,6 +405,7 @@ def test_query_with_datetime_range_using_comparison_signs_in_datetime_column_ret
         "int_value": None,
         "limit": None,
         "offset": None,
+        "order_by": None,
     }
 
 
@@ -404,6 +424,7 @@ def test_query_with_int_range_and_value_out_of_range_using_comparison_signs_in_i
         ],
         "limit": None,
         "offset": None,
+        "order_by": None,
     }
 
 
@@ -531,6 +552,13 @@ def test_open_api_definition(client):
                             "type": "integer",
                             "minimum": 0,
                         },
+                        {
+                            "name": "order_by",
+                            "in": "query",
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "collectionFormat": "multi",
+                        },
                         {
                             "name": "X-Fields",
                             "in": "header",
@@ -623,6 +651,13 @@ def test_open_api_definition(client):
                             "type": "integer",
                             "minimum": 0,
                         },
+                        {
+                            "name": "order_by",
+                            "in": "query",
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "collectionFormat": "multi",
+                        },
                     ],
                     "tags": ["Test"],
                 },
@@ -721,6 +756,7 @@ def test_query_get_parser_without_signs(client):
         "int_value": [15],
         "limit": 1,
         "offset": 0,
+        "order_by": None,
     }
 
 
@@ -753,6 +789,7 @@ def test_query_get_parser_with_signs(client):
         "int_value": ["(<ComparisonSigns.Lower: '<'>, 15)"],
         "limit": 1,
         "offset": 0,
+        "order_by": None,
     }
 
 
@@ -0,0 +1,123 @@
+import flask
+import flask_restx
+import pytest
+
+import layabase
+import layabase.mongo
+
+
+@pytest.fixture
+def controller() -> layabase.CRUDController:
+    class TestCollection:
+        __collection_name__ = "test"
+
+        key = layabase.mongo.Column(str, is_primary_key=True)
+        value = layabase.mongo.Column(int)
+
+    controller = layabase.CRUDController(TestCollection)
+    layabase.load("mongomock", [controller])
+    return controller
+
+
+@pytest.fixture
+def calls(controller: layabase.CRUDController, monkeypatch) -> list:
+    calls = []
+    original_get_all = controller._model.get_all
+
+    def get_all(**filters):
+        calls.append(filters)
+        return original_get_all(**filters)
+
+    monkeypatch.setattr(controller._model, "get_all", get_all)
+    return calls
+
+
+@pytest.fixture
+def client(controller: layabase.CRUDController):
+    application = flask.Flask(__name__)
+    application.testing = True
+    api = flask_restx.Api(application)
+    namespace = api.namespace("Test", path="/")
+    controller.flask_restx.init_models(namespace)
+
+    @namespace.route("/test")
+    class TestResource(flask_restx.Resource):
+        @namespace.expect(controller.flask_restx.query_get_parser)
+        @namespace.marshal_with(controller.flask_restx.get_response_model)
+        @namespace.response(304, "Not modified")
+        def get(self):
+            return controller.flask_restx.conditional_get(
+                controller.get, controller.flask_restx.query_get_parser.parse_args()
+            )
+
+    return application.test_client()
+
+
+def _values(response) -> list:
+    return [row["value"] for row in response.json]
+
+
+def test_unchanged_data_is_not_retrieved(
+    client, controller: layabase.CRUDController, calls: list
+):
+    controller.post({"key": "1", "value": 1})
+    response = client.get("/test")
+    assert response.status_code == 200
+    assert _values(response) == [1]
+    etag = response.headers["ETag"]
+
+    response = client.get("/test", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert not response.data
+    assert len(calls) == 1
+
+
+def test_write_changes_etag(client, controller: layabase.CRUDController, calls: list):
+    controller.post({"key": "1", "value": 1})
+    etag = client.get("/test").headers["ETag"]
+    controller.put({"key": "1", "value": 2})
+
+    response = client.get("/test", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert _values(response) == [2]
+    assert response.headers["ETag"] != etag
+
+    controller.delete({})
+    response = client.get("/test", headers={"If-None-Match": response.headers["ETag"]})
+    assert response.status_code == 200
+    assert response.json == []
+
+
+def test_etag_depends_on_query(client, controller: layabase.CRUDController):
+    controller.post_many([{"key": "1", "value": 1}, {"key": "2", "value": 2}])
+    etag = client.get("/test?key=1").headers["ETag"]
+    response = client.get("/test?key=2", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert _values(response) == [2]
+
+
+def test_weak_and_multiple_etags_are_matched(
+    client, controller: layabase.CRUDController
+):
+    controller.post({"key": "1", "value": 1})
+    etag = client.get("/test").headers["ETag"]
+    response = client.get("/test", headers={"If-None-Match": f'"other", W/{etag}'})
+    assert response.status_code == 304
+
+
+def test_etag_requires_a_controller():
+    class TestCollection:
+        __collection_name__ = "test"
+
+        key = layabase.mongo.Column(str, is_primary_key=True)
+
+    from layabase._flask_restx import ParsersAndModels
+
+    parsers_and_models = ParsersAndModels(TestCollection, False, False, True)
+    with pytest.raises(Exception) as exception_info:
+        parsers_and_models.conditional_get(lambda arguments: [], {})
+    assert (
+        str(exception_info.value)
+        == "Entity tags cannot be computed without a controller."
+    )
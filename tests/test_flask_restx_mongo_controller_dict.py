@@ -64,6 +64,7 @@ def test_query_get_parser_with_dict(client):
         "key": ["4"],
         "limit": 1,
         "offset": 0,
+        "order_by": None,
     }
 
 
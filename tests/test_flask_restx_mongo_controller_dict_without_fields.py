@@ -152,6 +152,13 @@ def test_open_api_definition(client):
                             "name": "offset",
                             "type": "integer",
                         },
+                        {
+                            "collectionFormat": "multi",
+                            "in": "query",
+                            "items": {"type": "string"},
+                            "name": "order_by",
+                            "type": "array",
+                        },
                         {
                             "description": "An optional " "fields mask",
                             "format": "mask",
@@ -239,6 +246,13 @@ def test_open_api_definition(client):
                             "name": "offset",
                             "type": "integer",
                         },
+                        {
+                            "collectionFormat": "multi",
+                            "in": "query",
+                            "items": {"type": "string"},
+                            "name": "order_by",
+                            "type": "array",
+                        },
                     ],
                     "responses": {"200": {"description": "Success"}},
                     "tags": ["Test"],
@@ -259,7 +273,7 @@ def test_query_get_parser_with_dict(client):
     response = client.get(
         "/test_parsers?dict_col.first_key=2&dict_col.second_key=3&key=4&limit=1&offset=0"
     )
-    assert response.json == {"key": ["4"], "limit": 1, "offset": 0}
+    assert response.json == {"key": ["4"], "limit": 1, "offset": 0, "order_by": None}
 
 
 def test_query_delete_parser_with_dict(client):
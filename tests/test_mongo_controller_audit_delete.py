@@ -0,0 +1,125 @@
+import mongomock
+import pytest
+
+import layabase
+import layabase.mongo
+import layabase._database_mongo
+from layabase.testing import mock_mongo_audit_datetime
+
+
+@pytest.fixture
+def controller() -> layabase.CRUDController:
+    class TestCollection:
+        __collection_name__ = "test"
+
+        key = layabase.mongo.Column(str, is_primary_key=True)
+        value = layabase.mongo.Column(int)
+
+    controller = layabase.CRUDController(
+        TestCollection, audit=True, retrieve_user=lambda: "test user"
+    )
+    layabase.load("mongomock", [controller])
+    controller.post_many([{"key": str(key), "value": key} for key in range(5)])
+    return controller
+
+
+@pytest.fixture
+def increments(monkeypatch, controller: layabase.CRUDController) -> list:
+    calls = []
+    audit_model = controller._model.audit_model
+    original_increment = audit_model._increment
+
+    def increment(*args):
+        calls.append(args)
+        return original_increment(*args)
+
+    monkeypatch.setattr(audit_model, "_increment", increment)
+    return calls
+
+
+@pytest.fixture
+def insertions(monkeypatch) -> list:
+    calls = []
+    original_insert_many = mongomock.collection.Collection.insert_many
+
+    def insert_many(collection, documents, *args, **kwargs):
+        documents = list(documents)
+        calls.append((collection.name, len(documents)))
+        return original_insert_many(collection, documents, *args, **kwargs)
+
+    monkeypatch.setattr(mongomock.collection.Collection, "insert_many", insert_many)
+    return calls
+
+
+def test_delete_audits_in_a_single_insertion(
+    controller: layabase.CRUDController,
+    increments: list,
+    insertions: list,
+    mock_mongo_audit_datetime,
+):
+    assert controller.delete({"key": ["1", "3"]}) == 2
+    assert increments == [("revision", "test", 2)]
+    assert insertions == [("audit_test", 2)]
+    assert controller.get({}) == [
+        {"key": "0", "value": 0},
+        {"key": "2", "value": 2},
+        {"key": "4", "value": 4},
+    ]
+    assert controller.get_audit({"audit_action": "Delete"}) == [
+        {
+            "audit_action": "Delete",
+            "audit_date_utc": "2018-10-11T15:05:05.663000",
+            "audit_user": "test user",
+            "key": "1",
+            "revision": 6,
+            "value": 1,
+        },
+        {
+            "audit_action": "Delete",
+            "audit_date_utc": "2018-10-11T15:05:05.663000",
+            "audit_user": "test user",
+            "key": "3",
+            "revision": 7,
+            "value": 3,
+        },
+    ]
+
+
+def test_delete_audits_by_batch(
+    controller: layabase.CRUDController,
+    increments: list,
+    insertions: list,
+    monkeypatch,
+):
+    monkeypatch.setattr(layabase._database_mongo, "REMOVAL_BATCH_SIZE", 2)
+    assert controller.delete({}) == 5
+    assert increments == [
+        ("revision", "test", 2),
+        ("revision", "test", 2),
+        ("revision", "test", 1),
+    ]
+    assert insertions == [("audit_test", 2), ("audit_test", 2), ("audit_test", 1)]
+    assert controller.get({}) == []
+    assert sorted(
+        audit["revision"] for audit in controller.get_audit({"audit_action": "Delete"})
+    ) == [6, 7, 8, 9, 10]
+
+
+def test_delete_nothing_does_not_audit(
+    controller: layabase.CRUDController, increments: list, insertions: list
+):
+    assert controller.delete({"key": "unknown"}) == 0
+    assert increments == []
+    assert insertions == []
+
+
+def test_failed_audit_does_not_delete(controller: layabase.CRUDController, monkeypatch):
+    def failing_insert_many(*args, **kwargs):
+        raise Exception("Audit failure")
+
+    monkeypatch.setattr(
+        controller._model.audit_model.__collection__, "insert_many", failing_insert_many
+    )
+    with pytest.raises(Exception):
+        controller.delete({"key": "1"})
+    assert controller.get({"key": "1"}) == [{"key": "1", "value": 1}]
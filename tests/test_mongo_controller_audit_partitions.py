@@ -0,0 +1,157 @@
+import datetime
+
+import pytest
+
+import layabase
+import layabase.mongo
+import layabase._audit_mongo
+
+
+class DateTimeModuleMock:
+    class DateTimeMock:
+        now = datetime.datetime(2020, 1, 15)
+
+        @classmethod
+        def utcnow(cls):
+            return cls.now
+
+    datetime = DateTimeMock
+
+
+@pytest.fixture
+def database(monkeypatch):
+    class TestCollection:
+        __collection_name__ = "test"
+
+        key = layabase.mongo.Column(str, is_primary_key=True)
+        value = layabase.mongo.Column(int)
+
+    controller = layabase.CRUDController(
+        TestCollection, audit=True, partition_audit_by_month=True
+    )
+    base = layabase.load("mongomock", [controller])
+    monkeypatch.setattr(layabase._audit_mongo, "datetime", DateTimeModuleMock)
+    return controller, base
+
+
+@pytest.fixture
+def controller(database) -> layabase.CRUDController:
+    return database[0]
+
+
+def _post_monthly(controller: layabase.CRUDController):
+    for month in (1, 2, 3):
+        DateTimeModuleMock.DateTimeMock.now = datetime.datetime(2020, month, 15)
+        controller.post({"key": str(month), "value": month})
+
+
+def _revisions(audits: list) -> list:
+    return [audit["revision"] for audit in audits]
+
+
+def test_audit_is_written_per_month(database):
+    controller, base = database
+    _post_monthly(controller)
+    controller.put({"key": "1", "value": 10})
+    assert "audit_test" not in base.list_collection_names()
+    assert [document["key"] for document in base["audit_test_202001"].find()] == ["1"]
+    assert [document["key"] for document in base["audit_test_202003"].find()] == [
+        "3",
+        "1",
+    ]
+    assert set(base["audit_test_202002"].index_information()) == {
+        "_id_",
+        "uidxaudit_test",
+        "audit_date_utc",
+        "audit_user",
+    }
+
+
+def test_audit_without_date_filter_queries_every_month(
+    controller: layabase.CRUDController,
+):
+    _post_monthly(controller)
+    assert _revisions(controller.get_audit({})) == [1, 2, 3]
+    assert _revisions(controller.get_audit({"offset": 1, "limit": 1})) == [2]
+    assert _revisions(controller.get_audit({"order_by": ["-revision"]})) == [3, 2, 1]
+    assert _revisions(
+        controller.get_audit({"order_by": ["-revision"], "offset": 1, "limit": 1})
+    ) == [2]
+
+
+def test_audit_date_range_is_routed_to_relevant_months(
+    controller: layabase.CRUDController, monkeypatch
+):
+    _post_monthly(controller)
+    queried = []
+    audit_model = controller._model.audit_model
+    original_queried_partitions = audit_model._get_queried_partition_names
+
+    def queried_partitions(filters):
+        partitions = original_queried_partitions(filters)
+        queried.append(partitions)
+        return partitions
+
+    monkeypatch.setattr(audit_model, "_get_queried_partition_names", queried_partitions)
+    assert _revisions(
+        controller.get_audit(
+            {
+                "audit_date_utc": [
+                    (
+                        layabase.ComparisonSigns.GreaterOrEqual,
+                        datetime.datetime(2020, 2, 1),
+                    )
+                ]
+            }
+        )
+    ) == [2, 3]
+    assert _revisions(
+        controller.get_audit(
+            {
+                "audit_date_utc": [
+                    (layabase.ComparisonSigns.Greater, datetime.datetime(2020, 1, 20)),
+                    (layabase.ComparisonSigns.Lower, datetime.datetime(2020, 2, 20)),
+                ]
+            }
+        )
+    ) == [2]
+    assert _revisions(
+        controller.get_audit({"audit_date_utc": datetime.datetime(2020, 3, 15)})
+    ) == [3]
+    assert queried == [
+        ["audit_test_202002", "audit_test_202003"],
+        ["audit_test_202001", "audit_test_202002"],
+        ["audit_test_202003"],
+    ]
+
+
+def test_audit_filtered_on_user(controller: layabase.CRUDController):
+    _post_monthly(controller)
+    assert _revisions(controller.get_audit({"audit_user": ""})) == [1, 2, 3]
+    assert controller.get_audit({"audit_user": "unknown"}) == []
+
+
+def test_removal_audit_is_written_in_current_month(database):
+    controller, base = database
+    _post_monthly(controller)
+    DateTimeModuleMock.DateTimeMock.now = datetime.datetime(2020, 4, 1)
+    assert controller.delete({}) == 3
+    assert base["audit_test_202004"].count_documents({"audit_action": 3}) == 3
+    assert _revisions(controller.get_audit({"audit_action": "Delete"})) == [4, 5, 6]
+
+
+def test_partitioned_audit_is_not_supported_with_history():
+    class TestCollection:
+        __collection_name__ = "test"
+
+        key = layabase.mongo.Column(str, is_primary_key=True)
+
+    controller = layabase.CRUDController(
+        TestCollection, audit=True, history=True, partition_audit_by_month=True
+    )
+    with pytest.raises(Exception) as exception_info:
+        layabase.load("mongomock", [controller])
+    assert (
+        str(exception_info.value)
+        == "Audit cannot be partitioned by month for versioned collections."
+    )
@@ -0,0 +1,122 @@
+import pytest
+
+import layabase
+import layabase.mongo
+
+
+@pytest.fixture
+def database():
+    class TestCollection:
+        __collection_name__ = "test"
+
+        key = layabase.mongo.Column(
+            int, is_primary_key=True, should_auto_increment=True
+        )
+        category = layabase.mongo.Column(str)
+        category_key = layabase.mongo.Column(
+            int,
+            should_auto_increment=True,
+            counter=lambda document: ("category_key", document.get("category")),
+        )
+
+    controller = layabase.CRUDController(TestCollection)
+    return controller, layabase.load("mongomock", [controller])
+
+
+@pytest.fixture
+def controller(database) -> layabase.CRUDController:
+    return database[0]
+
+
+@pytest.fixture
+def block_database():
+    class TestCollection:
+        __collection_name__ = "test"
+
+        key = layabase.mongo.Column(
+            int, is_primary_key=True, should_auto_increment=True
+        )
+
+    controller = layabase.CRUDController(TestCollection, counter_block_size=10)
+    return controller, layabase.load("mongomock", [controller])
+
+
+@pytest.fixture
+def increments(monkeypatch, request) -> list:
+    controller = request.getfixturevalue("controller")
+    calls = []
+    original_increment = controller._model._increment
+
+    def increment(*args):
+        calls.append(args)
+        return original_increment(*args)
+
+    monkeypatch.setattr(controller._model, "_increment", increment)
+    return calls
+
+
+def test_post_many_reserves_values_once_per_counter(
+    controller: layabase.CRUDController, increments: list
+):
+    assert controller.post_many(
+        [{"category": "A"}, {"category": "B"}, {"category": "A"}, {"category": "A"}]
+    ) == [
+        {"key": 1, "category": "A", "category_key": 1},
+        {"key": 2, "category": "B", "category_key": 1},
+        {"key": 3, "category": "A", "category_key": 2},
+        {"key": 4, "category": "A", "category_key": 3},
+    ]
+    assert increments == [
+        ("category_key", "A", 3),
+        ("category_key", "B", 1),
+        ("key", "test", 4),
+    ]
+    assert controller.post({"category": "B"}) == {
+        "key": 5,
+        "category": "B",
+        "category_key": 2,
+    }
+
+
+def test_post_many_failure_does_not_reserve_values(
+    controller: layabase.CRUDController, increments: list
+):
+    with pytest.raises(layabase.ValidationFailed):
+        controller.post_many([{"category": "A"}, {"category": "A", "key": "invalid"}])
+    assert increments == []
+
+
+def test_reset_counters_with_category(database):
+    controller, base = database
+    controller.post_many([{"category": "A"}, {"category": "A"}])
+    assert controller.delete({}) == 2
+    assert base["counters"].find_one({"_id": "test"})["key"]["counter"] == 0
+    assert controller.post({"category": "A"}) == {
+        "key": 1,
+        "category": "A",
+        "category_key": 3,
+    }
+
+
+def test_post_with_block_reserves_values_once(block_database):
+    controller, base = block_database
+    assert controller.post({}) == {"key": 1}
+    assert controller.post({}) == {"key": 2}
+    assert base["counters"].find_one({"_id": "test"})["key"]["counter"] == 10
+
+
+def test_post_many_with_block_uses_reserved_values(block_database):
+    controller, base = block_database
+    assert controller.post({}) == {"key": 1}
+    assert controller.post_many([{}, {}]) == [{"key": 2}, {"key": 3}]
+    # Remaining reserved values are not enough, a new block is reserved
+    assert controller.post_many([{} for _ in range(10)])[0] == {"key": 11}
+    assert base["counters"].find_one({"_id": "test"})["key"]["counter"] == 20
+
+
+def test_reset_counters_discards_reserved_block(block_database):
+    controller, base = block_database
+    controller.post_many([{}, {}])
+    assert controller.delete({}) == 2
+    assert controller.post({}) == {"key": 1}
+    assert base["counters"].find_one({"_id": "test"})["key"]["counter"] == 10
@@ -0,0 +1,174 @@
+import pytest
+
+import layabase
+import layabase.mongo
+
+
+@pytest.fixture
+def controller() -> layabase.CRUDController:
+    class TestCollection:
+        __collection_name__ = "test"
+
+        key = layabase.mongo.Column(str, is_primary_key=True)
+        value = layabase.mongo.Column(int, is_nullable=False)
+
+    controller = layabase.CRUDController(TestCollection, audit=True)
+    layabase.load("mongomock", [controller])
+    return controller
+
+
+def _values(controller: layabase.CRUDController) -> dict:
+    return {row["key"]: row["value"] for row in controller.get({})}
+
+
+def test_post_chunks(controller):
+    results = controller.post_chunks(
+        ({"key": str(key), "value": key} for key in range(5)), chunk_size=2
+    )
+    assert [(result["first_index"], result["size"]) for result in results] == [
+        (0, 2),
+        (2, 2),
+        (4, 1),
+    ]
+    assert [row["key"] for row in results[1]["inserted"]] == ["2", "3"]
+    assert _values(controller) == {str(key): key for key in range(5)}
+
+
+def test_post_chunks_all_or_nothing(controller):
+    documents = [{"key": str(key), "value": key} for key in range(5)]
+    documents[3] = {"key": "3"}
+    with pytest.raises(layabase.ValidationFailed) as exception_info:
+        controller.post_chunks(documents, chunk_size=2)
+    assert list(exception_info.value.errors) == [3]
+    assert _values(controller) == {}
+
+
+def test_post_chunks_best_effort(controller):
+    documents = [{"key": str(key), "value": key} for key in range(5)]
+    documents[3] = {"key": "3"}
+    results = controller.post_chunks(documents, chunk_size=2, best_effort=True)
+    assert "error" not in results[0]
+    assert list(results[1]["error"].errors) == [3]
+    assert "inserted" not in results[1]
+    assert "error" not in results[2]
+    assert _values(controller) == {"0": 0, "1": 1, "4": 4}
+
+
+def test_put_chunks(controller):
+    controller.post_many([{"key": str(key), "value": key} for key in range(3)])
+    results = controller.put_chunks(
+        [{"key": str(key), "value": key * 10} for key in range(3)], chunk_size=2
+    )
+    assert [row["value"] for row in results[0]["previous"]] == [0, 1]
+    assert [row["value"] for row in results[0]["updated"]] == [0, 10]
+    assert _values(controller) == {"0": 0, "1": 10, "2": 20}
+
+
+def test_put_chunks_all_or_nothing(controller):
+    controller.post_many([{"key": str(key), "value": key} for key in range(3)])
+    with pytest.raises(layabase.ValidationFailed) as exception_info:
+        controller.put_chunks(
+            [
+                {"key": "0", "value": 10},
+                {"key": "1", "value": 11},
+                {"key": "unknown", "value": 12},
+            ],
+            chunk_size=2,
+        )
+    assert exception_info.value.errors == {
+        2: {"": ["The document to update could not be found."]}
+    }
+    assert _values(controller) == {"0": 0, "1": 1, "2": 2}
+
+
+def test_put_chunks_restores_full_documents():
+    class TestCollection:
+        __collection_name__ = "test"
+
+        key = layabase.mongo.Column(str, is_primary_key=True)
+        value = layabase.mongo.Column(int)
+        nested = layabase.mongo.DictColumn(
+            fields={
+                "first": layabase.mongo.Column(int),
+                "second": layabase.mongo.Column(int),
+            }
+        )
+
+    controller = layabase.CRUDController(TestCollection)
+    layabase.load("mongomock", [controller])
+    controller.post_many([{"key": "a", "nested": {"first": 1}}, {"key": "b"}])
+    stored = _stored_documents(controller)
+    with pytest.raises(layabase.ValidationFailed) as exception_info:
+        controller.put_chunks(
+            [
+                {"key": "a", "value": 5, "nested": {"second": 2}},
+                {"key": "b", "value": 6},
+                {"key": "unknown", "value": 7},
+            ],
+            chunk_size=2,
+        )
+    assert exception_info.value.errors == {
+        2: {"": ["The document to update could not be found."]}
+    }
+    assert _stored_documents(controller) == stored
+
+
+def _stored_documents(controller: layabase.CRUDController) -> list:
+    return [
+        {
+            field: value
+            for field, value in document.items()
+            if field not in ("valid_since_revision", "valid_until_revision")
+        }
+        for document in controller._model.__collection__.find(
+            {"key": {"$in": ["a", "b"]}}, projection={"_id": False}
+        ).sort("key")
+    ]
+
+
+def test_put_chunks_best_effort(controller):
+    controller.post_many([{"key": str(key), "value": key} for key in range(3)])
+    results = controller.put_chunks(
+        [
+            {"key": "0", "value": 10},
+            {"key": "unknown", "value": 11},
+            {"key": "2", "value": 12},
+        ],
+        chunk_size=1,
+        best_effort=True,
+    )
+    assert [("error" in result) for result in results] == [False, True, False]
+    assert _values(controller) == {"0": 10, "1": 1, "2": 12}
+
+
+def test_invalid_chunks(controller):
+    with pytest.raises(Exception) as exception_info:
+        controller.post_chunks([{"key": "1", "value": 1}], chunk_size=0)
+    assert (
+        str(exception_info.value) == "Chunk size must be a strictly positive integer."
+    )
+    with pytest.raises(layabase.ValidationFailed) as exception_info:
+        controller.post_chunks([])
+    assert exception_info.value.errors == {"": ["No data provided."]}
+    with pytest.raises(layabase.ValidationFailed) as exception_info:
+        controller.put_chunks({"key": "1"})
+    assert exception_info.value.errors == {"": ["Must be a list of dictionaries."]}
+
+
+def test_primary_key_is_required_to_compensate():
+    class TestCollection:
+        __collection_name__ = "test"
+
+        value = layabase.mongo.Column(int)
+
+    controller = layabase.CRUDController(TestCollection)
+    layabase.load("mongomock", [controller])
+    with pytest.raises(Exception) as exception_info:
+        controller.post_chunks([{"value": 1}])
+    assert (
+        str(exception_info.value)
+        == "Primary key is required to remove inserted chunks."
+    )
+    assert controller.post_chunks([{"value": 1}], best_effort=True)[0]["inserted"] == [
+        {"value": 1}
+    ]
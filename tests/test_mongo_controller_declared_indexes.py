@@ -0,0 +1,177 @@
+import mongomock
+import pymongo
+import pytest
+
+import layabase
+import layabase.mongo
+import layabase._database_mongo
+
+
+@pytest.fixture
+def database():
+    class TestCollection:
+        __collection_name__ = "test"
+        __indexes__ = [
+            layabase.mongo.Index(
+                "by_name_and_date",
+                ["name", ("date", pymongo.DESCENDING)],
+                unique=True,
+            ),
+            layabase.mongo.Index(
+                "by_city", ["address.city"], sparse=True, collation={"locale": "fr"}
+            ),
+        ]
+
+        key = layabase.mongo.Column(str, is_primary_key=True)
+        name = layabase.mongo.Column(str)
+        date = layabase.mongo.Column(str)
+        address = layabase.mongo.DictColumn(fields={"city": layabase.mongo.Column(str)})
+
+    controller = layabase.CRUDController(TestCollection, audit=True)
+    return controller, layabase.load("mongomock", [controller])
+
+
+def _index_keys(collection) -> dict:
+    return {
+        name: index["key"]
+        for name, index in collection.index_information().items()
+        if name != "_id_"
+    }
+
+
+def test_declared_indexes_are_created(database):
+    controller, base = database
+    assert _index_keys(base["test"]) == {
+        "uidxtest": [("key", 1)],
+        "by_name_and_date": [("name", 1), ("date", -1)],
+        "by_city": [("address.city", 1)],
+    }
+    indexes = base["test"].index_information()
+    assert indexes["by_name_and_date"]["unique"]
+    assert indexes["by_city"]["sparse"]
+
+
+def test_declared_indexes_are_not_created_on_audit(database):
+    controller, base = database
+    assert _index_keys(base["audit_test"]) == {
+        "uidxaudit_test": [("key", 1), ("revision", 1)],
+        "audit_date_utc": [("audit_date_utc", 1)],
+        "audit_user": [("audit_user", 1)],
+    }
+
+
+def test_declared_unique_index_is_enforced(database):
+    controller, base = database
+    controller.post({"key": "1", "name": "first", "date": "2020"})
+    with pytest.raises(layabase.ValidationFailed):
+        controller.post({"key": "2", "name": "first", "date": "2020"})
+    controller.post({"key": "2", "name": "first", "date": "2021"})
+
+
+def test_declared_index_options_are_provided(database, monkeypatch):
+    controller, base = database
+    created = {}
+    original_create_index = mongomock.collection.Collection.create_index
+
+    def create_index(collection, keys, **kwargs):
+        created[kwargs["name"]] = kwargs
+        return original_create_index(collection, keys, **kwargs)
+
+    monkeypatch.setattr(mongomock.collection.Collection, "create_index", create_index)
+    base["test"].drop_indexes()
+    base["index_synchronization"].delete_many({})
+    controller._model.update_indexes()
+    assert created["by_city"] == {
+        "name": "by_city",
+        "sparse": True,
+        "collation": {"locale": "fr"},
+    }
+    assert created["by_name_and_date"] == {"name": "by_name_and_date", "unique": True}
+
+
+def test_versioned_declared_unique_index_contains_revision(monkeypatch):
+    class TestCollection:
+        __collection_name__ = "test"
+        __indexes__ = [
+            layabase.mongo.Index("by_name", ["name"], unique=True),
+            layabase.mongo.Index(
+                "by_value", ["value"], partial_filter={"value": {"$exists": True}}
+            ),
+        ]
+
+        key = layabase.mongo.Column(str, is_primary_key=True)
+        name = layabase.mongo.Column(str)
+        value = layabase.mongo.Column(int)
+
+    controller = layabase.CRUDController(TestCollection, history=True)
+    monkeypatch.setattr(
+        mongomock.MongoClient, "server_info", lambda *args: {"version": "3.2.0"}
+    )
+    monkeypatch.setattr(layabase._database_mongo, "_server_versions", {})
+    layabase.load("mongomock", [controller])
+    indexes = controller._model._get_expected_indexes(None)
+    assert indexes["by_name"] == {
+        "key": [("name", 1), ("valid_until_revision", 1)],
+        "unique": True,
+        "partialFilterExpression": {"valid_until_revision": {"$lt": 0}},
+    }
+    assert indexes["by_value"] == {
+        "key": [("value", 1)],
+        "partialFilterExpression": {
+            "value": {"$exists": True},
+            "valid_until_revision": {"$lt": 0},
+        },
+    }
+    controller.post({"key": "1", "name": "first"})
+    # Previous version of the document is still stored
+    controller.put({"key": "1", "value": 2})
+    assert len(controller.get_history({})) == 2
+
+
+def test_declared_index_with_unknown_field():
+    class TestCollection:
+        __collection_name__ = "test"
+        __indexes__ = [layabase.mongo.Index("by_name", ["name"])]
+
+        key = layabase.mongo.Column(str)
+
+    with pytest.raises(Exception) as exception_info:
+        layabase.load("mongomock", [layabase.CRUDController(TestCollection)])
+    assert (
+        str(exception_info.value) == "by_name index refers to an unknown field: name."
+    )
+
+
+def test_declared_index_with_sub_field_of_a_non_dictionary_field():
+    class TestCollection:
+        __collection_name__ = "test"
+        __indexes__ = [layabase.mongo.Index("by_name", ["key.name"])]
+
+        key = layabase.mongo.Column(str)
+
+    with pytest.raises(Exception) as exception_info:
+        layabase.load("mongomock", [layabase.CRUDController(TestCollection)])
+    assert (
+        str(exception_info.value)
+        == "by_name index refers to a sub field of key, which is not a dictionary or a list."
+    )
+
+
+def test_declared_index_with_reserved_name():
+    class TestCollection:
+        __collection_name__ = "test"
+        __indexes__ = [layabase.mongo.Index("uidxtest", ["key"])]
+
+        key = layabase.mongo.Column(str)
+
+    with pytest.raises(Exception) as exception_info:
+        layabase.load("mongomock", [layabase.CRUDController(TestCollection)])
+    assert str(exception_info.value) == "uidxtest index is already defined on test."
+
+
+def test_declared_index_without_fields():
+    with pytest.raises(Exception) as exception_info:
+        layabase.mongo.Index("by_nothing", [])
+    assert (
+        str(exception_info.value) == "by_nothing index must contain at least one field."
+    )
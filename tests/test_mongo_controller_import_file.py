@@ -0,0 +1,178 @@
+import datetime
+import gzip
+
+import pytest
+
+import layabase
+import layabase.mongo
+
+
+@pytest.fixture
+def controller() -> layabase.CRUDController:
+    class TestCollection:
+        __collection_name__ = "test"
+
+        key = layabase.mongo.Column(str, is_primary_key=True)
+        value = layabase.mongo.Column(int, is_nullable=False)
+        date = layabase.mongo.Column(datetime.date)
+
+    controller = layabase.CRUDController(TestCollection, audit=True)
+    layabase.load("mongomock", [controller])
+    return controller
+
+
+def _rows(controller: layabase.CRUDController) -> list:
+    return sorted(controller.get({}), key=lambda row: row["key"])
+
+
+def test_import_csv(controller: layabase.CRUDController, tmp_path):
+    path = tmp_path / "records.csv"
+    path.write_text("key,value,date\n1,1,2020-01-02\n2,2,\n3,3,2020-01-04\n")
+    assert controller.import_file(str(path), chunk_size=2) == {
+        "inserted": 3,
+        "errors": {},
+    }
+    assert _rows(controller) == [
+        {"key": "1", "value": 1, "date": "2020-01-02"},
+        {"key": "2", "value": 2, "date": None},
+        {"key": "3", "value": 3, "date": "2020-01-04"},
+    ]
+    assert len(controller.get_audit({})) == 3
+
+
+def test_import_ndjson(controller: layabase.CRUDController, tmp_path):
+    path = tmp_path / "records.ndjson"
+    path.write_text(
+        '{"key": "1", "value": 1}\n\n{"key": "2", "value": 2, "date": "2020-01-03"}\n'
+    )
+    assert controller.import_file(str(path)) == {"inserted": 2, "errors": {}}
+    assert _rows(controller) == [
+        {"key": "1", "value": 1, "date": None},
+        {"key": "2", "value": 2, "date": "2020-01-03"},
+    ]
+
+
+def test_import_gzip_compressed_file(controller: layabase.CRUDController, tmp_path):
+    path = tmp_path / "records.jsonl.gz"
+    with gzip.open(path, "wt") as file:
+        file.write('{"key": "1", "value": 1}\n')
+    assert controller.import_file(str(path)) == {"inserted": 1, "errors": {}}
+    assert _rows(controller) == [{"key": "1", "value": 1, "date": None}]
+
+
+def test_errors_are_reported_per_line(controller: layabase.CRUDController, tmp_path):
+    path = tmp_path / "records.ndjson"
+    path.write_text(
+        "\n".join(
+            [
+                '{"key": "1"}',
+                '{"key": "2", "value": 2}',
+                "not json",
+                '{"key": "3"}',
+                '{"key": "4", "value": 4}',
+            ]
+        )
+    )
+    result = controller.import_file(str(path), chunk_size=2)
+    assert result == {
+        "inserted": 2,
+        "errors": {
+            1: {"value": ["Missing data for required field."]},
+            3: {"": ["Not a valid JSON: Expecting value: line 1 column 1 (char 0)"]},
+            4: {"value": ["Missing data for required field."]},
+        },
+    }
+    assert sorted(row["key"] for row in controller.get({})) == ["2", "4"]
+
+
+def test_duplicates_are_reported_per_line(
+    controller: layabase.CRUDController, tmp_path
+):
+    controller.post({"key": "1", "value": 1})
+    path = tmp_path / "records.csv"
+    path.write_text("key,value\n1,10\n2,2\n2,20\n")
+    assert controller.import_file(str(path)) == {
+        "inserted": 1,
+        "errors": {
+            2: {"": ["This document already exists."]},
+            4: {"": ["This document already exists."]},
+        },
+    }
+    assert {row["key"]: row["value"] for row in controller.get({})} == {
+        "1": 1,
+        "2": 2,
+    }
+
+
+def test_csv_errors_are_reported_per_line(
+    controller: layabase.CRUDController, tmp_path
+):
+    path = tmp_path / "records.csv"
+    path.write_text("key,value\n1,1\n2,not an int\n3,3\n")
+    result = controller.import_file(str(path))
+    assert result["inserted"] == 2
+    assert list(result["errors"]) == [3]
+    assert list(result["errors"][3]) == ["value"]
+
+
+def test_import_empty_file(controller: layabase.CRUDController, tmp_path):
+    path = tmp_path / "records.csv"
+    path.write_text("key,value\n")
+    assert controller.import_file(str(path)) == {"inserted": 0, "errors": {}}
+
+
+def test_file_format_can_be_provided(controller: layabase.CRUDController, tmp_path):
+    path = tmp_path / "records.txt"
+    path.write_text("key,value\n1,1\n")
+    assert controller.import_file(str(path), file_format="csv") == {
+        "inserted": 1,
+        "errors": {},
+    }
+
+
+def test_unknown_file_format(controller: layabase.CRUDController, tmp_path):
+    path = tmp_path / "records.txt"
+    path.write_text("key,value\n1,1\n")
+    with pytest.raises(Exception) as exception_info:
+        controller.import_file(str(path))
+    assert (
+        str(exception_info.value)
+        == "File format must be one of ('csv', 'ndjson', 'parquet')."
+    )
+
+
+def test_only_local_files_can_be_imported(controller: layabase.CRUDController):
+    with pytest.raises(Exception) as exception_info:
+        controller.import_file("https://test.invalid/records.csv")
+    assert str(exception_info.value) == "Only local files can be imported."
+
+
+def test_invalid_chunk_size(controller: layabase.CRUDController, tmp_path):
+    path = tmp_path / "records.csv"
+    path.write_text("key,value\n1,1\n")
+    with pytest.raises(Exception) as exception_info:
+        controller.import_file(str(path), chunk_size=0)
+    assert (
+        str(exception_info.value) == "Chunk size must be a strictly positive integer."
+    )
+
+
+def test_import_parquet(controller: layabase.CRUDController, tmp_path):
+    pyarrow = pytest.importorskip("pyarrow")
+    import pyarrow.parquet
+
+    path = tmp_path / "records.parquet"
+    pyarrow.parquet.write_table(
+        pyarrow.table(
+            {
+                "key": ["1", "2"],
+                "value": [1, None],
+                "date": [datetime.date(2020, 1, 2), None],
+            }
+        ),
+        str(path),
+    )
+    result = controller.import_file(str(path))
+    assert result["inserted"] == 1
+    assert result["errors"] == {2: {"value": ["Missing data for required field."]}}
+    assert _rows(controller) == [{"key": "1", "value": 1, "date": "2020-01-02"}]
@@ -0,0 +1,217 @@
+import datetime
+
+import mongomock
+import pymongo.errors
+import pytest
+
+import layabase
+import layabase.mongo
+
+
+def _controller(**fields) -> layabase.CRUDController:
+    fields.setdefault(
+        "key", layabase.mongo.Column(str, index_type=layabase.mongo.IndexType.Unique)
+    )
+    return layabase.CRUDController(
+        type("TestCollection", (), {"__collection_name__": "test", **fields})
+    )
+
+
+@pytest.fixture
+def base():
+    return layabase.load("mongomock", [_controller()])
+
+
+@pytest.fixture
+def list_indexes_calls(monkeypatch) -> list:
+    calls = []
+    original_list_indexes = mongomock.collection.Collection.list_indexes
+
+    def list_indexes(collection, *args, **kwargs):
+        calls.append(collection.name)
+        return original_list_indexes(collection, *args, **kwargs)
+
+    monkeypatch.setattr(mongomock.collection.Collection, "list_indexes", list_indexes)
+    return calls
+
+
+@pytest.fixture
+def dropped_indexes(monkeypatch) -> list:
+    dropped = []
+    original_drop_index = mongomock.collection.Collection.drop_index
+
+    def drop_index(collection, index_name, *args, **kwargs):
+        dropped.append(index_name)
+        return original_drop_index(collection, index_name, *args, **kwargs)
+
+    monkeypatch.setattr(mongomock.collection.Collection, "drop_index", drop_index)
+    return dropped
+
+
+def _indexes(base) -> dict:
+    return {
+        name: index["key"]
+        for name, index in base["test"].index_information().items()
+        if name != "_id_"
+    }
+
+
+def test_indexes_are_created(base):
+    assert _indexes(base) == {"uidxtest": [("key", 1)]}
+    synchronization = base["index_synchronization"].find_one({"_id": "test"})
+    assert synchronization["fingerprint"]
+    assert "locked_by" not in synchronization
+    assert "locked_until" not in synchronization
+
+
+def test_unchanged_indexes_are_not_checked(base, list_indexes_calls, dropped_indexes):
+    layabase.mongo.link(_controller(), base)
+    assert list_indexes_calls == []
+    assert dropped_indexes == []
+
+
+def test_new_index_does_not_drop_existing_ones(base, dropped_indexes):
+    layabase.mongo.link(
+        _controller(
+            other=layabase.mongo.Column(int, index_type=layabase.mongo.IndexType.Other)
+        ),
+        base,
+    )
+    assert _indexes(base) == {"uidxtest": [("key", 1)], "idxtest": [("other", 1)]}
+    assert dropped_indexes == []
+
+
+def test_modified_index_is_replaced(base, dropped_indexes):
+    layabase.mongo.link(
+        _controller(
+            other=layabase.mongo.Column(int, index_type=layabase.mongo.IndexType.Unique)
+        ),
+        base,
+    )
+    indexes = _indexes(base)
+    assert list(indexes.values()) == [[("key", 1), ("other", 1)]]
+    # Replacement is created (under another name) before dropping the replaced index
+    [index_name] = indexes
+    assert index_name.startswith("uidxtest_")
+    assert dropped_indexes == ["uidxtest"]
+
+
+def test_index_replaced_under_another_name_is_not_updated_again(base, dropped_indexes):
+    controller = _controller(
+        other=layabase.mongo.Column(int, index_type=layabase.mongo.IndexType.Unique)
+    )
+    layabase.mongo.link(controller, base)
+    layabase.mongo.link(controller, base)
+    assert dropped_indexes == ["uidxtest"]
+
+
+def test_replaced_index_is_kept_if_replacement_cannot_be_created(base, dropped_indexes):
+    base["test"].insert_many([{"key": "1", "other": 1}, {"key": "2", "other": 1}])
+    with pytest.raises(pymongo.errors.DuplicateKeyError):
+        layabase.mongo.link(
+            _controller(
+                other=layabase.mongo.Column(
+                    int, index_type=layabase.mongo.IndexType.Unique
+                ),
+                key=layabase.mongo.Column(str),
+            ),
+            base,
+        )
+    assert _indexes(base) == {"uidxtest": [("key", 1)]}
+    assert dropped_indexes == []
+
+
+def test_index_with_same_key_is_dropped_before_being_replaced(base, dropped_indexes):
+    layabase.mongo.link(
+        _controller(
+            key=layabase.mongo.Column(str, index_type=layabase.mongo.IndexType.Other)
+        ),
+        base,
+    )
+    assert _indexes(base) == {"idxtest": [("key", 1)]}
+    assert dropped_indexes == ["uidxtest"]
+
+
+def test_stale_index_is_dropped(base, dropped_indexes):
+    base["test"].create_index([("key", 1), ("other", -1)], name="stale")
+    # Indexes were modified outside of layabase, force a new synchronization
+    base["index_synchronization"].delete_many({})
+    layabase.mongo.link(_controller(), base)
+    assert _indexes(base) == {"uidxtest": [("key", 1)]}
+    assert dropped_indexes == ["stale"]
+
+
+def test_synchronization_is_skipped_while_locked(base, list_indexes_calls):
+    base["index_synchronization"].update_one(
+        {"_id": "test"},
+        {
+            "$set": {
+                "locked_by": "another process",
+                "locked_until": datetime.datetime.utcnow()
+                + datetime.timedelta(minutes=5),
+            }
+        },
+    )
+    layabase.mongo.link(
+        _controller(
+            other=layabase.mongo.Column(int, index_type=layabase.mongo.IndexType.Other)
+        ),
+        base,
+    )
+    assert list_indexes_calls == []
+    assert _indexes(base) == {"uidxtest": [("key", 1)]}
+    assert (
+        base["index_synchronization"].find_one({"_id": "test"})["locked_by"]
+        == "another process"
+    )
+
+
+def test_expired_lock_is_taken_over(base):
+    base["index_synchronization"].update_one(
+        {"_id": "test"},
+        {
+            "$set": {
+                "locked_by": "crashed process",
+                "locked_until": datetime.datetime.utcnow()
+                - datetime.timedelta(minutes=5),
+            }
+        },
+    )
+    layabase.mongo.link(
+        _controller(
+            other=layabase.mongo.Column(int, index_type=layabase.mongo.IndexType.Other)
+        ),
+        base,
+    )
+    assert _indexes(base) == {"uidxtest": [("key", 1)], "idxtest": [("other", 1)]}
+    assert "locked_by" not in base["index_synchronization"].find_one({"_id": "test"})
+
+
+def test_lock_is_released_on_failure(base):
+    base["test"].insert_many([{"key": "1", "other": 1}, {"key": "2", "other": 1}])
+    with pytest.raises(pymongo.errors.DuplicateKeyError):
+        layabase.mongo.link(
+            _controller(
+                other=layabase.mongo.Column(
+                    int, index_type=layabase.mongo.IndexType.Unique
+                ),
+                key=layabase.mongo.Column(str),
+            ),
+            base,
+        )
+    synchronization = base["index_synchronization"].find_one({"_id": "test"})
+    assert "locked_by" not in synchronization
+
+
+def test_index_synchronization_collection_name_is_reserved():
+    class TestCollection:
+        __collection_name__ = "index_synchronization"
+
+        key = layabase.mongo.Column(str)
+
+    with pytest.raises(Exception) as exception_info:
+        layabase.load("mongomock", [layabase.CRUDController(TestCollection)])
+    assert (
+        str(exception_info.value)
+        == "index_synchronization is a reserved collection name."
+    )
@@ -0,0 +1,124 @@
+import logging
+
+import pytest
+
+import layabase
+import layabase.mongo
+
+
+@pytest.fixture
+def controller() -> layabase.CRUDController:
+    class TestCollection:
+        __collection_name__ = "test"
+        __indexes__ = [layabase.mongo.Index("by_value_and_key", ["value", ("key", -1)])]
+
+        key = layabase.mongo.Column(str, is_primary_key=True)
+        value = layabase.mongo.Column(int)
+        dict_field = layabase.mongo.DictColumn(
+            fields={"first": layabase.mongo.Column(int)}
+        )
+
+    controller = layabase.CRUDController(TestCollection)
+    layabase.load("mongomock", [controller])
+    controller.post_many(
+        [
+            {"key": "a", "value": 2, "dict_field": {"first": 3}},
+            {"key": "b", "value": 1, "dict_field": {"first": 1}},
+            {"key": "c", "value": 2, "dict_field": {"first": 2}},
+        ]
+    )
+    return controller
+
+
+@pytest.fixture
+def versioned_controller() -> layabase.CRUDController:
+    class TestCollection:
+        __collection_name__ = "test"
+
+        key = layabase.mongo.Column(str, is_primary_key=True)
+        value = layabase.mongo.Column(int)
+
+    controller = layabase.CRUDController(TestCollection, history=True)
+    layabase.load("mongomock", [controller])
+    return controller
+
+
+def _keys(documents) -> list:
+    return [document["key"] for document in documents]
+
+
+def test_order_by_ascending(controller: layabase.CRUDController):
+    assert _keys(controller.get({"order_by": ["value", "+key"]})) == ["b", "a", "c"]
+
+
+def test_order_by_descending(controller: layabase.CRUDController):
+    assert _keys(controller.get({"order_by": ["-value", "-key"]})) == ["c", "a", "b"]
+
+
+def test_order_by_as_string(controller: layabase.CRUDController):
+    assert _keys(controller.get({"order_by": "-key"})) == ["c", "b", "a"]
+
+
+def test_order_by_dictionary_field(controller: layabase.CRUDController):
+    assert _keys(controller.get({"order_by": ["dict_field.first"]})) == [
+        "b",
+        "c",
+        "a",
+    ]
+
+
+def test_order_by_with_limit_and_offset(controller: layabase.CRUDController):
+    assert _keys(controller.get({"order_by": ["-key"], "limit": 1, "offset": 1})) == [
+        "b"
+    ]
+
+
+def test_order_by_with_filter(controller: layabase.CRUDController):
+    assert _keys(controller.get({"value": 2, "order_by": ["-key"]})) == ["c", "a"]
+
+
+def test_order_by_unknown_field(controller: layabase.CRUDController):
+    with pytest.raises(layabase.ValidationFailed) as exception_info:
+        controller.get({"order_by": ["-unknown", "key.sub"]})
+    assert exception_info.value.errors == {
+        "order_by": ["Unknown field unknown.", "Unknown field key.sub."]
+    }
+    assert exception_info.value.received_data == {"order_by": ["-unknown", "key.sub"]}
+
+
+def test_order_by_without_index_is_logged_once(
+    controller: layabase.CRUDController, caplog
+):
+    caplog.set_level(logging.WARNING)
+    controller.get({"order_by": ["value", "key"]})
+    controller.get({"order_by": ["value", "key"]})
+    assert [record.getMessage() for record in caplog.records] == [
+        "No index can be used to sort by [('value', 1), ('key', 1)]. "
+        "Sorting will be performed in memory (consider declaring an index)."
+    ]
+
+
+def test_order_by_with_index_is_not_logged(controller: layabase.CRUDController, caplog):
+    caplog.set_level(logging.WARNING)
+    controller.get({"order_by": ["value", "-key"]})
+    # Index can be traversed in reverse order
+    controller.get({"order_by": ["-value", "key"]})
+    controller.get({"order_by": ["-value"]})
+    controller.get({"order_by": ["key"]})
+    assert caplog.records == []
+
+
+def test_order_by_history(versioned_controller: layabase.CRUDController):
+    versioned_controller.post({"key": "a", "value": 1})
+    versioned_controller.put({"key": "a", "value": 2})
+    versioned_controller.post({"key": "b", "value": 3})
+    assert [
+        (document["key"], document["value"])
+        for document in versioned_controller.get_history(
+            {"order_by": ["-valid_since_revision"]}
+        )
+    ] == [("b", 3), ("a", 2), ("a", 1)]
+    assert [
+        document["value"]
+        for document in versioned_controller.get({"order_by": ["-value"], "limit": 1})
+    ] == [3]
@@ -0,0 +1,141 @@
+import threading
+
+import pytest
+
+import layabase
+import layabase.mongo
+
+
+@pytest.fixture
+def controller() -> layabase.CRUDController:
+    class TestCollection:
+        __collection_name__ = "test"
+
+        key = layabase.mongo.Column(str, is_primary_key=True)
+        value = layabase.mongo.Column(int, is_nullable=False)
+        counter = layabase.mongo.Column(int, should_auto_increment=True)
+
+    controller = layabase.CRUDController(
+        TestCollection,
+        audit=True,
+        post_coalescer=layabase.PostCoalescer(max_delay=1),
+    )
+    layabase.load("mongomock", [controller])
+    return controller
+
+
+def _post_concurrently(controller: layabase.CRUDController, documents: list) -> list:
+    """
+    :return: Result (or raised exception) per document.
+    """
+    results = [None] * len(documents)
+    all_started = threading.Barrier(len(documents))
+
+    def post(index: int):
+        all_started.wait()
+        try:
+            results[index] = controller.post(documents[index])
+        except Exception as e:
+            results[index] = e
+
+    threads = [
+        threading.Thread(target=post, args=(index,)) for index in range(len(documents))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_posts_are_inserted_at_once(controller: layabase.CRUDController):
+    coalescer = controller.post_coalescer
+    coalescer.max_documents = 10
+    results = _post_concurrently(
+        controller, [{"key": str(key), "value": key} for key in range(10)]
+    )
+    assert sorted(result["key"] for result in results) == [
+        str(key) for key in range(10)
+    ]
+    assert all(result["value"] == int(result["key"]) for result in results)
+    assert coalescer.metrics() == {"inserts": 1, "documents": 10}
+    assert len(controller.get({})) == 10
+    assert len(controller.get_audit({})) == 10
+
+
+def test_batches_are_limited_in_size(controller: layabase.CRUDController):
+    coalescer = controller.post_coalescer
+    coalescer.max_documents = 5
+    _post_concurrently(
+        controller, [{"key": str(key), "value": key} for key in range(10)]
+    )
+    assert coalescer.metrics() == {"inserts": 2, "documents": 10}
+    assert len(controller.get({})) == 10
+
+
+def test_each_caller_receives_its_own_validation_error(
+    controller: layabase.CRUDController,
+):
+    coalescer = controller.post_coalescer
+    coalescer.max_documents = 3
+    results = _post_concurrently(
+        controller,
+        [{"key": "1", "value": 1}, {"key": "2"}, {"key": "3", "value": 3}],
+    )
+    failures = [result for result in results if isinstance(result, Exception)]
+    assert len(failures) == 1
+    assert isinstance(failures[0], layabase.ValidationFailed)
+    assert failures[0].received_data == {"key": "2"}
+    assert sorted(row["key"] for row in controller.get({})) == ["1", "3"]
+
+
+def test_single_post_is_inserted_after_delay(controller: layabase.CRUDController):
+    coalescer = controller.post_coalescer
+    coalescer.max_delay = 0.01
+    assert controller.post({"key": "1", "value": 1})["key"] == "1"
+    with pytest.raises(layabase.ValidationFailed):
+        controller.post({"key": "2"})
+    assert coalescer.metrics() == {"inserts": 2, "documents": 2}
+
+
+def test_failure_is_raised_to_every_caller(
+    controller: layabase.CRUDController, monkeypatch
+):
+    controller.post_coalescer.max_documents = 2
+
+    def add_each(documents):
+        raise Exception("Database cannot be reached.")
+
+    monkeypatch.setattr(controller._model, "add_each", add_each)
+    results = _post_concurrently(
+        controller, [{"key": "1", "value": 1}, {"key": "2", "value": 2}]
+    )
+    assert [str(result) for result in results] == ["Database cannot be reached."] * 2
+
+
+def test_each_caller_receives_its_own_duplicate_error(
+    controller: layabase.CRUDController,
+):
+    coalescer = controller.post_coalescer
+    coalescer.max_documents = 3
+    controller.post({"key": "2", "value": 0})
+    results = _post_concurrently(
+        controller,
+        [{"key": "1", "value": 1}, {"key": "2", "value": 2}, {"key": "3", "value": 3}],
+    )
+    failures = [result for result in results if isinstance(result, Exception)]
+    assert len(failures) == 1
+    assert failures[0].errors == {"": ["This document already exists."]}
+    assert sorted(row["key"] for row in controller.get({})) == ["1", "2", "3"]
+    # Only inserted documents are audited
+    assert len(controller.get_audit({})) == 3
+
+
+def test_auto_incremented_values_are_reserved_at_once(
+    controller: layabase.CRUDController,
+):
+    controller.post_coalescer.max_documents = 3
+    results = _post_concurrently(
+        controller, [{"key": str(key), "value": key} for key in range(3)]
+    )
+    assert sorted(result["counter"] for result in results) == [1, 2, 3]
@@ -0,0 +1,107 @@
+import pytest
+
+import layabase
+import layabase.mongo
+
+
+class TestCollection:
+    __collection_name__ = "test"
+
+    key = layabase.mongo.Column(str, is_primary_key=True)
+    value = layabase.mongo.Column(int)
+
+
+@pytest.fixture
+def controllers():
+    """
+    Two controllers on the same collection, with their own cache (as in two different processes).
+    """
+    controllers = [
+        layabase.CRUDController(
+            TestCollection,
+            history=True,
+            cache=layabase.MemoryCache(),
+            validate_cache_with_revision=True,
+        )
+        for _ in range(2)
+    ]
+    layabase.load("mongomock", controllers)
+    return controllers
+
+
+@pytest.fixture
+def queries(controllers, monkeypatch) -> list:
+    queries = []
+    reader = controllers[1]
+    original_get_all = reader._model.get_all
+
+    def get_all(**filters):
+        queries.append(filters)
+        return original_get_all(**filters)
+
+    monkeypatch.setattr(reader._model, "get_all", get_all)
+    return queries
+
+
+def test_cache_is_served_while_revision_is_unchanged(controllers, queries: list):
+    writer, reader = controllers
+    writer.post({"key": "1", "value": 1})
+    assert reader.get({})[0]["value"] == 1
+    assert reader.get({})[0]["value"] == 1
+    assert len(queries) == 1
+    assert reader.cache.stats()["hits"] == 1
+
+
+def test_write_from_another_process_is_considered(controllers, queries: list):
+    writer, reader = controllers
+    writer.post({"key": "1", "value": 1})
+    assert reader.get({})[0]["value"] == 1
+    writer.put({"key": "1", "value": 2})
+    assert reader.get({})[0]["value"] == 2
+    writer.delete({})
+    assert reader.get({}) == []
+    assert len(queries) == 3
+
+
+def test_revision_is_read_from_counters(controllers, monkeypatch):
+    writer, reader = controllers
+    writer.post({"key": "1", "value": 1})
+    reader.get({})
+    counter_reads = []
+    original_find_one = reader._model.__counters__.find_one
+
+    def find_one(*args, **kwargs):
+        counter_reads.append(args)
+        return original_find_one(*args, **kwargs)
+
+    monkeypatch.setattr(reader._model.__counters__, "find_one", find_one)
+    reader.get({})
+    assert counter_reads == [({"_id": "shared"},)]
+
+
+def test_history_is_required():
+    with pytest.raises(Exception) as exception_info:
+        layabase.CRUDController(
+            TestCollection,
+            cache=layabase.MemoryCache(),
+            validate_cache_with_revision=True,
+        )
+    assert (
+        str(exception_info.value)
+        == "Cache can only be validated with revision when history is enabled."
+    )
+
+
+def test_revision_block_is_not_supported():
+    with pytest.raises(Exception) as exception_info:
+        layabase.CRUDController(
+            TestCollection,
+            history=True,
+            revision_block_size=10,
+            cache=layabase.MemoryCache(),
+            validate_cache_with_revision=True,
+        )
+    assert (
+        str(exception_info.value)
+        == "Cache cannot be validated with revision when revisions are reserved by block."
+    )
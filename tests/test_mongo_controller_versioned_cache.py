@@ -0,0 +1,90 @@
+import pytest
+
+import layabase
+import layabase.mongo
+
+
+@pytest.fixture(params=["memory", "file"])
+def cache(request, tmpdir) -> layabase.QueryCache:
+    if request.param == "memory":
+        return layabase.MemoryCache()
+    return layabase.FileCache(str(tmpdir.join("cache")))
+
+
+@pytest.fixture
+def controller(cache: layabase.QueryCache) -> layabase.CRUDController:
+    class TestCollection:
+        __collection_name__ = "test"
+
+        key = layabase.mongo.Column(str, is_primary_key=True)
+        value = layabase.mongo.Column(int)
+
+    controller = layabase.CRUDController(TestCollection, cache=cache, history=True)
+    layabase.load("mongomock", [controller])
+    return controller
+
+
+@pytest.fixture
+def queries(controller: layabase.CRUDController, monkeypatch) -> list:
+    queries = []
+    original_get_all = controller._model.get_all
+    original_get = controller._model.get
+
+    def get_all(**filters):
+        queries.append(("get_all", filters))
+        return original_get_all(**filters)
+
+    def get(**filters):
+        queries.append(("get", filters))
+        return original_get(**filters)
+
+    monkeypatch.setattr(controller._model, "get_all", get_all)
+    monkeypatch.setattr(controller._model, "get", get)
+    return queries
+
+
+def test_same_query_is_only_performed_once(
+    controller: layabase.CRUDController, cache: layabase.QueryCache, queries: list
+):
+    controller.post_many([{"key": "1", "value": 1}, {"key": "2", "value": 2}])
+    first = controller.get({"key": ["1", "2"], "value": None})
+    first.append("altered by caller")
+    assert controller.get({"key": ["2", "1"]}) == controller.get({"key": ["1", "2"]})
+    assert controller.get_one({"key": "1"}) == controller.get_one({"key": "1"})
+    assert [query for query, _ in queries] == ["get_all", "get"]
+    assert len(controller.get({"key": ["1", "2"]})) == 2
+    stats = cache.stats()
+    assert stats["hits"] == 4
+    assert stats["misses"] == 2
+    assert stats["entries"] == 2
+    assert stats["size"] > 0
+
+
+def test_writes_invalidate_cache(
+    controller: layabase.CRUDController, cache: layabase.QueryCache, queries: list
+):
+    controller.post({"key": "1", "value": 1})
+    assert controller.get({})[0]["value"] == 1
+    controller.put({"key": "1", "value": 2})
+    assert controller.get({})[0]["value"] == 2
+    controller.delete({})
+    assert controller.get({}) == []
+    assert len(queries) == 3
+    assert cache.stats()["entries"] == 1
+
+
+def test_order_by_order_matters(controller: layabase.CRUDController, queries: list):
+    controller.get({"order_by": ["key", "value"]})
+    controller.get({"order_by": ["value", "key"]})
+    assert len(queries) == 2
+
+
+def test_failed_query_is_not_cached(controller: layabase.CRUDController):
+    controller.post_many([{"key": "1", "value": 1}, {"key": "2", "value": 2}])
+    for _ in range(2):
+        with pytest.raises(layabase.ValidationFailed):
+            controller.get_one({})
+
+
+def test_field_names_are_cached(controller: layabase.CRUDController):
+    assert controller.get_field_names() == controller.get_field_names()
@@ -0,0 +1,312 @@
+import threading
+
+import flask
+import flask_restx
+import pytest
+
+import layabase
+import layabase.mongo
+
+
+def _controller(**kwargs) -> layabase.CRUDController:
+    class TestCollection:
+        __collection_name__ = "test"
+
+        key = layabase.mongo.Column(str, is_primary_key=True)
+        category = layabase.mongo.Column(str)
+        value = layabase.mongo.Column(int)
+
+    return layabase.CRUDController(TestCollection, history=True, **kwargs)
+
+
+@pytest.fixture
+def database():
+    # Every revision is settled (there is no concurrent writer)
+    controller = _controller(changes_revision_lag=0)
+    return controller, layabase.load("mongomock", [controller])
+
+
+@pytest.fixture
+def controller(database) -> layabase.CRUDController:
+    return database[0]
+
+
+def _keys(documents: list) -> list:
+    return sorted(document["key"] for document in documents)
+
+
+def test_changes_since_beginning(controller: layabase.CRUDController):
+    controller.post_many(
+        [
+            {"key": "1", "category": "A", "value": 1},
+            {"key": "2", "category": "B", "value": 2},
+        ]
+    )
+    assert controller.get_changes({"since_revision": 0}) == {
+        "inserted": [
+            {
+                "key": "1",
+                "category": "A",
+                "value": 1,
+                "valid_since_revision": 1,
+                "valid_until_revision": -1,
+            },
+            {
+                "key": "2",
+                "category": "B",
+                "value": 2,
+                "valid_since_revision": 1,
+                "valid_until_revision": -1,
+            },
+        ],
+        "updated": [],
+        "deleted": [],
+        "revision": 1,
+    }
+
+
+def test_changes_since_revision(controller: layabase.CRUDController):
+    controller.post_many(
+        [
+            {"key": "1", "category": "A", "value": 1},
+            {"key": "2", "category": "A", "value": 2},
+            {"key": "3", "category": "B", "value": 3},
+        ]
+    )
+    revision = controller.get_changes({"since_revision": 0})["revision"]
+    controller.put({"key": "1", "value": 10})
+    controller.put({"key": "1", "value": 11})
+    controller.delete({"key": "2"})
+    controller.post({"key": "4", "category": "B", "value": 4})
+    controller.post({"key": "5", "category": "B", "value": 5})
+    controller.delete({"key": "5"})
+
+    changes = controller.get_changes({"since_revision": revision})
+    assert changes["updated"] == [
+        {
+            "key": "1",
+            "category": "A",
+            "value": 11,
+            "valid_since_revision": 3,
+            "valid_until_revision": -1,
+        }
+    ]
+    assert _keys(changes["inserted"]) == ["4"]
+    # Last known version of deleted documents
+    assert changes["deleted"] == [
+        {
+            "key": "2",
+            "category": "A",
+            "value": 2,
+            "valid_since_revision": 1,
+            "valid_until_revision": 4,
+        }
+    ]
+    assert changes["revision"] == 7
+
+    assert controller.get_changes({"since_revision": changes["revision"]}) == {
+        "inserted": [],
+        "updated": [],
+        "deleted": [],
+        "revision": 7,
+    }
+
+
+def test_changes_after_rollback(controller: layabase.CRUDController):
+    controller.post({"key": "1", "value": 1})
+    controller.delete({"key": "1"})
+    controller.post({"key": "2", "value": 2})
+    changes = controller.get_changes({"since_revision": 3})
+    controller.rollback_to({"revision": 1})
+    changes = controller.get_changes({"since_revision": changes["revision"]})
+    assert _keys(changes["inserted"]) == ["1"]
+    assert _keys(changes["deleted"]) == ["2"]
+    assert changes["revision"] == 4
+
+
+def test_changes_performed_while_retrieving_changes_are_ignored(
+    controller: layabase.CRUDController, monkeypatch
+):
+    controller.post({"key": "1", "value": 1})
+    original_current_revision = controller._model.current_revision
+
+    def current_revision():
+        revision = original_current_revision()
+        # Performed after current revision was retrieved
+        controller.put({"key": "1", "value": 2})
+        controller.post({"key": "2", "value": 2})
+        return revision
+
+    monkeypatch.setattr(controller._model, "current_revision", current_revision)
+    changes = controller.get_changes({"since_revision": 0})
+    monkeypatch.undo()
+    # Version valid at the returned revision
+    assert changes["inserted"] == [
+        {
+            "key": "1",
+            "category": None,
+            "value": 1,
+            "valid_since_revision": 1,
+            "valid_until_revision": 2,
+        }
+    ]
+    assert changes["revision"] == 1
+
+    changes = controller.get_changes({"since_revision": changes["revision"]})
+    assert _keys(changes["updated"]) == ["1"]
+    assert _keys(changes["inserted"]) == ["2"]
+
+
+def test_changes_of_in_flight_writes_are_provided_on_next_call():
+    controller = _controller()
+    layabase.load("mongomock", [controller])
+    collection = controller._model.__collection__
+    original_insert_one = collection.insert_one
+    revision_reserved = threading.Event()
+    perform_write = threading.Event()
+
+    def slow_insert_one(document, *args, **kwargs):
+        if document["key"] == "1":
+            revision_reserved.set()
+            perform_write.wait(timeout=5)
+        return original_insert_one(document, *args, **kwargs)
+
+    collection.insert_one = slow_insert_one
+    writer = threading.Thread(target=controller.post, args=({"key": "1"},))
+    writer.start()
+    assert revision_reserved.wait(timeout=5)
+    # Performed after revision 1 was reserved but before it was written
+    controller.post({"key": "2"})
+
+    changes = controller.get_changes({"since_revision": 0})
+    assert _keys(changes["inserted"]) == ["2"]
+    # Most recent revisions are not settled yet
+    assert changes["revision"] == 0
+
+    perform_write.set()
+    writer.join(timeout=5)
+    changes = controller.get_changes({"since_revision": changes["revision"]})
+    assert _keys(changes["inserted"]) == ["1", "2"]
+
+
+def test_changes_revision_lag():
+    controller = _controller(changes_revision_lag=2)
+    layabase.load("mongomock", [controller])
+    for key in range(5):
+        controller.post({"key": str(key)})
+    changes = controller.get_changes({"since_revision": 0})
+    assert _keys(changes["inserted"]) == ["0", "1", "2", "3", "4"]
+    assert changes["revision"] == 3
+    # Changes of the most recent revisions are provided again
+    changes = controller.get_changes({"since_revision": changes["revision"]})
+    assert _keys(changes["inserted"]) == ["3", "4"]
+    assert changes["revision"] == 3
+
+
+def test_invalid_changes_revision_lag():
+    controller = _controller(changes_revision_lag=-1)
+    with pytest.raises(Exception) as exception_info:
+        layabase.load("mongomock", [controller])
+    assert (
+        str(exception_info.value) == "Changes revision lag must be a positive integer."
+    )
+
+
+def test_changes_cannot_be_retrieved_with_revision_blocks():
+    controller = _controller(revision_block_size=10)
+    layabase.load("mongomock", [controller])
+    with pytest.raises(Exception) as exception_info:
+        controller.get_changes({"since_revision": 0})
+    assert (
+        str(exception_info.value)
+        == "Changes cannot be retrieved when revisions are reserved by block."
+    )
+
+
+def test_changes_with_filters(controller: layabase.CRUDController):
+    controller.post_many(
+        [
+            {"key": "1", "category": "A", "value": 1},
+            {"key": "2", "category": "B", "value": 2},
+        ]
+    )
+    controller.put({"key": "1", "category": "B"})
+    changes = controller.get_changes({"since_revision": 1, "category": "A"})
+    # Document left filtered documents
+    assert _keys(changes["deleted"]) == ["1"]
+    changes = controller.get_changes({"since_revision": 1, "category": "B"})
+    assert _keys(changes["inserted"]) == ["1"]
+
+
+def test_changes_without_revision(controller: layabase.CRUDController):
+    with pytest.raises(layabase.ValidationFailed) as exception_info:
+        controller.get_changes({})
+    assert exception_info.value.errors == {
+        "since_revision": ["Missing data for required field."]
+    }
+
+
+def test_changes_with_invalid_revision(controller: layabase.CRUDController):
+    with pytest.raises(layabase.ValidationFailed) as exception_info:
+        controller.get_changes({"since_revision": -1})
+    assert exception_info.value.errors == {
+        "since_revision": ["Not a valid positive int."]
+    }
+
+
+def test_changes_are_served_by_revision_index(database):
+    controller, base = database
+    assert base["test"].index_information()["ridxtest"]["key"] == [
+        ("valid_until_revision", 1),
+        ("valid_since_revision", 1),
+    ]
+
+
+def test_changes_require_history():
+    class TestCollection:
+        __collection_name__ = "test"
+
+        key = layabase.mongo.Column(str, is_primary_key=True)
+
+    controller = layabase.CRUDController(TestCollection)
+    layabase.load("mongomock", [controller])
+    with pytest.raises(Exception) as exception_info:
+        controller.get_changes({"since_revision": 0})
+    assert str(exception_info.value) == "Changes can only be retrieved with history."
+
+
+def test_changes_endpoint(controller: layabase.CRUDController):
+    application = flask.Flask(__name__)
+    application.testing = True
+    api = flask_restx.Api(application)
+    namespace = api.namespace("Test", path="/")
+    controller.flask_restx.init_models(namespace)
+
+    @namespace.route("/test/changes")
+    class TestChangesResource(flask_restx.Resource):
+        @namespace.expect(controller.flask_restx.query_get_changes_parser)
+        @namespace.marshal_with(controller.flask_restx.get_changes_response_model)
+        def get(self):
+            return controller.get_changes(
+                controller.flask_restx.query_get_changes_parser.parse_args()
+            )
+
+    controller.post({"key": "1", "category": "A", "value": 1})
+    client = application.test_client()
+    response = client.get("/test/changes?since_revision=0")
+    assert response.status_code == 200
+    assert response.json == {
+        "inserted": [
+            {
+                "key": "1",
+                "category": "A",
+                "value": 1,
+                "valid_since_revision": 1,
+                "valid_until_revision": -1,
+            }
+        ],
+        "updated": [],
+        "deleted": [],
+        "revision": 1,
+    }
+    assert client.get("/test/changes").status_code == 400
@@ -0,0 +1,99 @@
+import pytest
+
+import layabase
+import layabase.mongo
+
+
+@pytest.fixture
+def controller() -> layabase.CRUDController:
+    class TestCollection:
+        __collection_name__ = "test"
+
+        key = layabase.mongo.Column(str, is_primary_key=True)
+        value = layabase.mongo.Column(int)
+
+    controller = layabase.CRUDController(TestCollection, audit=True, history=True)
+    layabase.load("mongomock", [controller])
+    controller.post_many([{"key": str(key), "value": key % 2} for key in range(10)])
+    return controller
+
+
+def test_delete_chunks(controller: layabase.CRUDController):
+    progress = []
+    assert (
+        controller.delete_chunks({"value": 1}, chunk_size=2, progress=progress.append)
+        == 5
+    )
+    assert progress == [2, 4, 5]
+    assert sorted(row["key"] for row in controller.get({})) == ["0", "2", "4", "6", "8"]
+    removals = [
+        record
+        for record in controller.get_audit({})
+        if record["audit_action"] in ("Delete", "D")
+    ]
+    # Every chunk is audited once
+    assert len(removals) == 3
+
+
+def test_delete_all_chunks(controller: layabase.CRUDController):
+    assert controller.delete_chunks({}, chunk_size=5, pause=0.001) == 10
+    assert controller.get({}) == []
+
+
+def test_delete_chunks_without_match(controller: layabase.CRUDController):
+    progress = []
+    assert controller.delete_chunks({"key": "11"}, progress=progress.append) == 0
+    assert progress == []
+    assert len(controller.get({})) == 10
+
+
+def test_delete_chunks_with_list_filter(controller: layabase.CRUDController):
+    assert controller.delete_chunks({"key": ["1", "2", "3"]}, chunk_size=2) == 3
+    assert len(controller.get({})) == 7
+
+
+def test_invalid_parameters(controller: layabase.CRUDController):
+    with pytest.raises(Exception) as exception_info:
+        controller.delete_chunks({}, chunk_size=0)
+    assert (
+        str(exception_info.value) == "Chunk size must be a strictly positive integer."
+    )
+    with pytest.raises(layabase.ValidationFailed) as exception_info:
+        controller.delete_chunks("")
+    assert exception_info.value.errors == {"": ["Must be a dictionary."]}
+
+
+def test_chunks_are_revisions(controller: layabase.CRUDController):
+    assert controller.delete_chunks({}, chunk_size=4) == 10
+    assert controller._model.current_revision() == 4
+    assert controller.rollback_to({"revision": 3}) == 2
+    assert len(controller.get({})) == 2
+
+
+def test_counters_are_not_reset_when_last_chunk_fails(
+    controller: layabase.CRUDController, monkeypatch
+):
+    resets = []
+    monkeypatch.setattr(
+        controller._model, "reset_counters", lambda: resets.append(True)
+    )
+
+    def failing_audit(*args):
+        raise Exception("Audit failure")
+
+    monkeypatch.setattr(controller._model.audit_model, "audit_remove", failing_audit)
+    with pytest.raises(Exception):
+        controller.delete_chunks({}, chunk_size=20)
+    assert resets == []
+    assert len(controller.get({})) == 10
+
+
+def test_counters_are_reset_once_all_chunks_are_deleted(
+    controller: layabase.CRUDController, monkeypatch
+):
+    resets = []
+    monkeypatch.setattr(
+        controller._model, "reset_counters", lambda: resets.append(True)
+    )
+    assert controller.delete_chunks({}, chunk_size=4) == 10
+    assert resets == [True]
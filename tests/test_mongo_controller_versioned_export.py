@@ -0,0 +1,137 @@
+import csv
+import gzip
+import io
+import json
+import datetime
+
+import pytest
+
+import layabase
+import layabase.mongo
+
+
+@pytest.fixture
+def controller() -> layabase.CRUDController:
+    class TestCollection:
+        __collection_name__ = "test"
+
+        key = layabase.mongo.Column(str, is_primary_key=True)
+        value = layabase.mongo.Column(int)
+        date = layabase.mongo.Column(datetime.date)
+
+    controller = layabase.CRUDController(TestCollection, history=True)
+    layabase.load("mongomock", [controller])
+    controller.post_many(
+        [
+            {"key": "1", "value": 1, "date": "2020-01-01"},
+            {"key": "2", "value": 2},
+            {"key": "3", "value": 1, "date": "2020-01-03"},
+        ]
+    )
+    return controller
+
+
+def _without_revisions(records: list) -> list:
+    return [
+        {
+            field_name: value
+            for field_name, value in record.items()
+            if not field_name.startswith("valid_")
+        }
+        for record in records
+    ]
+
+
+def test_export_ndjson(controller: layabase.CRUDController, tmp_path):
+    path = tmp_path / "records.ndjson"
+    assert controller.export({"value": 1, "order_by": ["key"]}, str(path)) == 2
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert _without_revisions(records) == [
+        {"key": "1", "value": 1, "date": "2020-01-01"},
+        {"key": "3", "value": 1, "date": "2020-01-03"},
+    ]
+
+
+def test_export_is_performed_batch_by_batch(
+    controller: layabase.CRUDController, tmp_path
+):
+    path = tmp_path / "records.ndjson"
+    assert controller.export({"order_by": ["key"]}, str(path), batch_size=2) == 3
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [record["key"] for record in records] == ["1", "2", "3"]
+
+
+def test_export_csv(controller: layabase.CRUDController, tmp_path):
+    path = tmp_path / "records.csv.gz"
+    assert controller.export({"order_by": ["key"]}, str(path), batch_size=2) == 3
+    with gzip.open(path, "rt") as file:
+        records = list(csv.DictReader(file))
+    assert _without_revisions(records) == [
+        {"key": "1", "value": "1", "date": "2020-01-01"},
+        {"key": "2", "value": "2", "date": ""},
+        {"key": "3", "value": "1", "date": "2020-01-03"},
+    ]
+
+
+def test_exported_csv_can_be_imported(controller: layabase.CRUDController, tmp_path):
+    path = tmp_path / "records.csv"
+    controller.export({}, str(path))
+    controller.delete({})
+    assert controller.import_file(str(path)) == {"inserted": 3, "errors": {}}
+
+
+def test_export_to_text_stream(controller: layabase.CRUDController):
+    stream = io.StringIO()
+    assert controller.export({"key": "2"}, stream, file_format="ndjson") == 1
+    assert _without_revisions([json.loads(stream.getvalue())]) == [
+        {"key": "2", "value": 2, "date": None}
+    ]
+
+
+def test_export_to_binary_stream(controller: layabase.CRUDController):
+    stream = io.BytesIO()
+    assert controller.export({"key": "2"}, stream, file_format="csv") == 1
+    assert not stream.closed
+    records = list(csv.DictReader(io.StringIO(stream.getvalue().decode())))
+    assert _without_revisions(records) == [{"key": "2", "value": "2", "date": ""}]
+
+
+def test_export_without_match(controller: layabase.CRUDController, tmp_path):
+    path = tmp_path / "records.csv"
+    assert controller.export({"key": "4"}, str(path)) == 0
+    with open(path) as file:
+        assert {"key", "value", "date"} <= set(csv.DictReader(file).fieldnames)
+
+
+def test_invalid_parameters(controller: layabase.CRUDController, tmp_path):
+    with pytest.raises(Exception) as exception_info:
+        controller.export({}, str(tmp_path / "records.txt"))
+    assert (
+        str(exception_info.value)
+        == "File format must be one of ('csv', 'ndjson', 'parquet')."
+    )
+    with pytest.raises(Exception) as exception_info:
+        controller.export({}, str(tmp_path / "records.csv"), batch_size=0)
+    assert (
+        str(exception_info.value) == "Batch size must be a strictly positive integer."
+    )
+    with pytest.raises(layabase.ValidationFailed) as exception_info:
+        controller.export("", str(tmp_path / "records.csv"))
+    assert exception_info.value.errors == {"": ["Must be a dictionary."]}
+
+
+def test_export_parquet(controller: layabase.CRUDController, tmp_path):
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet
+
+    path = tmp_path / "records.parquet"
+    assert controller.export({"order_by": ["key"]}, str(path), batch_size=2) == 3
+    table = pyarrow.parquet.read_table(str(path))
+    assert table.column("key").to_pylist() == ["1", "2", "3"]
+    assert table.column("value").to_pylist() == [1, 2, 1]
+    assert table.schema.field("date").type == pyarrow.date32()
+    assert table.column("date").to_pylist() == [
+        datetime.date(2020, 1, 1),
+        None,
+        datetime.date(2020, 1, 3),
+    ]
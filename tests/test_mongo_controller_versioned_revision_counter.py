@@ -0,0 +1,159 @@
+import os
+
+import pytest
+
+import layabase
+import layabase.mongo
+
+
+def _controller(collection_name: str, **kwargs) -> layabase.CRUDController:
+    class TestCollection:
+        __collection_name__ = collection_name
+
+        key = layabase.mongo.Column(str, is_primary_key=True)
+        value = layabase.mongo.Column(str)
+
+    return layabase.CRUDController(TestCollection, history=True, **kwargs)
+
+
+@pytest.fixture
+def shared_controllers():
+    controller1 = _controller("test1")
+    controller2 = _controller("test2")
+    base = layabase.load("mongomock", [controller1, controller2])
+    return base, controller1, controller2
+
+
+@pytest.fixture
+def dedicated_controllers():
+    controller1 = _controller("test1", shared_revision=False)
+    controller2 = _controller("test2", shared_revision=False)
+    base = layabase.load("mongomock", [controller1, controller2])
+    return base, controller1, controller2
+
+
+@pytest.fixture
+def block_controllers():
+    controller1 = _controller("test1", revision_block_size=10)
+    controller2 = _controller("test2", revision_block_size=10)
+    base = layabase.load("mongomock", [controller1, controller2])
+    return base, controller1, controller2
+
+
+def test_revision_is_shared_by_default(shared_controllers):
+    base, controller1, controller2 = shared_controllers
+    assert controller1.post({"key": "1"})["valid_since_revision"] == 1
+    assert controller2.post({"key": "1"})["valid_since_revision"] == 2
+    assert controller1.post({"key": "2"})["valid_since_revision"] == 3
+    assert base["counters"].find_one({"_id": "shared"})["revision"]["counter"] == 3
+
+
+def test_dedicated_revision_counters(dedicated_controllers):
+    base, controller1, controller2 = dedicated_controllers
+    assert controller1.post({"key": "1"})["valid_since_revision"] == 1
+    assert controller2.post({"key": "1"})["valid_since_revision"] == 1
+    assert controller1.put({"key": "1", "value": "new"})[1]["valid_since_revision"] == 2
+    assert controller2._model.current_revision() == 1
+    assert controller1._model.current_revision() == 2
+    assert base["counters"].find_one({"_id": "shared"}) is None
+    assert (
+        base["counters"].find_one({"_id": "revision_test1"})["revision"]["counter"]
+        == 2
+    )
+    assert (
+        base["counters"].find_one({"_id": "revision_test2"})["revision"]["counter"]
+        == 1
+    )
+
+
+def test_dedicated_revision_counter_does_not_collide_with_auto_increment():
+    class TestCollection:
+        __collection_name__ = "test"
+
+        key = layabase.mongo.Column(str, is_primary_key=True)
+        revision = layabase.mongo.Column(int, should_auto_increment=True)
+
+    controller = layabase.CRUDController(
+        TestCollection, history=True, shared_revision=False
+    )
+    layabase.load("mongomock", [controller])
+    assert controller.post({"key": "1"}) == {
+        "key": "1",
+        "revision": 1,
+        "valid_since_revision": 1,
+        "valid_until_revision": -1,
+    }
+    assert controller.post({"key": "2"}) == {
+        "key": "2",
+        "revision": 2,
+        "valid_since_revision": 2,
+        "valid_until_revision": -1,
+    }
+    assert controller._model.current_revision() == 2
+
+
+def test_dedicated_revision_counters_rollback(dedicated_controllers):
+    base, controller1, controller2 = dedicated_controllers
+    controller1.post({"key": "1", "value": "first"})
+    controller1.put({"key": "1", "value": "second"})
+    controller2.post({"key": "1", "value": "other"})
+    assert controller1.rollback_to({"revision": 1}) == 1
+    assert controller1.get({}) == [
+        {
+            "key": "1",
+            "value": "first",
+            "valid_since_revision": 3,
+            "valid_until_revision": -1,
+        }
+    ]
+    assert controller2.get({}) == [
+        {
+            "key": "1",
+            "value": "other",
+            "valid_since_revision": 1,
+            "valid_until_revision": -1,
+        }
+    ]
+
+
+def test_revision_block_is_reserved_once(block_controllers):
+    base, controller1, controller2 = block_controllers
+    assert controller1.post({"key": "1"})["valid_since_revision"] == 1
+    assert controller1.post({"key": "2"})["valid_since_revision"] == 2
+    assert controller1.delete({"key": "1"}) == 1
+    assert base["counters"].find_one({"_id": "shared"})["revision"]["counter"] == 10
+    # Another model (as another process would) reserve the following block
+    assert controller2.post({"key": "1"})["valid_since_revision"] == 11
+    assert base["counters"].find_one({"_id": "shared"})["revision"]["counter"] == 20
+    assert controller1.post({"key": "3"})["valid_since_revision"] == 4
+
+
+def test_revision_block_is_reserved_again_once_exhausted(block_controllers):
+    base, controller1, controller2 = block_controllers
+    controller1.post_many([{"key": str(key)} for key in range(10)])
+    for key in range(9):
+        controller1.put({"key": str(key), "value": "updated"})
+    assert controller1.get_one({"key": "8"})["valid_since_revision"] == 10
+    assert controller1.put({"key": "9", "value": "updated"})[1] == {
+        "key": "9",
+        "value": "updated",
+        "valid_since_revision": 11,
+        "valid_until_revision": -1,
+    }
+    assert base["counters"].find_one({"_id": "shared"})["revision"]["counter"] == 20
+
+
+def test_revision_block_is_not_reused_by_forked_process(block_controllers, monkeypatch):
+    base, controller1, controller2 = block_controllers
+    assert controller1.post({"key": "1"})["valid_since_revision"] == 1
+    monkeypatch.setattr(os, "getpid", lambda: -1)
+    assert controller1.post({"key": "2"})["valid_since_revision"] == 11
+
+
+def test_invalid_revision_block_size():
+    controller = _controller("test", revision_block_size=0)
+    with pytest.raises(Exception) as exception_info:
+        layabase.load("mongomock", [controller])
+    assert (
+        str(exception_info.value) == "Block size must be a strictly positive integer."
+    )
@@ -0,0 +1,217 @@
+import pytest
+
+import layabase
+import layabase.mongo
+import layabase._snapshot
+
+
+@pytest.fixture
+def controller() -> layabase.CRUDController:
+    class TestCollection:
+        __collection_name__ = "test"
+
+        key = layabase.mongo.Column(str, is_primary_key=True)
+        category = layabase.mongo.Column(str, index_type=layabase.mongo.IndexType.Other)
+        value = layabase.mongo.Column(int, allow_comparison_signs=True)
+
+    controller = layabase.CRUDController(TestCollection, snapshot=True, history=True)
+    layabase.load("mongomock", [controller])
+    controller.post_many(
+        [
+            {"key": "1", "category": "A", "value": 10},
+            {"key": "2", "category": "A", "value": 20},
+            {"key": "3", "category": "B", "value": 30},
+            {"key": "4", "category": "C", "value": 40},
+        ]
+    )
+    return controller
+
+
+@pytest.fixture
+def queries(controller: layabase.CRUDController, monkeypatch) -> list:
+    queries = []
+    original_get_all = controller._model.get_all
+    original_get = controller._model.get
+
+    def get_all(**filters):
+        queries.append(("get_all", filters))
+        return original_get_all(**filters)
+
+    def get(**filters):
+        queries.append(("get", filters))
+        return original_get(**filters)
+
+    monkeypatch.setattr(controller._model, "get_all", get_all)
+    monkeypatch.setattr(controller._model, "get", get)
+    return queries
+
+
+def _keys(rows: list) -> list:
+    return [row["key"] for row in rows]
+
+
+def test_snapshot_is_loaded_once(controller: layabase.CRUDController, queries: list):
+    assert _keys(controller.get({})) == ["1", "2", "3", "4"]
+    assert _keys(controller.get({"key": "2"})) == ["2"]
+    assert controller.get_one({"key": "3"})["value"] == 30
+    assert queries == [("get_all", {})]
+
+
+def test_snapshot_returns_the_same_rows_as_the_database(
+    controller: layabase.CRUDController, queries: list
+):
+    for request_arguments in [
+        {},
+        {"key": "1"},
+        {"key": ["1", "3", "5"]},
+        {"key": []},
+        {"key": None},
+        {"category": "A"},
+        {"category": ["B", "C"], "value": 30},
+        {"value": (layabase.ComparisonSigns.Greater, 20)},
+        {"value": (layabase.ComparisonSigns.GreaterOrEqual, 20)},
+        {
+            "value": [
+                (layabase.ComparisonSigns.Greater, 10),
+                (layabase.ComparisonSigns.LowerOrEqual, 30),
+            ]
+        },
+        {"value": [10, (layabase.ComparisonSigns.Greater, 30)]},
+        {"category": "A", "value": (layabase.ComparisonSigns.Lower, 20)},
+        {"key": "5"},
+    ]:
+        assert controller.get(dict(request_arguments)) == controller._model.get_all(
+            **request_arguments
+        )
+    assert queries.count(("get_all", {})) == 2  # Snapshot loading and comparison
+
+
+def test_snapshot_limit_offset(controller: layabase.CRUDController, queries: list):
+    assert _keys(controller.get({"limit": 2})) == ["1", "2"]
+    assert _keys(controller.get({"limit": 2, "offset": 1})) == ["2", "3"]
+    assert _keys(controller.get({"offset": 3})) == ["4"]
+    assert len(queries) == 1
+
+
+def test_snapshot_order_by(controller: layabase.CRUDController, queries: list):
+    assert _keys(controller.get({"order_by": ["-category", "value"]})) == [
+        "4",
+        "3",
+        "1",
+        "2",
+    ]
+    assert len(queries) == 1
+
+
+def test_snapshot_get_one(controller: layabase.CRUDController, queries: list):
+    assert controller.get_one({"key": ["2"]})["value"] == 20
+    assert controller.get_one({"key": "5"}) == {}
+    with pytest.raises(layabase.ValidationFailed) as exception_info:
+        controller.get_one({"category": "A"})
+    assert exception_info.value.errors == {
+        "": ["More than one result: Consider another filtering."]
+    }
+    assert len(queries) == 1
+
+
+def test_snapshot_is_hash_indexed(controller: layabase.CRUDController):
+    controller.get({})
+    indexes = controller._snapshot._indexes
+    assert indexes["key"]["2"] == {("2",)}
+    assert indexes["category"]["A"] == {("1",), ("2",)}
+    assert "value" not in indexes
+
+
+def test_filters_that_cannot_be_evaluated_in_memory_are_performed_on_database(
+    controller: layabase.CRUDController, queries: list
+):
+    controller.get({})
+    assert _keys(controller.get({"value": "20"})) == ["2"]
+    assert queries == [("get_all", {}), ("get_all", {"value": "20"})]
+
+
+def test_post_refreshes_snapshot_incrementally(
+    controller: layabase.CRUDController, queries: list
+):
+    controller.get({})
+    controller.post({"key": "5", "category": "A", "value": 50})
+    assert _keys(controller.get({"category": "A"})) == ["1", "2", "5"]
+    assert ("get_all", {}) == queries[0]
+    assert ("get_all", {}) not in queries[1:]
+
+
+def test_post_many_refreshes_snapshot_incrementally(
+    controller: layabase.CRUDController, queries: list
+):
+    controller.get({})
+    controller.post_many(
+        [
+            {"key": "5", "category": "D", "value": 50},
+            {"key": "6", "category": "D", "value": 60},
+        ]
+    )
+    assert _keys(controller.get({"category": "D"})) == ["5", "6"]
+    assert ("get_all", {}) not in queries[1:]
+
+
+def test_put_refreshes_snapshot_incrementally(
+    controller: layabase.CRUDController, queries: list
+):
+    controller.get({})
+    controller.put({"key": "1", "category": "B"})
+    controller.put_many([{"key": "2", "value": 25}])
+    assert _keys(controller.get({"category": "A"})) == ["2"]
+    assert _keys(controller.get({"category": "B"})) == ["1", "3"]
+    assert controller.get_one({"key": "2"})["value"] == 25
+    # Updated rows keep their position
+    assert _keys(controller.get({})) == ["1", "2", "3", "4"]
+    assert ("get_all", {}) not in queries[1:]
+
+
+def test_delete_refreshes_snapshot_incrementally(
+    controller: layabase.CRUDController, queries: list
+):
+    controller.get({})
+    assert controller.delete({"category": "A"}) == 2
+    assert _keys(controller.get({})) == ["3", "4"]
+    assert controller.get({"category": "A"}) == []
+    assert ("get_all", {}) not in queries[1:]
+
+
+def test_failed_write_reloads_snapshot(
+    controller: layabase.CRUDController, queries: list
+):
+    controller.get({})
+    with pytest.raises(layabase.ValidationFailed):
+        controller.put({"key": "5", "value": 50})
+    assert _keys(controller.get({})) == ["1", "2", "3", "4"]
+    assert queries.count(("get_all", {})) == 2
+
+
+def test_external_writes_are_considered_after_refresh_interval(
+    controller: layabase.CRUDController, monkeypatch
+):
+    now = [1000.0]
+    monkeypatch.setattr(layabase._snapshot.time, "monotonic", lambda: now[0])
+    controller.snapshot_refresh_interval = 10
+    assert _keys(controller.get({})) == ["1", "2", "3", "4"]
+
+    # Write bypassing the controller
+    controller._model.add({"key": "5", "category": "A", "value": 50})
+    now[0] += 9
+    assert _keys(controller.get({})) == ["1", "2", "3", "4"]
+    now[0] += 1
+    assert _keys(controller.get({})) == ["1", "2", "3", "4", "5"]
+
+
+def test_snapshot_is_never_reloaded_without_refresh_interval(
+    controller: layabase.CRUDController, monkeypatch
+):
+    now = [1000.0]
+    monkeypatch.setattr(layabase._snapshot.time, "monotonic", lambda: now[0])
+    controller.snapshot_refresh_interval = None
+    assert _keys(controller.get({})) == ["1", "2", "3", "4"]
+
+    controller._model.add({"key": "5", "category": "A", "value": 50})
+    now[0] += 3600
+    assert _keys(controller.get({})) == ["1", "2", "3", "4"]
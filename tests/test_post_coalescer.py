@@ -0,0 +1,15 @@
+import pytest
+
+import layabase
+
+
+def test_invalid_parameters():
+    with pytest.raises(Exception) as exception_info:
+        layabase.PostCoalescer(max_delay=-1)
+    assert str(exception_info.value) == "Maximum delay must be positive."
+    with pytest.raises(Exception) as exception_info:
+        layabase.PostCoalescer(max_documents=0)
+    assert (
+        str(exception_info.value)
+        == "Maximum number of documents must be a strictly positive integer."
+    )
@@ -0,0 +1,183 @@
+import pytest
+import sqlalchemy
+
+import layabase
+import layabase.mongo
+
+
+@pytest.fixture
+def mongo_controller() -> layabase.CRUDController:
+    class TestCollection:
+        __collection_name__ = "test"
+
+        key = layabase.mongo.Column(str, is_primary_key=True)
+        value = layabase.mongo.Column(int, is_nullable=False)
+
+    controller = layabase.CRUDController(TestCollection, audit=True)
+    layabase.load("mongomock", [controller])
+    return controller
+
+
+@pytest.fixture
+def mongo_versioned_controller() -> layabase.CRUDController:
+    class TestCollection:
+        __collection_name__ = "test"
+
+        key = layabase.mongo.Column(str, is_primary_key=True)
+        value = layabase.mongo.Column(int, is_nullable=False)
+
+    controller = layabase.CRUDController(TestCollection, audit=True, history=True)
+    layabase.load("mongomock", [controller])
+    return controller
+
+
+@pytest.fixture
+def sql_controller() -> layabase.CRUDController:
+    class TestTable:
+        __tablename__ = "test"
+
+        key = sqlalchemy.Column(sqlalchemy.String, primary_key=True)
+        value = sqlalchemy.Column(sqlalchemy.Integer, nullable=False)
+        code = sqlalchemy.Column(sqlalchemy.String, unique=True)
+
+    controller = layabase.CRUDController(TestTable, audit=True)
+    layabase.load("sqlite:///:memory:", [controller])
+    return controller
+
+
+def test_mongo_duplicates_do_not_prevent_insertion(
+    mongo_controller: layabase.CRUDController,
+):
+    mongo_controller.post({"key": "1", "value": 1})
+    result = mongo_controller.post_each(
+        [
+            {"key": "0", "value": 0},
+            {"key": "1", "value": 10},
+            {"key": "2", "value": 2},
+            {"key": "2", "value": 20},
+            {"key": "3"},
+            {"key": "4", "value": 4},
+        ]
+    )
+    assert result == {
+        "inserted": {
+            0: {"key": "0", "value": 0},
+            2: {"key": "2", "value": 2},
+            5: {"key": "4", "value": 4},
+        },
+        "errors": {
+            1: {"": ["This document already exists."]},
+            3: {"": ["This document already exists."]},
+            4: {"value": ["Missing data for required field."]},
+        },
+    }
+    assert {row["key"]: row["value"] for row in mongo_controller.get({})} == {
+        "0": 0,
+        "1": 1,
+        "2": 2,
+        "4": 4,
+    }
+    # Only inserted documents are audited
+    assert len(mongo_controller.get_audit({})) == 4
+
+
+def test_mongo_versioned_duplicates_do_not_prevent_insertion(
+    mongo_versioned_controller: layabase.CRUDController,
+):
+    mongo_versioned_controller.post({"key": "1", "value": 1})
+    result = mongo_versioned_controller.post_each(
+        [{"key": "1", "value": 10}, {"key": "2", "value": 2}]
+    )
+    assert result == {
+        "inserted": {
+            1: {
+                "key": "2",
+                "value": 2,
+                "valid_since_revision": 2,
+                "valid_until_revision": -1,
+            }
+        },
+        "errors": {0: {"": ["This document already exists."]}},
+    }
+    assert len(mongo_versioned_controller.get_history({})) == 2
+
+
+def test_sql_constraint_violations_do_not_prevent_insertion(
+    sql_controller: layabase.CRUDController,
+):
+    result = sql_controller.post_each(
+        [
+            {"key": "1", "value": 1, "code": "A"},
+            {"key": "2", "value": 2, "code": "A"},
+            {"key": "3"},
+            {"key": "4", "value": 4, "code": "B"},
+        ]
+    )
+    assert result["inserted"] == {
+        0: {"key": "1", "value": 1, "code": "A"},
+        3: {"key": "4", "value": 4, "code": "B"},
+    }
+    assert list(result["errors"]) == [1, 2]
+    assert "UNIQUE constraint failed" in result["errors"][1][""][0]
+    assert result["errors"][2] == {"value": ["Missing data for required field."]}
+    assert sorted(row["key"] for row in sql_controller.get({})) == ["1", "4"]
+    assert len(sql_controller.get_audit({})) == 2
+
+
+def test_sql_primary_key_duplicates_are_rejected(
+    sql_controller: layabase.CRUDController,
+):
+    sql_controller.post({"key": "1", "value": 1})
+    result = sql_controller.post_each(
+        [
+            {"key": "1", "value": 10},
+            {"key": "2", "value": 2},
+            {"key": "3", "value": 3},
+            {"key": "2", "value": 20},
+        ]
+    )
+    assert result["inserted"] == {
+        1: {"key": "2", "value": 2, "code": None},
+        2: {"key": "3", "value": 3, "code": None},
+    }
+    assert list(result["errors"]) == [0, 3]
+    assert "UNIQUE constraint failed" in result["errors"][0][""][0]
+    assert result["errors"][3] == {"": ["This row already exists."]}
+    assert {row["key"]: row["value"] for row in sql_controller.get({})} == {
+        "1": 1,
+        "2": 2,
+        "3": 3,
+    }
+    assert len(sql_controller.get_audit({})) == 3
+
+
+def test_sql_only_faulty_chunks_are_inserted_row_by_row(
+    sql_controller: layabase.CRUDController,
+):
+    results = sql_controller._model.add_each(
+        [
+            {"key": "1", "value": 1, "code": "A"},
+            {"key": "2", "value": 2, "code": "B"},
+            {"key": "3", "value": 3, "code": "A"},
+            {"key": "4", "value": 4, "code": "C"},
+        ],
+        chunk_size=2,
+    )
+    assert [isinstance(result, layabase.ValidationFailed) for result in results] == [
+        False,
+        False,
+        True,
+        False,
+    ]
+    assert sorted(row["key"] for row in sql_controller.get({})) == ["1", "2", "4"]
+
+
+@pytest.mark.parametrize(
+    "new_dicts, message",
+    [([], "No data provided."), ({"key": "1"}, "Must be a list of dictionaries.")],
+)
+def test_invalid_data(mongo_controller, sql_controller, new_dicts, message):
+    for controller in (mongo_controller, sql_controller):
+        with pytest.raises(layabase.ValidationFailed) as exception_info:
+            controller.post_each(new_dicts)
+        assert exception_info.value.errors == {"": [message]}
@@ -0,0 +1,97 @@
+import datetime
+import enum
+
+import pytest
+import sqlalchemy
+
+import layabase
+
+
+class EnumTest(enum.Enum):
+    Value1 = 1
+    Value2 = 2
+
+
+@pytest.fixture
+def controller() -> layabase.CRUDController:
+    class TestTable:
+        __tablename__ = "test"
+
+        key = sqlalchemy.Column(sqlalchemy.String, primary_key=True)
+        value = sqlalchemy.Column(sqlalchemy.Integer)
+        amount = sqlalchemy.Column(sqlalchemy.Float)
+        date = sqlalchemy.Column(sqlalchemy.Date)
+        enum_field = sqlalchemy.Column(sqlalchemy.Enum(EnumTest))
+
+    controller = layabase.CRUDController(TestTable)
+    layabase.load("sqlite:///:memory:", [controller])
+    controller.post_many(
+        [
+            {
+                "key": "1",
+                "value": 1,
+                "amount": 1.5,
+                "date": "2020-01-02",
+                "enum_field": "Value1",
+            },
+            {"key": "2", "value": 2},
+            {"key": "3", "value": 1, "enum_field": "Value2"},
+        ]
+    )
+    return controller
+
+
+def test_columns_are_iterated_batch_by_batch(controller: layabase.CRUDController):
+    batches = list(controller._model.iter_columns(2, value=1, order_by=["key"]))
+    assert len(batches) == 1
+    assert batches[0]["key"] == ["1", "3"]
+    assert batches[0]["value"] == [1, 1]
+    assert batches[0]["amount"] == [1.5, None]
+    assert [
+        date if date is None else date.strftime("%Y-%m-%d")
+        for date in batches[0]["date"]
+    ] == ["2020-01-02", None]
+
+    batches = list(controller._model.iter_columns(2, order_by=["key"]))
+    assert [batch["key"] for batch in batches] == [["1", "2"], ["3"]]
+
+
+def test_get_arrow(controller: layabase.CRUDController):
+    pyarrow = pytest.importorskip("pyarrow")
+
+    table = controller.get_arrow({"order_by": ["key"]}, batch_size=2)
+    assert table.num_rows == 3
+    assert table.schema.field("value").type == pyarrow.int64()
+    assert table.schema.field("amount").type == pyarrow.float64()
+    assert table.schema.field("date").type == pyarrow.date32()
+    assert table.column("key").to_pylist() == ["1", "2", "3"]
+    assert table.column("date").to_pylist() == [datetime.date(2020, 1, 2), None, None]
+    assert table.column("enum_field").to_pylist() == ["Value1", None, "Value2"]
+
+
+def test_get_arrow_without_match(controller: layabase.CRUDController):
+    pytest.importorskip("pyarrow")
+
+    table = controller.get_arrow({"key": "4"})
+    assert table.num_rows == 0
+    assert {"key", "value", "date"} <= set(table.column_names)
+
+
+def test_get_dataframe(controller: layabase.CRUDController):
+    pytest.importorskip("pyarrow")
+    pytest.importorskip("pandas")
+
+    dataframe = controller.get_dataframe({"value": 1, "order_by": ["key"]})
+    assert list(dataframe["key"]) == ["1", "3"]
+    assert list(dataframe["value"]) == [1, 1]
+
+
+def test_invalid_parameters(controller: layabase.CRUDController):
+    with pytest.raises(Exception) as exception_info:
+        controller.get_arrow({}, batch_size=0)
+    assert (
+        str(exception_info.value) == "Batch size must be a strictly positive integer."
+    )
+    with pytest.raises(layabase.ValidationFailed) as exception_info:
+        controller.get_arrow("")
+    assert exception_info.value.errors == {"": ["Must be a dictionary."]}
@@ -0,0 +1,166 @@
+import csv
+import datetime
+import gzip
+import json
+import os
+
+import pytest
+import sqlalchemy
+
+import layabase
+import layabase._audit_archive
+
+
+class DateTimeModuleMock:
+    class DateTimeMock:
+        now = datetime.datetime(2020, 1, 15)
+
+        @classmethod
+        def utcnow(cls):
+            return cls.now
+
+    datetime = DateTimeMock
+
+
+@pytest.fixture
+def mock_audit_datetime(monkeypatch):
+    import layabase._audit_sqlalchemy
+
+    monkeypatch.setattr(layabase._audit_sqlalchemy, "datetime", DateTimeModuleMock)
+
+
+@pytest.fixture
+def controller(mock_audit_datetime) -> layabase.CRUDController:
+    class TestTable:
+        __tablename__ = "test"
+
+        key = sqlalchemy.Column(sqlalchemy.String, primary_key=True)
+        value = sqlalchemy.Column(sqlalchemy.Integer)
+
+    controller = layabase.CRUDController(TestTable, audit=True)
+    layabase.load("sqlite:///:memory:", [controller])
+    for month in (1, 2, 3):
+        DateTimeModuleMock.DateTimeMock.now = datetime.datetime(2020, month, 15)
+        for index in range(3):
+            controller.post({"key": f"{month}-{index}", "value": month})
+    return controller
+
+
+def _read_ndjson(path: str) -> list:
+    with gzip.open(path, "rt") as archive_file:
+        return [json.loads(line) for line in archive_file]
+
+
+def _revisions(controller: layabase.CRUDController) -> list:
+    return [audit["revision"] for audit in controller.get_audit({})]
+
+
+def test_archive_moves_old_audit_to_ndjson(controller: layabase.CRUDController, tmpdir):
+    path = os.path.join(tmpdir, "audit.ndjson.gz")
+    assert (
+        controller.archive_audit(datetime.datetime(2020, 3, 1), path, chunk_size=4) == 6
+    )
+    records = _read_ndjson(path)
+    assert [record["revision"] for record in records] == [1, 2, 3, 4, 5, 6]
+    assert records[0]["audit_date_utc"].startswith("2020-01-15T00:00:00")
+    assert _revisions(controller) == [7, 8, 9]
+    assert not os.path.exists(f"{path}.progress")
+
+
+def test_archive_appends_to_existing_file(controller: layabase.CRUDController, tmpdir):
+    path = os.path.join(tmpdir, "audit.ndjson.gz")
+    assert controller.archive_audit(datetime.datetime(2020, 2, 1), path) == 3
+    assert controller.archive_audit(datetime.datetime(2020, 2, 1), path) == 0
+    assert controller.archive_audit(datetime.datetime(2020, 3, 1), path) == 3
+    assert [record["revision"] for record in _read_ndjson(path)] == [1, 2, 3, 4, 5, 6]
+
+
+def test_archive_to_csv(controller: layabase.CRUDController, tmpdir):
+    path = os.path.join(tmpdir, "audit.csv.gz")
+    assert (
+        controller.archive_audit(
+            datetime.datetime(2020, 3, 1), path, file_format="csv", chunk_size=2
+        )
+        == 6
+    )
+    with gzip.open(path, "rt", newline="") as archive_file:
+        rows = list(csv.DictReader(archive_file))
+    assert [row["revision"] for row in rows] == ["1", "2", "3", "4", "5", "6"]
+    assert rows[0]["audit_user"] == ""
+    assert rows[0]["value"] == "1"
+
+
+def test_interrupted_archive_is_resumed(
+    controller: layabase.CRUDController, tmpdir, monkeypatch
+):
+    path = os.path.join(tmpdir, "audit.ndjson.gz")
+    original_delete = controller._model.audit_model._delete_archived
+    calls = []
+
+    def failing_delete(before, up_to_revision):
+        calls.append(up_to_revision)
+        if len(calls) == 2:
+            raise Exception("Interrupted")
+        original_delete(before, up_to_revision)
+
+    monkeypatch.setattr(
+        controller._model.audit_model, "_delete_archived", failing_delete
+    )
+    with pytest.raises(Exception):
+        controller.archive_audit(datetime.datetime(2020, 3, 1), path, chunk_size=2)
+    monkeypatch.undo()
+
+    with open(f"{path}.progress") as progress_file:
+        assert json.load(progress_file)["revision"] == 4
+    # Simulate a partially written chunk
+    with open(path, "ab") as archive_file:
+        archive_file.write(b"partial")
+
+    with pytest.raises(Exception) as exception_info:
+        controller.archive_audit(datetime.datetime(2020, 2, 1), path)
+    assert (
+        str(exception_info.value)
+        == "An interrupted archiving (of audit before 2020-03-01T00:00:00) must be resumed first."
+    )
+
+    assert (
+        controller.archive_audit(datetime.datetime(2020, 3, 1), path, chunk_size=2) == 2
+    )
+    assert [record["revision"] for record in _read_ndjson(path)] == [1, 2, 3, 4, 5, 6]
+    assert _revisions(controller) == [7, 8, 9]
+    assert not os.path.exists(f"{path}.progress")
+
+
+def test_archive_interrupted_during_first_chunk_is_resumed(
+    controller: layabase.CRUDController, tmpdir, monkeypatch
+):
+    path = os.path.join(tmpdir, "audit.ndjson.gz")
+    assert controller.archive_audit(datetime.datetime(2020, 2, 1), path) == 3
+    original_append = layabase._audit_archive._append
+
+    def failing_append(*args):
+        original_append(*args)
+        # Interrupted after writing the chunk but before storing progress
+        raise Exception("Interrupted")
+
+    monkeypatch.setattr(layabase._audit_archive, "_append", failing_append)
+    with pytest.raises(Exception):
+        controller.archive_audit(datetime.datetime(2020, 3, 1), path, chunk_size=2)
+    monkeypatch.undo()
+
+    with open(f"{path}.progress") as progress_file:
+        assert json.load(progress_file)["revision"] == 0
+
+    assert controller.archive_audit(datetime.datetime(2020, 3, 1), path) == 3
+    assert [record["revision"] for record in _read_ndjson(path)] == [1, 2, 3, 4, 5, 6]
+    assert _revisions(controller) == [7, 8, 9]
+
+
+def test_archive_with_invalid_format(controller: layabase.CRUDController, tmpdir):
+    with pytest.raises(Exception) as exception_info:
+        controller.archive_audit(
+            datetime.datetime(2020, 3, 1),
+            os.path.join(tmpdir, "audit.gz"),
+            file_format="xml",
+        )
+    assert str(exception_info.value) == "File format must be one of ('ndjson', 'csv')."
@@ -0,0 +1,94 @@
+import pytest
+import sqlalchemy
+
+import layabase
+from layabase.testing import mock_sqlalchemy_audit_datetime
+
+
+@pytest.fixture
+def controller() -> layabase.CRUDController:
+    class TestTable:
+        __tablename__ = "test"
+
+        key = sqlalchemy.Column(sqlalchemy.String, primary_key=True)
+        mandatory = sqlalchemy.Column(sqlalchemy.Integer, nullable=False)
+        optional = sqlalchemy.Column("optional_value", sqlalchemy.String)
+
+    return layabase.CRUDController(
+        TestTable, audit=True, retrieve_user=lambda: "test user"
+    )
+
+
+@pytest.fixture
+def base(controller: layabase.CRUDController):
+    return layabase.load("sqlite:///:memory:", [controller])
+
+
+@pytest.fixture
+def statements(base) -> list:
+    executed = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        executed.append(statement.split(" ", maxsplit=1)[0])
+
+    sqlalchemy.event.listen(
+        base.metadata.bind, "before_cursor_execute", before_cursor_execute
+    )
+    yield executed
+    sqlalchemy.event.remove(
+        base.metadata.bind, "before_cursor_execute", before_cursor_execute
+    )
+
+
+def test_delete_copies_rows_within_database(
+    controller: layabase.CRUDController,
+    statements: list,
+    mock_sqlalchemy_audit_datetime,
+):
+    controller.post_many(
+        [
+            {"key": "1", "mandatory": 1, "optional": "first"},
+            {"key": "2", "mandatory": 2},
+            {"key": "3", "mandatory": 3, "optional": "third"},
+        ]
+    )
+    statements.clear()
+    assert controller.delete({"key": ["1", "2"]}) == 2
+    assert statements == ["INSERT", "DELETE"]
+    assert controller.get({}) == [{"key": "3", "mandatory": 3, "optional": "third"}]
+    assert controller.get_audit({"audit_action": "D"}) == [
+        {
+            "audit_action": "D",
+            "audit_date_utc": "2018-10-11T15:05:05.663979",
+            "audit_user": "test user",
+            "key": "1",
+            "mandatory": 1,
+            "optional": "first",
+            "revision": 4,
+        },
+        {
+            "audit_action": "D",
+            "audit_date_utc": "2018-10-11T15:05:05.663979",
+            "audit_user": "test user",
+            "key": "2",
+            "mandatory": 2,
+            "optional": None,
+            "revision": 5,
+        },
+    ]
+
+
+def test_delete_nothing_does_not_audit(controller: layabase.CRUDController, base):
+    controller.post({"key": "1", "mandatory": 1})
+    assert controller.delete({"key": "2"}) == 0
+    assert [row["audit_action"] for row in controller.get_audit({})] == ["I"]
+
+
+def test_delete_audit_failure_does_not_delete(
+    controller: layabase.CRUDController, base
+):
+    controller.post({"key": "1", "mandatory": 1})
+    base.metadata.bind.execute("DROP TABLE audit_test")
+    with pytest.raises(layabase.DatabaseError):
+        controller.delete({})
+    assert controller.get({}) == [{"key": "1", "mandatory": 1, "optional": None}]
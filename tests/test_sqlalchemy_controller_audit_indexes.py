@@ -0,0 +1,37 @@
+import pytest
+import sqlalchemy
+
+import layabase
+
+
+class TestTable:
+    __tablename__ = "test"
+
+    key = sqlalchemy.Column(sqlalchemy.String, primary_key=True)
+    value = sqlalchemy.Column(sqlalchemy.Integer)
+
+
+@pytest.fixture
+def database():
+    controller = layabase.CRUDController(TestTable, audit=True)
+    return controller, layabase.load("sqlite:///:memory:", [controller])
+
+
+def test_audit_date_and_user_are_indexed(database):
+    controller, base = database
+    indexes = sqlalchemy.inspect(base.metadata.bind).get_indexes("audit_test")
+    assert sorted((index["name"], index["column_names"]) for index in indexes) == [
+        ("ix_audit_test_audit_date_utc", ["audit_date_utc"]),
+        ("ix_audit_test_audit_user", ["audit_user"]),
+    ]
+
+
+def test_audit_partitioning_is_not_supported():
+    controller = layabase.CRUDController(
+        TestTable, audit=True, partition_audit_by_month=True
+    )
+    with pytest.raises(Exception) as exception_info:
+        layabase.load("sqlite:///:memory:", [controller])
+    assert (
+        str(exception_info.value) == "Audit can only be partitioned by month for Mongo."
+    )
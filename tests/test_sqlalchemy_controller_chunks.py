@@ -0,0 +1,150 @@
+import pytest
+import sqlalchemy
+
+import layabase
+
+
+@pytest.fixture
+def controller() -> layabase.CRUDController:
+    class TestTable:
+        __tablename__ = "test"
+
+        key = sqlalchemy.Column(sqlalchemy.String, primary_key=True)
+        value = sqlalchemy.Column(sqlalchemy.Integer, nullable=False)
+
+    controller = layabase.CRUDController(TestTable, audit=True)
+    layabase.load("sqlite:///:memory:", [controller])
+    return controller
+
+
+def _values(controller: layabase.CRUDController) -> dict:
+    return {row["key"]: row["value"] for row in controller.get({})}
+
+
+def test_post_chunks(controller):
+    results = controller.post_chunks(
+        ({"key": str(key), "value": key} for key in range(5)), chunk_size=2
+    )
+    assert [(result["first_index"], result["size"]) for result in results] == [
+        (0, 2),
+        (2, 2),
+        (4, 1),
+    ]
+    assert [row["key"] for row in results[1]["inserted"]] == ["2", "3"]
+    assert _values(controller) == {str(key): key for key in range(5)}
+
+
+def test_post_chunks_all_or_nothing(controller):
+    documents = [{"key": str(key), "value": key} for key in range(5)]
+    documents[3] = {"key": "3"}
+    with pytest.raises(layabase.ValidationFailed) as exception_info:
+        controller.post_chunks(documents, chunk_size=2)
+    assert list(exception_info.value.errors) == [3]
+    assert _values(controller) == {}
+
+
+def test_post_chunks_best_effort(controller):
+    documents = [{"key": str(key), "value": key} for key in range(5)]
+    documents[3] = {"key": "3"}
+    results = controller.post_chunks(documents, chunk_size=2, best_effort=True)
+    assert "error" not in results[0]
+    assert list(results[1]["error"].errors) == [3]
+    assert "inserted" not in results[1]
+    assert "error" not in results[2]
+    assert _values(controller) == {"0": 0, "1": 1, "4": 4}
+
+
+def test_put_chunks(controller):
+    controller.post_many([{"key": str(key), "value": key} for key in range(3)])
+    results = controller.put_chunks(
+        [{"key": str(key), "value": key * 10} for key in range(3)], chunk_size=2
+    )
+    assert [row["value"] for row in results[0]["previous"]] == [0, 1]
+    assert [row["value"] for row in results[0]["updated"]] == [0, 10]
+    assert _values(controller) == {"0": 0, "1": 10, "2": 20}
+
+
+def test_put_chunks_all_or_nothing(controller):
+    controller.post_many([{"key": str(key), "value": key} for key in range(3)])
+    with pytest.raises(layabase.ValidationFailed) as exception_info:
+        controller.put_chunks(
+            [
+                {"key": "0", "value": 10},
+                {"key": "1", "value": 11},
+                {"key": "unknown", "value": 12},
+            ],
+            chunk_size=2,
+        )
+    assert exception_info.value.errors == {
+        2: {"": ["The row to update could not be found."]}
+    }
+    assert _values(controller) == {"0": 0, "1": 1, "2": 2}
+
+
+def test_put_chunks_restores_full_rows():
+    class TestTable:
+        __tablename__ = "test"
+
+        key = sqlalchemy.Column(sqlalchemy.String, primary_key=True)
+        value = sqlalchemy.Column(sqlalchemy.Integer)
+
+    controller = layabase.CRUDController(TestTable)
+    layabase.load("sqlite:///:memory:", [controller])
+    controller.post_many([{"key": "a"}, {"key": "b", "value": 1}])
+    with pytest.raises(layabase.ValidationFailed):
+        controller.put_chunks(
+            [{"key": "a", "value": 5}, {"key": "unknown", "value": 1}], chunk_size=1
+        )
+    assert controller.get({}) == [{"key": "a", "value": None}, {"key": "b", "value": 1}]
+
+
+def test_put_chunks_best_effort(controller):
+    controller.post_many([{"key": str(key), "value": key} for key in range(3)])
+    results = controller.put_chunks(
+        [
+            {"key": "0", "value": 10},
+            {"key": "unknown", "value": 11},
+            {"key": "2", "value": 12},
+        ],
+        chunk_size=1,
+        best_effort=True,
+    )
+    assert [("error" in result) for result in results] == [False, True, False]
+    assert _values(controller) == {"0": 10, "1": 1, "2": 12}
+
+
+def test_invalid_chunks(controller):
+    with pytest.raises(Exception) as exception_info:
+        controller.post_chunks([{"key": "1", "value": 1}], chunk_size=0)
+    assert (
+        str(exception_info.value) == "Chunk size must be a strictly positive integer."
+    )
+    with pytest.raises(layabase.ValidationFailed) as exception_info:
+        controller.post_chunks([])
+    assert exception_info.value.errors == {"": ["No data provided."]}
+    with pytest.raises(layabase.ValidationFailed) as exception_info:
+        controller.put_chunks({"key": "1"})
+    assert exception_info.value.errors == {"": ["Must be a list of dictionaries."]}
+
+
+def test_post_chunks_all_or_nothing_with_composite_primary_key():
+    class TestTable:
+        __tablename__ = "test"
+
+        key1 = sqlalchemy.Column(sqlalchemy.String, primary_key=True)
+        key2 = sqlalchemy.Column(sqlalchemy.String, primary_key=True)
+        value = sqlalchemy.Column(sqlalchemy.Integer, nullable=False)
+
+    controller = layabase.CRUDController(TestTable)
+    layabase.load("sqlite:///:memory:", [controller])
+    controller.post({"key1": "1", "key2": "2", "value": 0})
+    with pytest.raises(layabase.ValidationFailed):
+        controller.post_chunks(
+            [
+                {"key1": "1", "key2": "1", "value": 1},
+                {"key1": "2", "key2": "2", "value": 2},
+                {"key1": "3", "key2": "3"},
+            ],
+            chunk_size=2,
+        )
+    assert controller.get({}) == [{"key1": "1", "key2": "2", "value": 0}]
@@ -0,0 +1,84 @@
+import pytest
+import sqlalchemy
+
+import layabase
+
+
+@pytest.fixture
+def controller() -> layabase.CRUDController:
+    class TestTable:
+        __tablename__ = "test"
+
+        key = sqlalchemy.Column(sqlalchemy.String, primary_key=True)
+        value = sqlalchemy.Column(sqlalchemy.Integer)
+
+    controller = layabase.CRUDController(TestTable, audit=True)
+    layabase.load("sqlite:///:memory:", [controller])
+    controller.post_many([{"key": str(key), "value": key % 2} for key in range(10)])
+    return controller
+
+
+def test_delete_chunks(controller: layabase.CRUDController):
+    progress = []
+    assert (
+        controller.delete_chunks({"value": 1}, chunk_size=2, progress=progress.append)
+        == 5
+    )
+    assert progress == [2, 4, 5]
+    assert sorted(row["key"] for row in controller.get({})) == ["0", "2", "4", "6", "8"]
+    removals = [
+        record
+        for record in controller.get_audit({})
+        if record["audit_action"] in ("Delete", "D")
+    ]
+    # Every removed row is audited
+    assert len(removals) == 5
+
+
+def test_delete_all_chunks(controller: layabase.CRUDController):
+    assert controller.delete_chunks({}, chunk_size=5, pause=0.001) == 10
+    assert controller.get({}) == []
+
+
+def test_delete_chunks_without_match(controller: layabase.CRUDController):
+    progress = []
+    assert controller.delete_chunks({"key": "11"}, progress=progress.append) == 0
+    assert progress == []
+    assert len(controller.get({})) == 10
+
+
+def test_delete_chunks_with_list_filter(controller: layabase.CRUDController):
+    assert controller.delete_chunks({"key": ["1", "2", "3"]}, chunk_size=2) == 3
+    assert len(controller.get({})) == 7
+
+
+def test_invalid_parameters(controller: layabase.CRUDController):
+    with pytest.raises(Exception) as exception_info:
+        controller.delete_chunks({}, chunk_size=0)
+    assert (
+        str(exception_info.value) == "Chunk size must be a strictly positive integer."
+    )
+    with pytest.raises(layabase.ValidationFailed) as exception_info:
+        controller.delete_chunks("")
+    assert exception_info.value.errors == {"": ["Must be a dictionary."]}
+
+
+def test_delete_chunks_with_composite_primary_key():
+    class TestTable:
+        __tablename__ = "test"
+
+        key1 = sqlalchemy.Column(sqlalchemy.String, primary_key=True)
+        key2 = sqlalchemy.Column(sqlalchemy.String, primary_key=True)
+
+    controller = layabase.CRUDController(TestTable, audit=True)
+    layabase.load("sqlite:///:memory:", [controller])
+    controller.post_many(
+        [
+            {"key1": str(key1), "key2": str(key2)}
+            for key1 in range(3)
+            for key2 in range(3)
+        ]
+    )
+    assert controller.delete_chunks({"key1": "1"}, chunk_size=2) == 3
+    assert len(controller.get({})) == 6
+    assert len(controller.get_audit({})) == 12
@@ -85,7 +85,7 @@ def test_remove_when_db_down(
         controller.delete({})
     assert (
         str(exception_info.value)
-        == """A error occurred while querying database: (sqlite3.OperationalError) no such table: test\n[SQL: SELECT test."key" AS test_key \nFROM test]\n(Background on this error at: http://sqlalche.me/e/13/e3q8)"""
+        == """A error occurred while querying database: (sqlite3.OperationalError) no such table: test\n[SQL: DELETE FROM test]\n(Background on this error at: http://sqlalche.me/e/13/e3q8)"""
     )
 
 
@@ -0,0 +1,299 @@
+import pytest
+import sqlalchemy
+
+import layabase
+import layabase.mongo
+
+
+@pytest.fixture
+def mongo_controller() -> layabase.CRUDController:
+    class TestCollection:
+        __collection_name__ = "test"
+
+        key = layabase.mongo.Column(str, is_primary_key=True)
+        value = layabase.mongo.Column(int, is_nullable=False)
+        optional = layabase.mongo.Column(str)
+        counter = layabase.mongo.Column(int, should_auto_increment=True)
+
+    controller = layabase.CRUDController(TestCollection, audit=True)
+    layabase.load("mongomock", [controller])
+    return controller
+
+
+@pytest.fixture
+def mongo_versioned_controller() -> layabase.CRUDController:
+    class TestCollection:
+        __collection_name__ = "test"
+
+        key = layabase.mongo.Column(str, is_primary_key=True)
+        value = layabase.mongo.Column(int, is_nullable=False)
+        optional = layabase.mongo.Column(str)
+
+    controller = layabase.CRUDController(TestCollection, audit=True, history=True)
+    layabase.load("mongomock", [controller])
+    return controller
+
+
+@pytest.fixture
+def sql_controller() -> layabase.CRUDController:
+    class TestTable:
+        __tablename__ = "test"
+
+        key = sqlalchemy.Column(sqlalchemy.String, primary_key=True)
+        value = sqlalchemy.Column(sqlalchemy.Integer, nullable=False)
+        optional = sqlalchemy.Column(sqlalchemy.String)
+
+    controller = layabase.CRUDController(TestTable, audit=True)
+    layabase.load("sqlite:///:memory:", [controller])
+    return controller
+
+
+def _audit_actions(controller: layabase.CRUDController) -> list:
+    return [record["audit_action"] for record in controller.get_audit({})]
+
+
+def test_mongo_upsert(mongo_controller: layabase.CRUDController):
+    assert mongo_controller.upsert({"key": "1", "value": 1, "optional": "A"}) == (
+        True,
+        {"key": "1", "value": 1, "optional": "A", "counter": 1},
+    )
+    # Non provided fields are kept and auto incremented values are not changed
+    assert mongo_controller.upsert({"key": "1", "value": 2}) == (
+        False,
+        {"key": "1", "value": 2, "optional": "A", "counter": 1},
+    )
+    # Fields provided as None are removed
+    assert mongo_controller.upsert({"key": "1", "value": 3, "optional": None}) == (
+        False,
+        {"key": "1", "value": 3, "optional": None, "counter": 1},
+    )
+    assert mongo_controller.get({}) == [
+        {"key": "1", "value": 3, "optional": None, "counter": 1}
+    ]
+    assert _audit_actions(mongo_controller) == ["Insert", "Update", "Update"]
+
+
+def test_mongo_upsert_many(mongo_controller: layabase.CRUDController):
+    mongo_controller.post({"key": "1", "value": 1, "optional": "A"})
+    assert mongo_controller.upsert_many(
+        [{"key": "1", "value": 10}, {"key": "2", "value": 2}]
+    ) == (
+        [False, True],
+        [
+            {"key": "1", "value": 10, "optional": "A", "counter": 1},
+            {"key": "2", "value": 2, "optional": None, "counter": 2},
+        ],
+    )
+    assert mongo_controller.get({}) == [
+        {"key": "1", "value": 10, "optional": "A", "counter": 1},
+        {"key": "2", "value": 2, "optional": None, "counter": 2},
+    ]
+    assert _audit_actions(mongo_controller) == ["Insert", "Update", "Insert"]
+
+
+def test_mongo_upsert_reserves_values_only_for_inserted_documents(
+    mongo_controller: layabase.CRUDController,
+):
+    mongo_controller.post({"key": "1", "value": 1})
+    mongo_controller.upsert({"key": "1", "value": 2})
+    mongo_controller.upsert_many([{"key": "1", "value": 3}, {"key": "1", "value": 4}])
+    assert mongo_controller.upsert({"key": "2", "value": 1}) == (
+        True,
+        {"key": "2", "value": 1, "optional": None, "counter": 2},
+    )
+
+
+def test_mongo_upsert_of_a_removed_document_is_auto_incremented(
+    mongo_controller: layabase.CRUDController, monkeypatch
+):
+    model = mongo_controller._model
+    # Document is removed between existing documents check and upsert
+    monkeypatch.setattr(
+        model,
+        "_existing_primary_key_values",
+        lambda keys_per_document: {
+            model._to_primary_key_values(keys) for keys in keys_per_document
+        },
+    )
+    assert mongo_controller.upsert({"key": "1", "value": 1}) == (
+        True,
+        {"key": "1", "value": 1, "optional": None, "counter": 1},
+    )
+    assert mongo_controller.get({}) == [
+        {"key": "1", "value": 1, "optional": None, "counter": 1}
+    ]
+
+
+def test_mongo_upsert_with_auto_incremented_primary_key():
+    class TestCollection:
+        __collection_name__ = "test"
+
+        key = layabase.mongo.Column(
+            int, is_primary_key=True, should_auto_increment=True
+        )
+        value = layabase.mongo.Column(str)
+
+    controller = layabase.CRUDController(TestCollection)
+    layabase.load("mongomock", [controller])
+    assert controller.post({"value": "1"}) == {"key": 1, "value": "1"}
+    # Provided primary key is used to find the existing document
+    assert controller.upsert({"key": 1, "value": "2"}) == (
+        False,
+        {"key": 1, "value": "2"},
+    )
+    assert controller.upsert_many(
+        [{"key": 1, "value": "3"}, {"key": 5, "value": "4"}]
+    ) == ([False, True], [{"key": 1, "value": "3"}, {"key": 5, "value": "4"}])
+    assert controller.get({}) == [{"key": 1, "value": "3"}, {"key": 5, "value": "4"}]
+
+
+def test_mongo_versioned_upsert(mongo_versioned_controller: layabase.CRUDController):
+    assert mongo_versioned_controller.upsert({"key": "1", "value": 1}) == (
+        True,
+        {
+            "key": "1",
+            "value": 1,
+            "optional": None,
+            "valid_since_revision": 1,
+            "valid_until_revision": -1,
+        },
+    )
+    assert mongo_versioned_controller.upsert({"key": "1", "value": 2}) == (
+        False,
+        {
+            "key": "1",
+            "value": 2,
+            "optional": None,
+            "valid_since_revision": 2,
+            "valid_until_revision": -1,
+        },
+    )
+    assert mongo_versioned_controller.get_history({}) == [
+        {
+            "key": "1",
+            "value": 2,
+            "optional": None,
+            "valid_since_revision": 2,
+            "valid_until_revision": -1,
+        },
+        {
+            "key": "1",
+            "value": 1,
+            "optional": None,
+            "valid_since_revision": 1,
+            "valid_until_revision": 2,
+        },
+    ]
+    assert mongo_versioned_controller.rollback_to({"revision": 1}) == 1
+    assert mongo_versioned_controller.get({})[0]["value"] == 1
+    assert _audit_actions(mongo_versioned_controller) == [
+        "Insert",
+        "Update",
+        "Rollback",
+    ]
+
+
+def test_mongo_versioned_upsert_many(
+    mongo_versioned_controller: layabase.CRUDController,
+):
+    mongo_versioned_controller.post({"key": "1", "value": 1})
+    inserted, new_documents = mongo_versioned_controller.upsert_many(
+        [{"key": "1", "value": 10}, {"key": "2", "value": 2}]
+    )
+    assert inserted == [False, True]
+    assert [document["valid_since_revision"] for document in new_documents] == [2, 2]
+    assert mongo_versioned_controller.get_changes({"since_revision": 1})["updated"] == [
+        new_documents[0]
+    ]
+    assert len(mongo_versioned_controller.get_history({})) == 3
+    assert _audit_actions(mongo_versioned_controller) == ["Insert", "Update"]
+
+
+def test_sql_upsert(sql_controller: layabase.CRUDController):
+    assert sql_controller.upsert({"key": "1", "value": 1, "optional": "A"}) == (
+        True,
+        {"key": "1", "value": 1, "optional": "A"},
+    )
+    assert sql_controller.upsert({"key": "1", "value": 2}) == (
+        False,
+        {"key": "1", "value": 2, "optional": "A"},
+    )
+    assert sql_controller.get({}) == [{"key": "1", "value": 2, "optional": "A"}]
+    assert _audit_actions(sql_controller) == ["I", "U"]
+
+
+def test_sql_upsert_many(sql_controller: layabase.CRUDController):
+    sql_controller.post({"key": "1", "value": 1})
+    assert sql_controller.upsert_many(
+        [{"key": "1", "value": 10}, {"key": "2", "value": 2}]
+    ) == (
+        [False, True],
+        [
+            {"key": "1", "value": 10, "optional": None},
+            {"key": "2", "value": 2, "optional": None},
+        ],
+    )
+    assert _audit_actions(sql_controller) == ["I", "U", "I"]
+
+
+def test_upsert_requires_valid_document(mongo_controller, sql_controller):
+    for controller in (mongo_controller, sql_controller):
+        with pytest.raises(layabase.ValidationFailed) as exception_info:
+            controller.upsert({"key": "1"})
+        assert exception_info.value.errors == {
+            "value": ["Missing data for required field."]
+        }
+        with pytest.raises(layabase.ValidationFailed) as exception_info:
+            controller.upsert_many([{"key": "1", "value": 1}, {"value": 2}])
+        assert exception_info.value.errors == {
+            1: {"key": ["Missing data for required field."]}
+        }
+        with pytest.raises(layabase.ValidationFailed) as exception_info:
+            controller.upsert_many([])
+        assert exception_info.value.errors == {"": ["No data provided."]}
+        assert controller.get({}) == []
+
+
+def test_mongo_upsert_requires_primary_key():
+    class TestCollection:
+        __collection_name__ = "test"
+
+        value = layabase.mongo.Column(int)
+
+    controller = layabase.CRUDController(TestCollection)
+    layabase.load("mongomock", [controller])
+    with pytest.raises(layabase.ValidationFailed) as exception_info:
+        controller.upsert({"value": 1})
+    assert exception_info.value.errors == {"": ["Primary key is required to upsert."]}
+
+
+def test_sql_upsert_on_conflict_maps_column_names(monkeypatch):
+    from sqlalchemy.dialects import postgresql
+
+    class TestTable:
+        __tablename__ = "test"
+
+        key = sqlalchemy.Column("key_column", sqlalchemy.String, primary_key=True)
+        value = sqlalchemy.Column("value_column", sqlalchemy.Integer)
+
+    controller = layabase.CRUDController(TestTable)
+    layabase.load("sqlite:///:memory:", [controller])
+    session = controller._model._session
+    monkeypatch.setattr(session.get_bind().dialect, "name", "postgresql")
+    statements = []
+
+    def execute(statement):
+        statements.append(str(statement.compile(dialect=postgresql.dialect())))
+        # As returned by PostgreSQL (RETURNING clause)
+        return [{"key": "1", "value": 2, "layabase_inserted": False}]
+
+    monkeypatch.setattr(session, "execute", execute)
+    assert controller.upsert({"key": "1", "value": 2}) == (
+        False,
+        {"key": "1", "value": 2},
+    )
+    assert statements == [
+        "INSERT INTO test (key_column, value_column) VALUES (%(key_column_m0)s, %(value_column_m0)s) "
+        "ON CONFLICT (key_column) DO UPDATE SET value_column = excluded.value_column "
+        "RETURNING test.key_column AS key, test.value_column AS value, xmax = 0 AS layabase_inserted"
+    ]
@@ -0,0 +1,158 @@
+import json
+
+import pytest
+
+import layabase
+import layabase.mongo
+
+
+@pytest.fixture
+def validation_pool() -> layabase.ValidationPool:
+    validation_pool = layabase.ValidationPool(max_workers=2, threshold=3)
+    yield validation_pool
+    validation_pool.shutdown()
+
+
+def _controller(
+    validation_pool: layabase.ValidationPool, **kwargs
+) -> layabase.CRUDController:
+    class TestCollection:
+        __collection_name__ = "test"
+
+        key = layabase.mongo.Column(str, is_primary_key=True)
+        counter = layabase.mongo.Column(int, should_auto_increment=True)
+        nested = layabase.mongo.DictColumn(
+            fields={
+                "value": layabase.mongo.Column(int, is_nullable=False),
+                "values": layabase.mongo.ListColumn(layabase.mongo.Column(int)),
+            }
+        )
+
+    controller = layabase.CRUDController(
+        TestCollection, validation_pool=validation_pool, **kwargs
+    )
+    layabase.load("mongomock", [controller])
+    return controller
+
+
+def _documents(nb_documents: int) -> list:
+    return [
+        {"key": str(key), "nested": {"value": key, "values": [key, key + 1]}}
+        for key in range(nb_documents)
+    ]
+
+
+def test_post_many_is_validated_on_workers(validation_pool):
+    controller = _controller(validation_pool)
+    inserted = controller.post_many(_documents(5))
+    assert inserted == [
+        {
+            "key": str(key),
+            "counter": key + 1,
+            "nested": {"value": key, "values": [key, key + 1]},
+        }
+        for key in range(5)
+    ]
+    assert controller.get({"key": "4"}) == [inserted[4]]
+    assert validation_pool.metrics() == {"validations": 1, "documents": 5}
+
+
+def test_errors_are_merged_in_order(validation_pool):
+    controller = _controller(validation_pool)
+    documents = _documents(5)
+    documents[1]["nested"]["value"] = "not an int"
+    del documents[4]["nested"]["value"]
+    with pytest.raises(layabase.ValidationFailed) as exception_info:
+        controller.post_many(documents)
+    assert exception_info.value.errors == {
+        1: {"nested.value": ["Not a valid int."]},
+        4: {"nested.value": ["Missing data for required field."]},
+    }
+    assert controller.get({}) == []
+
+
+def test_put_many_is_validated_on_workers(validation_pool):
+    controller = _controller(validation_pool, history=True)
+    controller.post_many(_documents(3))
+    previous, updated = controller.put_many(
+        [{"key": str(key), "nested": {"value": key * 10}} for key in range(3)]
+    )
+    assert [document["nested"]["value"] for document in updated] == [0, 10, 20]
+    with pytest.raises(layabase.ValidationFailed) as exception_info:
+        controller.put_many(
+            [{"key": "0"}, {"key": "1", "nested": {"values": ["a"]}}, {"key": "2"}]
+        )
+    assert list(exception_info.value.errors) == [1]
+    assert validation_pool.metrics() == {"validations": 3, "documents": 9}
+
+
+def test_post_each_is_validated_on_workers(validation_pool):
+    controller = _controller(validation_pool)
+    documents = _documents(5)
+    documents[1]["nested"]["value"] = "not an int"
+    result = controller.post_each(documents)
+    assert result["errors"] == {1: {"nested.value": ["Not a valid int."]}}
+    assert sorted(result["inserted"]) == [0, 2, 3, 4]
+    assert result["inserted"][4] == {
+        "key": "4",
+        "counter": 4,
+        "nested": {"value": 4, "values": [4, 5]},
+    }
+    assert len(controller.get({})) == 4
+    assert validation_pool.metrics() == {"validations": 1, "documents": 5}
+
+
+def test_import_file_is_validated_on_workers(validation_pool, tmp_path):
+    controller = _controller(validation_pool)
+    documents = _documents(5)
+    documents[3]["nested"]["values"] = ["a"]
+    path = tmp_path / "records.ndjson"
+    path.write_text("\n".join(json.dumps(document) for document in documents))
+    assert controller.import_file(str(path), chunk_size=4) == {
+        "inserted": 4,
+        "errors": {4: {"nested.values[0]": ["Not a valid int."]}},
+    }
+    # Last chunk (a single document) is validated locally
+    assert validation_pool.metrics() == {"validations": 1, "documents": 4}
+
+
+def test_small_lists_are_validated_locally(validation_pool):
+    controller = _controller(validation_pool)
+    controller.post_many(_documents(2))
+    controller.post(_documents(3)[2])
+    assert len(controller.get({})) == 3
+    assert validation_pool.metrics() == {"validations": 0, "documents": 0}
+
+
+def test_models_linked_after_start_are_known_by_workers(validation_pool):
+    first_controller = _controller(validation_pool)
+    first_controller.post_many(_documents(3))
+    second_controller = _controller(validation_pool)
+    assert len(second_controller.post_many(_documents(3))) == 3
+
+
+def test_chunk_size(validation_pool):
+    validation_pool.chunk_size = 1
+    controller = _controller(validation_pool)
+    documents = _documents(4)
+    documents[2]["nested"]["value"] = "not an int"
+    with pytest.raises(layabase.ValidationFailed) as exception_info:
+        controller.post_many(documents)
+    assert list(exception_info.value.errors) == [2]
+
+
+@pytest.mark.parametrize(
+    "parameters, message",
+    [
+        (
+            {"max_workers": 0},
+            "Maximum number of workers must be a strictly positive integer.",
+        ),
+        ({"threshold": 0}, "Threshold must be a strictly positive integer."),
+        ({"chunk_size": 0}, "Chunk size must be a strictly positive integer."),
+    ],
+)
+def test_invalid_parameters(parameters, message):
+    with pytest.raises(Exception) as exception_info:
+        layabase.ValidationPool(**parameters)
+    assert str(exception_info.value) == message